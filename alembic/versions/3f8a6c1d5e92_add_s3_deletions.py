@@ -0,0 +1,44 @@
+"""Add s3_deletions and barbers.avatar_hash index
+
+Revision ID: 3f8a6c1d5e92
+Revises: 7c2d9e4f1a6b
+Create Date: 2026-10-17 19:40:12.907215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a6c1d5e92'
+down_revision: Union[str, None] = '7c2d9e4f1a6b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('s3_deletions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_s3_deletions_id'), 's3_deletions', ['id'], unique=False)
+    op.create_index(op.f('ix_s3_deletions_next_attempt_at'), 's3_deletions', ['next_attempt_at'], unique=False)
+    # The collector checks whether an avatar hash is still in use before
+    # deleting its variants.
+    op.create_index(op.f('ix_barbers_avatar_hash'), 'barbers', ['avatar_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_barbers_avatar_hash'), table_name='barbers')
+    op.drop_index(op.f('ix_s3_deletions_next_attempt_at'), table_name='s3_deletions')
+    op.drop_index(op.f('ix_s3_deletions_id'), table_name='s3_deletions')
+    op.drop_table('s3_deletions')
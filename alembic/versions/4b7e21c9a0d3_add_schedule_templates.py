@@ -0,0 +1,59 @@
+"""Add schedule_templates
+
+Revision ID: 4b7e21c9a0d3
+Revises: cf6f8c8eb11e
+Create Date: 2026-10-17 12:40:08.113527
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e21c9a0d3'
+down_revision: Union[str, None] = 'cf6f8c8eb11e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('schedule_templates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('barber_id', sa.Integer(), nullable=False),
+    sa.Column('weekday', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.Time(), nullable=False),
+    sa.Column('end_time', sa.Time(), nullable=False),
+    sa.Column('slot_minutes', sa.Integer(), nullable=False),
+    sa.Column('valid_from', sa.Date(), nullable=False),
+    sa.Column('valid_to', sa.Date(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('generated_until', sa.Date(), nullable=True),
+    sa.ForeignKeyConstraint(['barber_id'], ['barbers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_schedule_templates_id'), 'schedule_templates', ['id'], unique=False)
+    op.create_index(op.f('ix_schedule_templates_barber_id'), 'schedule_templates', ['barber_id'], unique=False)
+    with op.batch_alter_table('barber_schedules') as batch_op:
+        batch_op.add_column(sa.Column('template_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_barber_schedules_template_id_schedule_templates',
+            'schedule_templates',
+            ['template_id'],
+            ['id'],
+            ondelete='SET NULL',
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('barber_schedules') as batch_op:
+        batch_op.drop_constraint(
+            'fk_barber_schedules_template_id_schedule_templates', type_='foreignkey'
+        )
+        batch_op.drop_column('template_id')
+    op.drop_index(op.f('ix_schedule_templates_barber_id'), table_name='schedule_templates')
+    op.drop_index(op.f('ix_schedule_templates_id'), table_name='schedule_templates')
+    op.drop_table('schedule_templates')
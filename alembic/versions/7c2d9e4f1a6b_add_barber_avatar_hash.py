@@ -0,0 +1,29 @@
+"""Add barbers.avatar_hash
+
+Revision ID: 7c2d9e4f1a6b
+Revises: e5c8a1f4b2d7
+Create Date: 2026-10-17 18:22:07.614390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2d9e4f1a6b'
+down_revision: Union[str, None] = 'e5c8a1f4b2d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('barbers', sa.Column('avatar_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('barbers') as batch_op:
+        batch_op.drop_column('avatar_hash')
@@ -0,0 +1,31 @@
+"""Unique appointments.schedule_id
+
+Revision ID: 9a3f5d2e7c14
+Revises: 4b7e21c9a0d3
+Create Date: 2026-10-17 14:05:51.270431
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a3f5d2e7c14'
+down_revision: Union[str, None] = '4b7e21c9a0d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Fails if a slot was already double-booked; resolve those appointments
+    # by hand before upgrading.
+    with op.batch_alter_table('appointments') as batch_op:
+        batch_op.create_unique_constraint('uq_appointments_schedule_id', ['schedule_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('appointments') as batch_op:
+        batch_op.drop_constraint('uq_appointments_schedule_id', type_='unique')
@@ -0,0 +1,30 @@
+"""Add reviews (created_at, id) index
+
+Revision ID: a4d8f2c6e1b9
+Revises: b2e7d4a9c815
+Create Date: 2026-10-17 23:41:12.506318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d8f2c6e1b9'
+down_revision: Union[str, None] = 'b2e7d4a9c815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serves the admin review keyset pages; built without blocking writes.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_reviews_created_at_id', 'reviews', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_reviews_created_at_id', table_name='reviews', postgresql_concurrently=True)
@@ -0,0 +1,41 @@
+"""Add appointment_reminders
+
+Revision ID: b2e7d4a9c815
+Revises: 3f8a6c1d5e92
+Create Date: 2026-10-17 21:05:43.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e7d4a9c815'
+down_revision: Union[str, None] = '3f8a6c1d5e92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Reminders booked before this revision are still queued in the broker
+    # as countdown tasks, so existing appointments are not backfilled.
+    op.create_table('appointment_reminders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('appointment_id', sa.Integer(), nullable=False),
+    sa.Column('send_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['appointment_id'], ['appointments.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('appointment_id')
+    )
+    op.create_index(op.f('ix_appointment_reminders_id'), 'appointment_reminders', ['id'], unique=False)
+    op.create_index(op.f('ix_appointment_reminders_send_at'), 'appointment_reminders', ['send_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_appointment_reminders_send_at'), table_name='appointment_reminders')
+    op.drop_index(op.f('ix_appointment_reminders_id'), table_name='appointment_reminders')
+    op.drop_table('appointment_reminders')
@@ -0,0 +1,43 @@
+"""Add barber_rating_stats
+
+Revision ID: cf6f8c8eb11e
+Revises: d1c564949bed
+Create Date: 2026-10-17 10:12:31.482915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cf6f8c8eb11e'
+down_revision: Union[str, None] = 'd1c564949bed'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('barber_rating_stats',
+    sa.Column('barber_id', sa.Integer(), nullable=False),
+    sa.Column('rating_sum', sa.Integer(), nullable=False),
+    sa.Column('rating_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['barber_id'], ['barbers.id'], ),
+    sa.PrimaryKeyConstraint('barber_id')
+    )
+    op.execute(
+        """
+        INSERT INTO barber_rating_stats (barber_id, rating_sum, rating_count)
+        SELECT barber_id, COALESCE(SUM(rating), 0), COUNT(id)
+        FROM reviews
+        WHERE is_approved
+        GROUP BY barber_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('barber_rating_stats')
@@ -0,0 +1,42 @@
+"""Add composite indexes for hot filters
+
+Revision ID: e5c8a1f4b2d7
+Revises: 9a3f5d2e7c14
+Create Date: 2026-10-17 15:22:37.904116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c8a1f4b2d7'
+down_revision: Union[str, None] = '9a3f5d2e7c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# barbers.user_id and appointments.schedule_id are already covered by their
+# unique constraints.
+INDEXES = [
+    ('ix_barber_schedules_barber_id_date_start_time', 'barber_schedules', ['barber_id', 'date', 'start_time']),
+    ('ix_reviews_barber_id_is_approved', 'reviews', ['barber_id', 'is_approved']),
+    ('ix_reviews_client_id_created_at', 'reviews', ['client_id', 'created_at']),
+    ('ix_appointments_client_id_appointment_time', 'appointments', ['client_id', 'appointment_time']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build without blocking writes on Postgres; CONCURRENTLY cannot run
+    # inside a transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
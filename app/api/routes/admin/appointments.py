@@ -1,33 +1,61 @@
-from fastapi import APIRouter, Depends, Query, status
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user_info, get_session
 from app.schemas.appointment import AppointmentCreate, AppointmentOut
 from app.services.admin.appointment import (
+    APPOINTMENT_KEYSET,
     admin_create_appointment_service,
     admin_delete_appointment_service,
     admin_get_appointments_service,
 )
+from app.services.admin.export import admin_export_appointments_query
+from app.utils.export import ExportFormat, export_response
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[AppointmentOut])
 async def admin_get_appointments_route(
+    response: Response,
     upcoming_only: bool = Query(True, description="Only future appointments"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
     db: AsyncSession = Depends(get_session),
     current_user=Depends(get_current_user_info),
 ):
-    return await admin_get_appointments_service(
+    appointments = await admin_get_appointments_service(
         db,
         upcoming_only,
         skip,
         limit,
         current_user["role"],
         admin_id=current_user["id"],
+        cursor=cursor,
+    )
+    set_next_cursor(response, APPOINTMENT_KEYSET, appointments, limit)
+    return appointments
+
+
+@router.get("/export")
+async def admin_export_appointments_route(
+    fmt: ExportFormat = Query("csv", alias="format"),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    db: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user_info),
+):
+    query = admin_export_appointments_query(
+        current_user["role"],
+        admin_id=current_user["id"],
+        start_date=start_date,
+        end_date=end_date,
     )
+    return export_response(db, query, fmt, "appointments")
 
 
 @router.post("/", response_model=AppointmentOut)
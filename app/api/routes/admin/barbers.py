@@ -1,17 +1,21 @@
 from datetime import date
 from typing import Optional
 
-from fastapi import APIRouter, Depends, File, Query, UploadFile, status
+from fastapi import APIRouter, Depends, File, Query, Response, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user_info, get_session
 from app.schemas.barber import BarberCreate, BarberOut, BarberUpdate
 from app.schemas.barber_schedule import (
+    AdminBarberScheduleBulkCreate,
     AdminBarberScheduleCreate,
     AdminBarberScheduleOut,
     AdminBarberScheduleUpdate,
+    BarberScheduleBulkOut,
 )
 from app.services.admin.barbers import (
+    BARBER_KEYSET,
+    admin_bulk_create_schedule_service,
     admin_create_schedule_service,
     admin_delete_schedule_service,
     admin_get_all_schedules,
@@ -24,19 +28,33 @@ from app.services.admin.barbers import (
     update_barber_by_admin,
     upload_barber_photo,
 )
+from app.services.admin.export import admin_export_schedules_query
+from app.utils.export import ExportFormat, export_response
+from app.utils.pagination import set_next_cursor
+from app.utils.selectors.schedule import SCHEDULE_KEYSET
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[BarberOut])
 async def list_barbers(
-    db: AsyncSession = Depends(get_session), current_user=Depends(get_current_user_info)
+    response: Response,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="X-Next-Cursor of the previous page"
+    ),
+    db: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user_info),
 ):
-    return await get_all_barbers(
+    barbers = await get_all_barbers(
         db,
         current_user["role"],
         admin_id=current_user["id"],
+        limit=limit,
+        cursor=cursor,
     )
+    set_next_cursor(response, BARBER_KEYSET, barbers, limit)
+    return barbers
 
 
 @router.get("/{barber_id}", response_model=BarberOut)
@@ -129,14 +147,19 @@ async def delete_barber_avatar(
 
 @router.get("/schedules/", response_model=list[AdminBarberScheduleOut])
 async def admin_list_schedules(
+    response: Response,
     upcoming_only: bool = Query(default=False),
     barber_id: Optional[int] = Query(default=None),
     start_date: Optional[date] = Query(default=None),
     end_date: Optional[date] = Query(default=None),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(
+        None, description="X-Next-Cursor of the previous page"
+    ),
     db: AsyncSession = Depends(get_session),
     current_user=Depends(get_current_user_info),
 ):
-    return await admin_get_all_schedules(
+    schedules = await admin_get_all_schedules(
         db,
         upcoming_only,
         current_user["role"],
@@ -144,7 +167,30 @@ async def admin_list_schedules(
         start_date=start_date,
         end_date=end_date,
         admin_id=current_user["id"],
+        limit=limit,
+        cursor=cursor,
     )
+    set_next_cursor(response, SCHEDULE_KEYSET, schedules, limit)
+    return schedules
+
+
+@router.get("/schedules/export")
+async def admin_export_schedules(
+    fmt: ExportFormat = Query("csv", alias="format"),
+    barber_id: Optional[int] = Query(default=None),
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
+    db: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user_info),
+):
+    query = admin_export_schedules_query(
+        current_user["role"],
+        admin_id=current_user["id"],
+        start_date=start_date,
+        end_date=end_date,
+        barber_id=barber_id,
+    )
+    return export_response(db, query, fmt, "schedules")
 
 
 @router.post(
@@ -165,6 +211,24 @@ async def admin_create_schedule(
     )
 
 
+@router.post(
+    "/schedules/bulk",
+    response_model=BarberScheduleBulkOut,
+    status_code=status.HTTP_201_CREATED,
+)
+async def admin_create_schedules_bulk(
+    data: AdminBarberScheduleBulkCreate,
+    db: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user_info),
+):
+    return await admin_bulk_create_schedule_service(
+        db,
+        data,
+        current_user["role"],
+        admin_id=current_user["id"],
+    )
+
+
 @router.put("/schedules/{schedule_id}", response_model=AdminBarberScheduleOut)
 async def admin_update_schedule(
     schedule_id: int,
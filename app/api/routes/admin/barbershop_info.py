@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_current_user_info
+from app.schemas.barbershop_info import BarbershopInfo
+from app.services.admin.barbershop_info import (
+    get_barbershop_info_service,
+    update_barbershop_info_service,
+)
+
+router = APIRouter()
+
+
+@router.get("/", response_model=BarbershopInfo)
+async def get_barbershop_info(current_user=Depends(get_current_user_info)):
+    return await get_barbershop_info_service(current_user["role"])
+
+
+@router.put("/", response_model=BarbershopInfo)
+async def update_barbershop_info(
+    info: BarbershopInfo, current_user=Depends(get_current_user_info)
+):
+    return await update_barbershop_info_service(
+        info, current_user["role"], admin_id=current_user["id"]
+    )
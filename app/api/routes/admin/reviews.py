@@ -1,29 +1,61 @@
-from fastapi import APIRouter, Depends
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user_info, get_session
 from app.schemas.review import ReviewAdminRead
+from app.services.admin.export import admin_export_reviews_query
 from app.services.admin.reviews import (
     approve_review_service,
     delete_review_service,
     get_all_reviews_service,
 )
+from app.utils.export import ExportFormat, export_response
+from app.utils.pagination import set_next_cursor
+from app.utils.selectors.reviews import REVIEW_KEYSET
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[ReviewAdminRead])
 async def list_reviews(
+    response: Response,
     only_unapproved: bool = False,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
     db: AsyncSession = Depends(get_session),
     current_user=Depends(get_current_user_info),
 ):
-    return await get_all_reviews_service(
+    reviews = await get_all_reviews_service(
         db=db,
         user_role=current_user["role"],
         only_unapproved=only_unapproved,
         admin_id=current_user["id"],
+        limit=limit,
+        cursor=cursor,
+    )
+    set_next_cursor(response, REVIEW_KEYSET, reviews, limit)
+    return reviews
+
+
+@router.get("/export")
+async def export_reviews(
+    fmt: ExportFormat = Query("csv", alias="format"),
+    only_unapproved: bool = False,
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    db: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user_info),
+):
+    query = admin_export_reviews_query(
+        current_user["role"],
+        admin_id=current_user["id"],
+        start_date=start_date,
+        end_date=end_date,
+        only_unapproved=only_unapproved,
     )
+    return export_response(db, query, fmt, "reviews")
 
 
 @router.post("/{review_id}/approve", response_model=ReviewAdminRead)
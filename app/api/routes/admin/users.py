@@ -1,36 +1,61 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user_info, get_session
-from app.schemas.user import PromoteUserToBarberRequest, UserRead, UserUpdateForAdmin
+from app.schemas.user import (
+    PasswordHashReport,
+    PromoteUserToBarberRequest,
+    UserRead,
+    UserUpdateForAdmin,
+)
 from app.services.admin.users import (
+    USER_KEYSET,
     delete_user,
+    get_password_hash_report,
     get_user_by_id_for_admin,
     get_users,
     promote_user_to_barber,
     update_user,
 )
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[UserRead])
 async def list_users(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=50),
     username: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(
+        None, description="X-Next-Cursor of the previous page"
+    ),
     db: AsyncSession = Depends(get_session),
     current_user=Depends(get_current_user_info),
 ):
-    return await get_users(
+    users = await get_users(
         db,
         current_user["role"],
         admin_id=current_user["id"],
         skip=skip,
         limit=limit,
         username_filter=username,
+        cursor=cursor,
+    )
+    set_next_cursor(response, USER_KEYSET, users, limit)
+    return users
+
+
+@router.get("/password-hashes", response_model=PasswordHashReport)
+async def password_hash_report(
+    db: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user_info),
+):
+    return await get_password_hash_report(
+        db, current_user["role"], admin_id=current_user["id"]
     )
 
 
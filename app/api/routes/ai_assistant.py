@@ -1,12 +1,65 @@
+import json
+from typing import AsyncIterator
+
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
 
 from app.schemas.ai_assistant import AnswerOut, QuestionIn
-from app.services.ai_assistant_service import ask_barber_ai
+from app.services.ai_assistant_service import ask_barber_ai, stream_barber_ai
+from app.utils.logger import logger
 
 router = APIRouter()
 
 
+def _sse(data: dict, event: str | None = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+async def _answer_events(deltas: AsyncIterator[str]) -> AsyncIterator[str]:
+    try:
+        async for delta in deltas:
+            yield _sse({"delta": delta})
+    except Exception as e:
+        # Headers are already sent; report the failure in-band.
+        logger.error(f"AI answer stream failed: {e}")
+        yield _sse({"detail": "The assistant could not finish the answer"}, "error")
+        return
+    yield _sse({}, "done")
+
+
+class _AnswerStreamingResponse(StreamingResponse):
+    """Closes the answer once the response ends, however it ends.
+
+    Also covers a client that disconnects before the body is first pulled,
+    when ``_answer_events`` never starts and its own cleanup never runs.
+    """
+
+    def __init__(self, deltas: AsyncIterator[str], **kwargs):
+        super().__init__(_answer_events(deltas), **kwargs)
+        self.deltas = deltas
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.deltas.aclose()
+
+
 @router.post("/ask", response_model=AnswerOut)
 async def ask_ai(question_data: QuestionIn):
     answer = await ask_barber_ai(question_data.question)
     return {"answer": answer}
+
+
+@router.post("/ask/stream")
+async def ask_ai_stream(question_data: QuestionIn):
+    """Server-sent events: ``data: {"delta": ...}`` per piece of the answer,
+    then ``event: done`` (or ``event: error``)."""
+    deltas = await stream_barber_ai(question_data.question)
+    return _AnswerStreamingResponse(
+        deltas,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,6 +1,7 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user_info, get_current_user_optional, get_session
@@ -14,23 +15,50 @@ from app.services.appointment_service import (
     get_barbers_with_ratings,
     get_barbers_with_schedules_and_ratings,
 )
+from app.utils.response_cache import cached_json_response
 
 router = APIRouter()
 
 
+barbers_adapter = TypeAdapter(List[BarberOutwithReviews])
+barber_details_adapter = TypeAdapter(BarberOutwithReviewsDetailed)
+available_slots_adapter = TypeAdapter(List[BarberWithScheduleAndReviewsOut])
+
+
 @router.get("/barbers", response_model=List[BarberOutwithReviews])
-async def list_barbers(db: AsyncSession = Depends(get_session)):
-    return await get_barbers_with_ratings(db)
+async def list_barbers(request: Request, db: AsyncSession = Depends(get_session)):
+    return await cached_json_response(
+        request,
+        "barbers",
+        lambda: get_barbers_with_ratings(db),
+        barbers_adapter,
+    )
 
 
 @router.get("/barbers/{barber_id}", response_model=BarberOutwithReviewsDetailed)
-async def get_barber_details(barber_id: int, db: AsyncSession = Depends(get_session)):
-    return await get_barber_detailed_info(db, barber_id)
+async def get_barber_details(
+    barber_id: int, request: Request, db: AsyncSession = Depends(get_session)
+):
+    return await cached_json_response(
+        request,
+        f"barbers:{barber_id}",
+        lambda: get_barber_detailed_info(db, barber_id),
+        barber_details_adapter,
+    )
 
 
 @router.get("/available-slots", response_model=list[BarberWithScheduleAndReviewsOut])
-async def get_barbers_with_available_slots(db: AsyncSession = Depends(get_session)):
-    return await get_barbers_with_schedules_and_ratings(db)
+async def get_barbers_with_available_slots(
+    request: Request, db: AsyncSession = Depends(get_session)
+):
+    # Slots drop out of this listing as they start, so keep it short-lived.
+    return await cached_json_response(
+        request,
+        "available-slots",
+        lambda: get_barbers_with_schedules_and_ratings(db),
+        available_slots_adapter,
+        ttl=60,
+    )
 
 
 @router.post("/", response_model=AppointmentOut)
@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Depends, File, UploadFile
+from fastapi import APIRouter, Depends, File, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user_info, get_session
 from app.schemas.barber import BarberOut, BarberUpdate
 from app.schemas.barber_schedule import (
+    BarberScheduleBulkCreate,
+    BarberScheduleBulkOut,
     BarberScheduleCreate,
     BarberScheduleOut,
     BarberScheduleUpdate,
+    ScheduleTemplateCreate,
+    ScheduleTemplateOut,
 )
 from app.services.barber_service import (
     create_schedule,
+    create_schedules_bulk,
     delete_schedule,
     get_my_barber_by_id,
     get_my_schedule,
@@ -18,6 +23,12 @@ from app.services.barber_service import (
     update_schedule,
     upload_barber_photo,
 )
+from app.services.schedule_template_service import (
+    create_schedule_template,
+    delete_schedule_template,
+    get_my_schedule_templates,
+)
+from app.utils.avatars import avatar_variant_urls
 
 router = APIRouter()
 
@@ -33,6 +44,21 @@ async def create_my_schedule(
     )
 
 
+@router.post(
+    "/schedules/bulk",
+    response_model=BarberScheduleBulkOut,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_my_schedules_bulk(
+    data: BarberScheduleBulkCreate,
+    db: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user_info),
+):
+    return await create_schedules_bulk(
+        db, user_id=current_user["id"], data=data, role=current_user["role"]
+    )
+
+
 @router.get("/schedules/", response_model=list[BarberScheduleOut])
 async def get_my_schedules(
     db: AsyncSession = Depends(get_session),
@@ -70,6 +96,38 @@ async def delete_my_schedule(
     )
 
 
+@router.post("/schedule-templates/", response_model=ScheduleTemplateOut)
+async def create_my_schedule_template(
+    data: ScheduleTemplateCreate,
+    db: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user_info),
+):
+    return await create_schedule_template(
+        db, user_id=current_user["id"], data=data, role=current_user["role"]
+    )
+
+
+@router.get("/schedule-templates/", response_model=list[ScheduleTemplateOut])
+async def get_my_schedule_templates_route(
+    db: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user_info),
+):
+    return await get_my_schedule_templates(
+        db, user_id=current_user["id"], role=current_user["role"]
+    )
+
+
+@router.delete("/schedule-templates/{template_id}")
+async def delete_my_schedule_template(
+    template_id: int,
+    db: AsyncSession = Depends(get_session),
+    current_user=Depends(get_current_user_info),
+):
+    return await delete_schedule_template(
+        db, template_id, user_id=current_user["id"], role=current_user["role"]
+    )
+
+
 @router.get("/me", response_model=BarberOut)
 async def get_my_barber_profile(
     db: AsyncSession = Depends(get_session),
@@ -103,7 +161,10 @@ async def upload_own_avatar(
     barber = await upload_barber_photo(
         db=db, user_id=current_user["id"], file=file, user_role=current_user["role"]
     )
-    return {"avatar_url": barber.avatar_url}
+    return {
+        "avatar_url": barber.avatar_url,
+        "avatar_variants": avatar_variant_urls(barber.avatar_hash),
+    }
 
 
 @router.delete("/avatar")
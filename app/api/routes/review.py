@@ -1,6 +1,6 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user_info, get_session
@@ -9,6 +9,8 @@ from app.services.review_service import (
     create_review_service,
     get_reviews_by_user_service,
 )
+from app.utils.pagination import set_next_cursor
+from app.utils.selectors.reviews import REVIEW_KEYSET
 
 router = APIRouter()
 
@@ -25,10 +27,15 @@ async def create_review(
 
 @router.get("/my-reviews/", response_model=List[ReviewRead])
 async def get_my_reviews(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
     db: AsyncSession = Depends(get_session),
     current_user=Depends(get_current_user_info),
 ):
-    reviews = await get_reviews_by_user_service(db, current_user["id"], skip, limit)
+    reviews = await get_reviews_by_user_service(
+        db, current_user["id"], skip, limit, cursor=cursor
+    )
+    set_next_cursor(response, REVIEW_KEYSET, reviews, limit)
     return reviews
@@ -14,6 +14,25 @@ class Settings:
     )
     DB_URL_SYNC: str = os.getenv("DATABASE_URL_SYNC", "sqlite:///./barbershop.db")
 
+    # DB pool (per worker process: max connections = size + overflow)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_POOL_WARMUP: int = int(os.getenv("DB_POOL_WARMUP", 5))
+    # SQLAlchemy compiled-statement cache
+    DB_QUERY_CACHE_SIZE: int = int(os.getenv("DB_QUERY_CACHE_SIZE", 500))
+    # asyncpg: prepared statements kept per connection by SQLAlchemy, and
+    # asyncpg's own statement cache (set both to 0 behind pgbouncer in
+    # transaction mode)
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = int(
+        os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", 100)
+    )
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
+    # Rows fetched per round trip by the streaming admin exports
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
     # Test database URL
     TEST_DATABASE_URL: str = os.getenv(
         "TEST_DATABASE_URL", "sqlite+aiosqlite:///:memory:"
@@ -25,9 +44,57 @@ class Settings:
     )
     SECRET_KEY: str = os.getenv("SECRET_KEY", "super-secret")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
+    # PEM files for asymmetric algorithms (ES256, RS256, ...); the public key
+    # is derived from the private one when not given.
+    JWT_PRIVATE_KEY_FILE: str | None = os.getenv("JWT_PRIVATE_KEY_FILE")
+    JWT_PUBLIC_KEY_FILE: str | None = os.getenv("JWT_PUBLIC_KEY_FILE")
+    JWT_CACHE_SIZE: int = int(os.getenv("JWT_CACHE_SIZE", 10000))
+
+    # Password hashing
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+    PASSWORD_HASH_WORKERS: int = int(
+        os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1))
+    )
 
     # Redis
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Cached values (ratings, shop info) are recomputed by one caller at a
+    # time, holding a lock for up to CACHE_LOCK_TTL seconds; the others poll
+    # every CACHE_POLL_INTERVAL seconds. CACHE_XFETCH_BETA > 1 refreshes
+    # earlier before expiry, 0 only at expiry.
+    CACHE_LOCK_TTL: int = int(os.getenv("CACHE_LOCK_TTL", 10))
+    CACHE_POLL_INTERVAL: float = float(os.getenv("CACHE_POLL_INTERVAL", 0.05))
+    CACHE_XFETCH_BETA: float = float(os.getenv("CACHE_XFETCH_BETA", 1.0))
+
+    # Response cache
+    RESPONSE_CACHE_ENABLED: bool = (
+        os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    )
+    RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", 300))
+    RESPONSE_CACHE_LOCAL_SIZE: int = int(os.getenv("RESPONSE_CACHE_LOCAL_SIZE", 256))
+
+    # Barbershop info: the YAML file is the source, Redis holds the published
+    # copy. Workers poll the file's mtime every BARBERSHOP_INFO_WATCH_INTERVAL
+    # seconds (0 disables) and republish on change; on a Redis miss only the
+    # holder of a BARBERSHOP_INFO_LOCK_TTL-second lock reads the file.
+    BARBERSHOP_INFO_PATH: str = os.getenv(
+        "BARBERSHOP_INFO_PATH", "data/barbershop_info.yaml"
+    )
+    BARBERSHOP_INFO_WATCH_INTERVAL: float = float(
+        os.getenv("BARBERSHOP_INFO_WATCH_INTERVAL", 2)
+    )
+    BARBERSHOP_INFO_LOCK_TTL: int = int(os.getenv("BARBERSHOP_INFO_LOCK_TTL", 10))
+
+    # Schedule templates
+    SCHEDULE_TEMPLATE_HORIZON_DAYS: int = int(
+        os.getenv("SCHEDULE_TEMPLATE_HORIZON_DAYS", 28)
+    )
+    SCHEDULE_TEMPLATE_BATCH_SIZE: int = int(
+        os.getenv("SCHEDULE_TEMPLATE_BATCH_SIZE", 500)
+    )
+    SCHEDULE_TEMPLATE_EXPAND_INTERVAL: int = int(
+        os.getenv("SCHEDULE_TEMPLATE_EXPAND_INTERVAL", 3600)
+    )
 
     # SuperAdmin
     SUPERADMIN_LOGIN: str = os.getenv("SUPERADMIN_LOGIN", "admin123")
@@ -37,21 +104,82 @@ class Settings:
     TWILIO_ACCOUNT_SID: str = os.getenv("TWILIO_ACCOUNT_SID")
     TWILIO_AUTH_TOKEN: str = os.getenv("TWILIO_AUTH_TOKEN")
     TWILIO_PHONE_NUMBER: str = os.getenv("TWILIO_PHONE_NUMBER")
+    # Where SMS go: "twilio", "log" (written to the log only) or "memory"
+    # (kept in the worker's memory, for tests and load runs).
+    SMS_BACKEND: str = os.getenv("SMS_BACKEND", "twilio")
+
+    # SMS dispatch: messages are queued and sent in batches, each sender
+    # number paced by a token bucket (Twilio long codes allow ~1 msg/s).
+    SMS_RATE_PER_SENDER: float = float(os.getenv("SMS_RATE_PER_SENDER", 1))
+    SMS_BURST_PER_SENDER: float = float(os.getenv("SMS_BURST_PER_SENDER", 5))
+    SMS_BATCH_SIZE: int = int(os.getenv("SMS_BATCH_SIZE", 100))
+    SMS_MAX_RETRIES: int = int(os.getenv("SMS_MAX_RETRIES", 5))
+    SMS_BACKOFF_BASE: float = float(os.getenv("SMS_BACKOFF_BASE", 1))
+    SMS_DISPATCH_INTERVAL: int = int(os.getenv("SMS_DISPATCH_INTERVAL", 10))
+    SMS_DISPATCH_LOCK_TTL: int = int(os.getenv("SMS_DISPATCH_LOCK_TTL", 300))
+    # Appointment reminders are stored in the database and picked up by a
+    # periodic poller, REMINDER_LEAD_MINUTES before the appointment.
+    REMINDER_LEAD_MINUTES: int = int(os.getenv("REMINDER_LEAD_MINUTES", 120))
+    REMINDER_POLL_INTERVAL: int = int(os.getenv("REMINDER_POLL_INTERVAL", 60))
+    REMINDER_BATCH_SIZE: int = int(os.getenv("REMINDER_BATCH_SIZE", 500))
 
     # AWS S3
     AWS_ACCESS_KEY_ID: str = os.getenv("AWS_ACCESS_KEY_ID")
     AWS_SECRET_ACCESS_KEY: str = os.getenv("AWS_SECRET_ACCESS_KEY")
     AWS_REGION: str = os.getenv("AWS_REGION", "us-east-1")
     S3_BUCKET_NAME: str = os.getenv("S3_BUCKET_NAME")
+    # Point at a local stand-in (moto server, MinIO) instead of AWS.
+    S3_ENDPOINT_URL: str | None = os.getenv("S3_ENDPOINT_URL") or None
+    AVATAR_MAX_BYTES: int = int(os.getenv("AVATAR_MAX_BYTES", 10 * 1024 * 1024))
+    AVATAR_VARIANT_SIZES: list[int] = [
+        int(size) for size in os.getenv("AVATAR_VARIANT_SIZES", "64,256,512").split(",")
+    ]
+    AVATAR_PROCESS_WORKERS: int = int(os.getenv("AVATAR_PROCESS_WORKERS", 1))
+    # Replaced objects are deleted by a periodic task; S3 accepts at most 1000
+    # keys per DeleteObjects call. Failed keys are retried with exponential
+    # backoff starting at S3_GC_RETRY_DELAY seconds.
+    S3_GC_INTERVAL: int = int(os.getenv("S3_GC_INTERVAL", 300))
+    S3_GC_BATCH_SIZE: int = min(int(os.getenv("S3_GC_BATCH_SIZE", 1000)), 1000)
+    S3_GC_MAX_ATTEMPTS: int = int(os.getenv("S3_GC_MAX_ATTEMPTS", 8))
+    S3_GC_RETRY_DELAY: int = int(os.getenv("S3_GC_RETRY_DELAY", 60))
 
     # Sentry
     SENTRY_DSN: str = os.getenv("SENTRY_DSN", "")
 
     # Elasticsearch
     ELASTICSEARCH_URL: str = os.getenv("ELASTICSEARCH_URL", "http://localhost:9200")
+    ES_LOG_QUEUE_SIZE: int = int(os.getenv("ES_LOG_QUEUE_SIZE", 10000))
+    ES_LOG_BATCH_SIZE: int = int(os.getenv("ES_LOG_BATCH_SIZE", 500))
+    ES_LOG_FLUSH_INTERVAL: float = float(os.getenv("ES_LOG_FLUSH_INTERVAL", 2.0))
+    # drop | sample | block
+    ES_LOG_BACKPRESSURE: str = os.getenv("ES_LOG_BACKPRESSURE", "drop")
+    ES_LOG_SAMPLE_RATE: float = float(os.getenv("ES_LOG_SAMPLE_RATE", 0.1))
+    ES_LOG_BLOCK_TIMEOUT: float = float(os.getenv("ES_LOG_BLOCK_TIMEOUT", 0.05))
 
     # OpenAI
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    # Point at an OpenAI-compatible server instead, e.g. the stub in
+    # benchmarks/stub_model_server.py for offline load tests.
+    OPENAI_BASE_URL: str | None = os.getenv("OPENAI_BASE_URL") or None
+    AI_MODEL: str = os.getenv("AI_MODEL", "gpt-4o-mini")
+    AI_REQUEST_TIMEOUT: float = float(os.getenv("AI_REQUEST_TIMEOUT", 30))
+    # Model calls in flight per process; further questions wait up to
+    # AI_QUEUE_TIMEOUT seconds for a slot, then get a 503.
+    AI_MAX_CONCURRENCY: int = int(os.getenv("AI_MAX_CONCURRENCY", 20))
+    AI_QUEUE_TIMEOUT: float = float(os.getenv("AI_QUEUE_TIMEOUT", 5))
+    # Common questions (hours, address, services) are answered from
+    # barbershop_info.yaml without a model call; model answers are cached by
+    # normalized question, and near-identical questions (character trigram
+    # similarity >= AI_ANSWER_CACHE_SIMILARITY, 0 disables) reuse them too.
+    AI_FAQ_ENABLED: bool = os.getenv("AI_FAQ_ENABLED", "true").lower() == "true"
+    AI_ANSWER_CACHE_TTL: int = int(os.getenv("AI_ANSWER_CACHE_TTL", 86400))
+    AI_ANSWER_CACHE_SIMILARITY: float = float(
+        os.getenv("AI_ANSWER_CACHE_SIMILARITY", 0.9)
+    )
+    AI_ANSWER_CACHE_RECENT: int = int(os.getenv("AI_ANSWER_CACHE_RECENT", 500))
+    # Shop info and the system prompt are kept per worker and reloaded on a
+    # Redis pub/sub message, or after this many seconds at the latest.
+    AI_PROMPT_REFRESH: int = int(os.getenv("AI_PROMPT_REFRESH", 300))
 
 
 settings = Settings()
@@ -1,6 +1,38 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
 from passlib.context import CryptContext
+from prometheus_client import Gauge, Histogram
+
+from app.core.config import settings
+
+# min/max rounds pinned to the target cost make needs_update() flag every
+# hash made with another cost, in either direction, so hashes migrate on the
+# next successful login after BCRYPT_ROUNDS changes.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL while hashing, so a small thread pool runs hashes in
+# parallel without blocking the event loop. The pool size caps the CPU a
+# worker spends on hashing; excess calls wait in the executor queue.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth", "Password hash/verify calls waiting for a worker"
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_seconds",
+    "Time spent hashing or verifying a password in the worker pool",
+    ["operation"],
+)
 
 
 def get_password_hash(password: str) -> str:
@@ -9,3 +41,33 @@ def get_password_hash(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True for hashes not made with exactly ``BCRYPT_ROUNDS``, so lowering
+    the cost migrates users down as well as up."""
+    return pwd_context.needs_update(hashed_password)
+
+
+def _run_in_pool(operation: str, func, *args):
+    PASSWORD_HASH_QUEUE_DEPTH.inc()
+
+    def task():
+        PASSWORD_HASH_QUEUE_DEPTH.dec()
+        start = perf_counter()
+        try:
+            return func(*args)
+        finally:
+            PASSWORD_HASH_SECONDS.labels(operation).observe(perf_counter() - start)
+
+    return asyncio.get_running_loop().run_in_executor(_hash_executor, task)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_pool("hash", get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_pool(
+        "verify", verify_password, plain_password, hashed_password
+    )
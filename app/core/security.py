@@ -1,9 +1,53 @@
+import hashlib
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from pathlib import Path
+from time import time
 
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+from prometheus_client import Counter
 
 from app.core.config import settings
 
+JWT_CACHE_LOOKUPS = Counter(
+    "jwt_cache_lookups_total", "Access token verification cache lookups", ["result"]
+)
+
+
+def load_keys(
+    algorithm: str,
+    secret: str,
+    private_key_file: str | None = None,
+    public_key_file: str | None = None,
+) -> tuple[Key, Key]:
+    """Build the ``(signing, verification)`` keys once, so PEM parsing and key
+    setup are not repeated for every token."""
+    if algorithm.startswith("HS"):
+        key = jwk.construct(secret, algorithm)
+        return key, key
+
+    if not private_key_file:
+        raise RuntimeError(f"JWT_PRIVATE_KEY_FILE is required for {algorithm}")
+    signing_key = jwk.construct(Path(private_key_file).read_text(), algorithm)
+    if public_key_file:
+        verification_key = jwk.construct(Path(public_key_file).read_text(), algorithm)
+    else:
+        verification_key = signing_key.public_key()
+    return signing_key, verification_key
+
+
+_signing_key, _verification_key = load_keys(
+    settings.ALGORITHM,
+    settings.SECRET_KEY,
+    settings.JWT_PRIVATE_KEY_FILE,
+    settings.JWT_PUBLIC_KEY_FILE,
+)
+
+# sha256(token) -> (exp, payload) for tokens that passed verification. Only
+# valid tokens are stored, so garbage tokens cannot evict real ones.
+_token_cache: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
@@ -11,17 +55,47 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
         expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
+    encoded_jwt = jwt.encode(to_encode, _signing_key, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
+def _get_cached(digest: bytes) -> dict | None:
+    entry = _token_cache.get(digest)
+    if entry is None:
+        return None
+    expires_at, payload = entry
+    if expires_at <= time():
+        _token_cache.pop(digest, None)
+        return None
+    _token_cache.move_to_end(digest)
+    return payload
+
+
+def _set_cached(digest: bytes, payload: dict):
+    expires_at = payload.get("exp")
+    if not isinstance(expires_at, (int, float)) or settings.JWT_CACHE_SIZE <= 0:
+        return
+    _token_cache[digest] = (expires_at, payload)
+    _token_cache.move_to_end(digest)
+    while len(_token_cache) > settings.JWT_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+
+
+def clear_token_cache():
+    _token_cache.clear()
+
+
 def decode_access_token(token: str) -> dict | None:
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = _get_cached(digest)
+    if payload is not None:
+        JWT_CACHE_LOOKUPS.labels("hit").inc()
+        return dict(payload)
+
+    JWT_CACHE_LOOKUPS.labels("miss").inc()
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        return payload
+        payload = jwt.decode(token, _verification_key, algorithms=[settings.ALGORITHM])
     except JWTError:
         return None
+    _set_cached(digest, payload)
+    return dict(payload)
@@ -0,0 +1,44 @@
+import asyncio
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import async_session
+from app.models import BarberRatingStats, Review
+from app.utils.redis_client import redis_client
+
+
+async def rebuild_rating_stats(session: AsyncSession) -> int:
+    totals = (
+        select(
+            Review.barber_id,
+            func.coalesce(func.sum(Review.rating), 0),
+            func.count(Review.id),
+        )
+        .where(Review.is_approved.is_(True))
+        .group_by(Review.barber_id)
+    )
+    await session.execute(delete(BarberRatingStats))
+    result = await session.execute(
+        insert(BarberRatingStats).from_select(
+            ["barber_id", "rating_sum", "rating_count"], totals
+        )
+    )
+    await session.commit()
+    return result.rowcount
+
+
+async def clear_cached_ratings():
+    async for key in redis_client.scan_iter(match="barber_rating:*"):
+        await redis_client.delete(key)
+
+
+async def main():
+    async with async_session() as session:
+        count = await rebuild_rating_stats(session)
+    await clear_cached_ratings()
+    print(f"Rebuilt rating stats for {count} barbers")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
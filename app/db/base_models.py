@@ -1,6 +1,10 @@
 from app.models.appointment import Appointment  # noqa: F401
+from app.models.appointment_reminder import AppointmentReminder  # noqa: F401
 from app.models.barber import Barber  # noqa: F401
+from app.models.barber_rating_stats import BarberRatingStats  # noqa: F401
 from app.models.barberschedule import BarberSchedule  # noqa: F401
 from app.models.review import Review  # noqa: F401
 from app.models.role import Role  # noqa: F401
+from app.models.s3_deletion import S3Deletion  # noqa: F401
+from app.models.schedule_template import ScheduleTemplate  # noqa: F401
 from app.models.user import User  # noqa: F401
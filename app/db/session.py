@@ -1,6 +1,99 @@
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from time import perf_counter
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
-engine = create_async_engine(settings.DB_URL_ASYNC, echo=False)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the DB pool",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT because the pool was exhausted",
+)
+POOL_IN_USE = Gauge("db_pool_connections_in_use", "DB connections checked out")
+POOL_IDLE = Gauge("db_pool_connections_idle", "DB connections idle in the pool")
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        start = perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.observe(perf_counter() - start)
+
+
+def engine_options(url: str) -> dict:
+    options = {
+        "echo": False,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+    }
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (
+        None,
+        "",
+        ":memory:",
+    ):
+        # In-memory SQLite lives on a single shared connection.
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if parsed.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+def track_pool(engine: AsyncEngine):
+    pool = engine.pool
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        POOL_IN_USE.set_function(pool.checkedout)
+        POOL_IDLE.set_function(pool.checkedin)
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> int:
+    """Open ``connections`` pool connections up front so the first requests
+    after a deploy do not pay for connection setup."""
+    pool = engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return 0
+    connections = min(connections, pool.size())
+
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(await engine.connect())
+    finally:
+        for connection in opened:
+            await connection.close()
+    return len(opened)
+
+
+engine = create_async_engine(
+    settings.DB_URL_ASYNC, **engine_options(settings.DB_URL_ASYNC)
+)
+track_pool(engine)
 async_session = async_sessionmaker(engine, expire_on_commit=False)
@@ -1,3 +1,5 @@
+import asyncio
+
 import redis.asyncio as redis
 import sentry_sdk
 from fastapi import FastAPI
@@ -10,7 +12,10 @@ from app.api.routes import ai_assistant, appointments, barbers, review, users
 from app.api.routes.admin import admin_router
 from app.api.routes.admin.superadmin import router as superadmin_router
 from app.core.config import settings
-from app.utils.logger import es_client, logger
+from app.db.session import engine, warm_up_pool
+from app.services.ai_prompt import listen_for_shop_info_updates
+from app.services.barbershop_info import watch_barbershop_info_file
+from app.utils.logger import es_handler, logger
 
 sentry_sdk.init(
     dsn=settings.SENTRY_DSN,
@@ -29,6 +34,8 @@ app.add_middleware(PrometheusMiddleware)
 
 app.add_route("/metrics", handle_metrics)
 
+_background_tasks: list[asyncio.Task] = []
+
 
 @app.on_event("startup")
 async def startup():
@@ -38,11 +45,27 @@ async def startup():
     await FastAPILimiter.init(redis_connection)
     logger.info("Application startup: FastAPILimiter initialized, Redis connected")
 
+    try:
+        opened = await warm_up_pool(engine, settings.DB_POOL_WARMUP)
+        logger.info(f"Application startup: DB pool warmed up with {opened} connections")
+    except Exception as e:
+        logger.warning(f"Application startup: DB pool warm-up failed: {e}")
+
+    _background_tasks.append(asyncio.create_task(listen_for_shop_info_updates()))
+    logger.info("Application startup: listening for barbershop info updates")
+    if settings.BARBERSHOP_INFO_WATCH_INTERVAL > 0:
+        _background_tasks.append(asyncio.create_task(watch_barbershop_info_file()))
+
 
 @app.on_event("shutdown")
 async def shutdown():
-    logger.info("Application shutdown: closing Elasticsearch client")
-    await es_client.close()
+    for task in _background_tasks:
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+    _background_tasks.clear()
+
+    logger.info("Application shutdown: flushing Elasticsearch log queue")
+    es_handler.close()
 
 
 app.include_router(users.router, prefix="/users", tags=["users"])
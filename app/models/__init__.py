@@ -1,6 +1,10 @@
 from .appointment import Appointment  # noqa: F401
+from .appointment_reminder import AppointmentReminder  # noqa: F401
 from .barber import Barber  # noqa: F401
+from .barber_rating_stats import BarberRatingStats  # noqa: F401
 from .barberschedule import BarberSchedule  # noqa: F401
 from .review import Review  # noqa: F401
 from .role import Role  # noqa: F401
+from .s3_deletion import S3Deletion  # noqa: F401
+from .schedule_template import ScheduleTemplate  # noqa: F401
 from .user import User  # noqa: F401
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+
+class AppointmentReminder(Base):
+    """A pending reminder SMS, one per upcoming appointment. The row is removed
+    once the reminder is handed to the SMS outbox or the appointment goes."""
+
+    __tablename__ = "appointment_reminders"
+
+    id = Column(Integer, primary_key=True, index=True)
+    appointment_id = Column(
+        Integer,
+        ForeignKey("appointments.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    send_at = Column(DateTime, nullable=False, index=True)
+
+    appointment = relationship("Appointment")
@@ -11,6 +11,9 @@ class Barber(Base):
     user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
     full_name = Column(String, nullable=True)
     avatar_url = Column(String, nullable=True)
+    # sha256 of the uploaded avatar; its resized variants live under
+    # avatars/<hash>/ (see app.utils.avatars).
+    avatar_hash = Column(String(64), nullable=True, index=True)
 
     user = relationship("User")
     schedules = relationship(
@@ -26,3 +29,12 @@ class Barber(Base):
     reviews = relationship(
         "Review", back_populates="barber", cascade="all, delete-orphan"
     )
+    schedule_templates = relationship(
+        "ScheduleTemplate", back_populates="barber", cascade="all, delete-orphan"
+    )
+    rating_stats = relationship(
+        "BarberRatingStats",
+        back_populates="barber",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
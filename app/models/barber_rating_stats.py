@@ -0,0 +1,20 @@
+from sqlalchemy import Column, ForeignKey, Integer
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+
+class BarberRatingStats(Base):
+    __tablename__ = "barber_rating_stats"
+
+    barber_id = Column(Integer, ForeignKey("barbers.id"), primary_key=True)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    rating_count = Column(Integer, nullable=False, default=0)
+
+    barber = relationship("Barber", back_populates="rating_stats")
+
+    @property
+    def avg_rating(self) -> float:
+        if not self.rating_count:
+            return 0.0
+        return self.rating_sum / self.rating_count
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Date, ForeignKey, Integer, Time
+from sqlalchemy import Boolean, Column, Date, ForeignKey, Index, Integer, Time
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -6,6 +6,14 @@ from app.db.base import Base
 
 class BarberSchedule(Base):
     __tablename__ = "barber_schedules"
+    __table_args__ = (
+        Index(
+            "ix_barber_schedules_barber_id_date_start_time",
+            "barber_id",
+            "date",
+            "start_time",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     barber_id = Column(Integer, ForeignKey("barbers.id"))
@@ -13,5 +21,8 @@ class BarberSchedule(Base):
     start_time = Column(Time)
     end_time = Column(Time)
     is_active = Column(Boolean, default=True)
+    template_id = Column(
+        Integer, ForeignKey("schedule_templates.id", ondelete="SET NULL"), nullable=True
+    )
 
     barber = relationship("Barber", back_populates="schedules")
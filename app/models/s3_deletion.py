@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.db.base import Base
+
+
+class S3Deletion(Base):
+    """An S3 object no longer referenced by the database, waiting to be deleted
+    by the garbage-collection task."""
+
+    __tablename__ = "s3_deletions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(
+        DateTime, nullable=False, default=datetime.utcnow, index=True
+    )
+    last_error = Column(String, nullable=True)
@@ -0,0 +1,22 @@
+from sqlalchemy import Boolean, Column, Date, ForeignKey, Integer, Time
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+
+class ScheduleTemplate(Base):
+    __tablename__ = "schedule_templates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    barber_id = Column(Integer, ForeignKey("barbers.id"), nullable=False, index=True)
+    weekday = Column(Integer, nullable=False)  # 0 = Monday, as date.weekday()
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+    slot_minutes = Column(Integer, nullable=False)
+    valid_from = Column(Date, nullable=False)
+    valid_to = Column(Date, nullable=True)
+    is_active = Column(Boolean, nullable=False, default=True)
+    # Last date already expanded into barber_schedules.
+    generated_until = Column(Date, nullable=True)
+
+    barber = relationship("Barber", back_populates="schedule_templates")
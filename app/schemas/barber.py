@@ -1,7 +1,7 @@
 import re
 from typing import List, Optional
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, computed_field, field_validator
 
 from app.schemas.review import ReviewReadForBarber
 from app.schemas.validators import (
@@ -9,6 +9,7 @@ from app.schemas.validators import (
     validate_phone,
     validate_username_length,
 )
+from app.utils.avatars import avatar_variant_urls
 
 
 class BarberBase(BaseModel):
@@ -33,7 +34,18 @@ class BarberCreate(BarberBase):
         return validate_password_complexity(v)
 
 
-class BarberOut(BarberBase):
+class AvatarVariantsMixin(BaseModel):
+    avatar_hash: Optional[str] = Field(None, exclude=True)
+
+    @computed_field
+    @property
+    def avatar_variants(self) -> Optional[dict[int, dict[str, str]]]:
+        """``{size: {"webp": url, "jpeg": url}}`` for the square avatar
+        renditions, or ``None`` when there is no processed avatar."""
+        return avatar_variant_urls(self.avatar_hash)
+
+
+class BarberOut(AvatarVariantsMixin, BarberBase):
     id: int
     avatar_url: Optional[str] = None
 
@@ -41,7 +53,7 @@ class BarberOut(BarberBase):
         from_attributes = True
 
 
-class BarberOutwithReviews(BarberBase):
+class BarberOutwithReviews(AvatarVariantsMixin, BarberBase):
     id: int
     avatar_url: Optional[str] = None
     avg_rating: float = 0.0
@@ -64,7 +76,7 @@ class BarberUpdate(BaseModel):
         return v
 
 
-class BarberOutwithReviewsDetailed(BaseModel):
+class BarberOutwithReviewsDetailed(AvatarVariantsMixin):
     id: int
     full_name: str
     avatar_url: Optional[str] = None
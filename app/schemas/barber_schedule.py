@@ -1,6 +1,6 @@
 import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 
 class BarberScheduleBase(BaseModel):
@@ -71,3 +71,51 @@ class AdminBarberScheduleOut(BarberScheduleOut):
 
     class Config:
         from_attributes = True
+
+
+class BarberScheduleBulkCreate(BaseModel):
+    slots: list[BarberScheduleCreate] = Field(..., min_length=1, max_length=500)
+
+
+class AdminBarberScheduleBulkCreate(BarberScheduleBulkCreate):
+    barber_id: int
+
+
+class ScheduleSlotResult(BaseModel):
+    index: int
+    accepted: bool
+    reason: str | None = None
+    schedule: BarberScheduleOut | None = None
+
+
+class BarberScheduleBulkOut(BaseModel):
+    created: int
+    rejected: int
+    results: list[ScheduleSlotResult]
+
+
+class ScheduleTemplateCreate(BaseModel):
+    weekday: int = Field(..., ge=0, le=6)
+    start_time: datetime.time
+    end_time: datetime.time
+    slot_minutes: int = Field(..., ge=5, le=480)
+    valid_from: datetime.date
+    valid_to: datetime.date | None = None
+
+    @model_validator(mode="after")
+    def check_ranges(self):
+        if self.start_time >= self.end_time:
+            raise ValueError("Start time must be earlier than end time")
+        if self.valid_to is not None and self.valid_to < self.valid_from:
+            raise ValueError("valid_to must not be earlier than valid_from")
+        return self
+
+
+class ScheduleTemplateOut(ScheduleTemplateCreate):
+    id: int
+    is_active: bool
+    generated_until: datetime.date | None = None
+
+    class Config:
+        from_attributes = True
+        json_encoders = {datetime.time: lambda v: v.strftime("%H:%M")}
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class BarbershopInfo(BaseModel):
+    # Fields not listed here are kept as they are, so saving the info never
+    # drops what the file already holds.
+    model_config = ConfigDict(extra="allow")
+
+    address: str = Field(..., min_length=1)
+    working_hours: str = Field(..., min_length=1)
+    services: list[str] = Field(..., min_length=1)
+    description: str = ""
+    notes: str = ""
+    prices: dict[str, str] = {}
@@ -129,3 +129,16 @@ class AdminOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class PasswordHashSchemeCount(BaseModel):
+    scheme: str
+    rounds: Optional[int]
+    count: int
+    needs_update: bool
+
+
+class PasswordHashReport(BaseModel):
+    total: int
+    target_rounds: int
+    schemes: list[PasswordHashSchemeCount]
@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from fastapi import HTTPException
 from sqlalchemy import select
@@ -8,9 +8,14 @@ from app.models.appointment import Appointment
 from app.models.barberschedule import BarberSchedule
 from app.schemas.appointment import AppointmentCreate
 from app.services.admin.utils import ensure_admin
+from app.services.appointment_service import book_schedule
+from app.services.reminder_service import cancel_reminder
 from app.utils.celery_tasks.sms import send_sms_task
 from app.utils.logger import logger
-from app.utils.selectors.schedule import get_schedule_by_id_simple
+from app.utils.pagination import Keyset
+from app.utils.response_cache import invalidate_response_cache
+
+APPOINTMENT_KEYSET = Keyset(Appointment.appointment_time, Appointment.id)
 
 
 async def admin_get_appointments_service(
@@ -20,6 +25,7 @@ async def admin_get_appointments_service(
     limit: int,
     role: str,
     admin_id: int,
+    cursor: str | None = None,
 ):
     ensure_admin(role)
 
@@ -30,6 +36,7 @@ async def admin_get_appointments_service(
             "upcoming_only": upcoming_only,
             "skip": skip,
             "limit": limit,
+            "cursor": cursor,
             "role": role,
         },
     )
@@ -38,7 +45,7 @@ async def admin_get_appointments_service(
     if upcoming_only:
         now = datetime.utcnow()
         query = query.where(Appointment.appointment_time >= now)
-    query = query.offset(skip).limit(limit).order_by(Appointment.appointment_time.asc())
+    query = APPOINTMENT_KEYSET.paginate(query, limit, cursor=cursor, skip=skip)
 
     result = await db.execute(query)
     appointments = result.scalars().all()
@@ -68,14 +75,6 @@ async def admin_create_appointment_service(
         },
     )
 
-    schedule = await get_schedule_by_id_simple(db, data.schedule_id)
-    if not schedule or not schedule.is_active:
-        logger.warning(
-            "Schedule not available for admin appointment",
-            extra={"schedule_id": data.schedule_id, "admin_id": admin_id},
-        )
-        raise HTTPException(400, "Selected time slot is not available")
-
     if not data.client_name or not data.client_phone:
         logger.warning(
             "Missing name or phone for admin appointment",
@@ -83,22 +82,15 @@ async def admin_create_appointment_service(
         )
         raise HTTPException(400, "Name and phone required for admin booking")
 
-    appointment_dt = datetime.combine(schedule.date, schedule.start_time)
-
-    appointment = Appointment(
-        barber_id=data.barber_id,
+    appointment = await book_schedule(
+        db,
+        data,
         client_name=data.client_name,
         client_phone=data.client_phone,
-        appointment_time=appointment_dt,
-        status="scheduled",
         client_id=None,
-        schedule_id=data.schedule_id,
     )
-
-    db.add(appointment)
-    schedule.is_active = False
-    await db.commit()
-    await db.refresh(appointment)
+    appointment_dt = appointment.appointment_time
+    await invalidate_response_cache()
 
     logger.info(
         "Admin created appointment",
@@ -125,28 +117,6 @@ async def admin_create_appointment_service(
         extra={"appointment_id": appointment.id, "admin_id": admin_id},
     )
 
-    now = datetime.utcnow()
-    remind_time = appointment_dt - timedelta(hours=2)
-    seconds_until_reminder = (remind_time - now).total_seconds()
-
-    if seconds_until_reminder > 0:
-        send_sms_task.apply_async(
-            args=(
-                data.client_phone,
-                f"Dear {data.client_name}, this is a reminder of your appointment scheduled for "
-                f"{appointment_dt.strftime('%A, %B %d, %Y at %I:%M %p')}. See you soon!",
-            ),
-            countdown=seconds_until_reminder,
-        )
-        logger.info(
-            "Reminder SMS scheduled",
-            extra={
-                "admin_id": admin_id,
-                "client_phone": data.client_phone,
-                "reminder_in_seconds": round(seconds_until_reminder),
-            },
-        )
-
     return appointment
 
 
@@ -190,12 +160,14 @@ async def admin_delete_appointment_service(
         )
         raise HTTPException(status_code=404, detail="Related schedule not found")
 
+    await cancel_reminder(db, appointment.id)
     await db.delete(appointment)
 
     schedule.is_active = True
     db.add(schedule)
 
     await db.commit()
+    await invalidate_response_cache()
     logger.info(
         "Admin deleted appointment and reactivated schedule",
         extra={
@@ -1,11 +1,11 @@
-import re
 from datetime import date, datetime
 
 from fastapi import HTTPException, UploadFile, status
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.hash import get_password_hash
+from app.core.config import settings
+from app.core.hash import get_password_hash_async
 from app.models.appointment import Appointment
 from app.models.barber import Barber
 from app.models.barberschedule import BarberSchedule
@@ -13,12 +13,20 @@ from app.models.enums import RoleEnum
 from app.models.user import User
 from app.schemas.barber import BarberCreate, BarberUpdate
 from app.schemas.barber_schedule import (
+    AdminBarberScheduleBulkCreate,
     AdminBarberScheduleCreate,
     AdminBarberScheduleUpdate,
 )
 from app.services.admin.utils import ensure_admin
-from app.services.s3_service import delete_file_from_s3, upload_file_to_s3
+from app.services.avatar_service import create_avatar_variants
+from app.services.reminder_service import reschedule_reminder
+from app.services.s3_gc_service import enqueue_s3_deletions
+from app.services.s3_service import check_upload_size
+from app.services.schedule_service import bulk_create_schedules
+from app.utils.avatars import avatar_object_keys, avatar_url
 from app.utils.logger import logger
+from app.utils.pagination import Keyset
+from app.utils.response_cache import invalidate_response_cache
 from app.utils.selectors.barber import get_barber_by_id as get_barber_by_id_nonlocal
 from app.utils.selectors.schedule import (
     get_schedule_by_id_simple,
@@ -31,14 +39,28 @@ from app.utils.selectors.user import (
 )
 from app.utils.time_correction import check_time_overlap, trim_time
 
+BARBER_KEYSET = Keyset(Barber.id)
 
-async def get_all_barbers(db: AsyncSession, user_role: RoleEnum, admin_id: int):
+
+async def get_all_barbers(
+    db: AsyncSession,
+    user_role: RoleEnum,
+    admin_id: int,
+    limit: int = 50,
+    cursor: str | None = None,
+):
     ensure_admin(user_role)
     logger.info(
-        "Fetching all barbers", extra={"admin_role": user_role, "admin_id": admin_id}
+        "Fetching all barbers",
+        extra={
+            "admin_role": user_role,
+            "admin_id": admin_id,
+            "limit": limit,
+            "cursor": cursor,
+        },
     )
 
-    result = await db.execute(select(Barber))
+    result = await db.execute(BARBER_KEYSET.paginate(select(Barber), limit, cursor))
     barbers = result.scalars().all()
 
     logger.info(
@@ -84,7 +106,7 @@ async def create_barber(
 
     user = User(
         username=barber_data.username,
-        hashed_password=get_password_hash(barber_data.password),
+        hashed_password=await get_password_hash_async(barber_data.password),
         phone=barber_data.phone,
         role_id=barber_role_id,
     )
@@ -99,6 +121,7 @@ async def create_barber(
     db.add(barber)
     await db.commit()
     await db.refresh(barber)
+    await invalidate_response_cache()
 
     logger.info(
         "Barber created",
@@ -135,6 +158,7 @@ async def delete_barber(
 
     await db.delete(barber)
     await db.commit()
+    await invalidate_response_cache()
     logger.info("Barber deleted", extra={"barber_id": barber_id, "admin_id": admin_id})
 
 
@@ -170,6 +194,7 @@ async def update_barber_by_admin(
     db.add(barber)
     await db.commit()
     await db.refresh(barber)
+    await invalidate_response_cache()
 
     logger.info("Barber updated", extra={"barber_id": barber_id, "admin_id": admin_id})
     return barber
@@ -219,35 +244,32 @@ async def upload_barber_photo(
         )
         raise HTTPException(status_code=404, detail="Barber not found")
 
-    content = await file.read()
-
     if not file.content_type.startswith("image/"):
         logger.warning(
             "Invalid file type for photo upload",
             extra={"content_type": file.content_type, "admin_id": admin_id},
         )
         raise HTTPException(status_code=400, detail="Only image files are allowed")
-
-    if barber.avatar_url:
-        match = re.search(r"/barbers/.*$", barber.avatar_url)
-        if match:
-            key = match.group(0).lstrip("/")
-            logger.info(
-                "Deleting old barber photo from S3",
-                extra={"key": key, "admin_id": admin_id},
-            )
-            await delete_file_from_s3(key)
-
-    url = await upload_file_to_s3(content, file.filename, file.content_type)
-    logger.info(
-        "Uploaded new barber photo to S3", extra={"url": url, "admin_id": admin_id}
+    check_upload_size(file, settings.AVATAR_MAX_BYTES)
+    avatar_hash = await create_avatar_variants(db, file)
+
+    # The variants are stored before the barber row changes, so a rejected or
+    # failed upload keeps the current avatar.
+    url = avatar_url(avatar_hash)
+
+    old_keys = avatar_object_keys(barber.avatar_url, barber.avatar_hash)
+    stmt = (
+        update(Barber)
+        .where(Barber.id == barber_id)
+        .values(avatar_url=url, avatar_hash=avatar_hash)
     )
-
-    stmt = update(Barber).where(Barber.id == barber_id).values(avatar_url=url)
     await db.execute(stmt)
+    enqueue_s3_deletions(db, old_keys)
     await db.commit()
+    await invalidate_response_cache()
 
     barber.avatar_url = url
+    barber.avatar_hash = avatar_hash
     logger.info(
         "Barber photo updated in DB",
         extra={"barber_id": barber_id, "admin_id": admin_id},
@@ -278,21 +300,24 @@ async def remove_barber_photo(
         )
         raise HTTPException(status_code=400, detail="Barber has no avatar to delete")
 
-    match = re.search(r"/barbers/.*$", barber.avatar_url)
-    if match:
-        key = match.group(0).lstrip("/")
-        logger.info(
-            "Deleting barber photo from S3", extra={"key": key, "admin_id": admin_id}
-        )
-        await delete_file_from_s3(key)
-
-    stmt = update(Barber).where(Barber.id == barber_id).values(avatar_url=None)
+    old_keys = avatar_object_keys(barber.avatar_url, barber.avatar_hash)
+    stmt = (
+        update(Barber)
+        .where(Barber.id == barber_id)
+        .values(avatar_url=None, avatar_hash=None)
+    )
     await db.execute(stmt)
+    enqueue_s3_deletions(db, old_keys)
     await db.commit()
+    await invalidate_response_cache()
 
     logger.info(
         "Barber avatar_url set to None in DB",
-        extra={"barber_id": barber_id, "admin_id": admin_id},
+        extra={
+            "barber_id": barber_id,
+            "admin_id": admin_id,
+            "queued_keys": len(old_keys),
+        },
     )
 
 
@@ -304,6 +329,8 @@ async def admin_get_all_schedules(
     barber_id: int | None = None,
     start_date: date | None = None,
     end_date: date | None = None,
+    limit: int = 100,
+    cursor: str | None = None,
 ):
     ensure_admin(role)
     logger.info(
@@ -313,12 +340,20 @@ async def admin_get_all_schedules(
             "barber_id": barber_id,
             "start_date": start_date,
             "end_date": end_date,
+            "limit": limit,
+            "cursor": cursor,
             "admin_role": role,
             "admin_id": admin_id,
         },
     )
     schedules = await select_all_schedules_flat(
-        db, upcoming_only, barber_id, start_date, end_date
+        db,
+        upcoming_only,
+        barber_id,
+        start_date,
+        end_date,
+        limit=limit,
+        cursor=cursor,
     )
     logger.info(
         "Schedules fetched", extra={"count": len(schedules), "admin_id": admin_id}
@@ -388,6 +423,7 @@ async def admin_create_schedule_service(
     db.add(schedule)
     await db.commit()
     await db.refresh(schedule)
+    await invalidate_response_cache()
     logger.info(
         "Schedule created successfully",
         extra={"schedule_id": schedule.id, "admin_id": admin_id},
@@ -395,6 +431,34 @@ async def admin_create_schedule_service(
     return schedule
 
 
+async def admin_bulk_create_schedule_service(
+    db: AsyncSession,
+    data: AdminBarberScheduleBulkCreate,
+    role: RoleEnum,
+    admin_id: int,
+):
+    ensure_admin(role)
+    logger.info(
+        "Admin bulk creating schedules",
+        extra={
+            "barber_id": data.barber_id,
+            "slot_count": len(data.slots),
+            "role": role,
+            "admin_id": admin_id,
+        },
+    )
+
+    barber = await get_barber_by_id_nonlocal(db, data.barber_id)
+    if not barber:
+        logger.warning(
+            "Barber not found when bulk creating schedules",
+            extra={"barber_id": data.barber_id, "admin_id": admin_id},
+        )
+        raise HTTPException(status_code=404, detail="Barber not found")
+
+    return await bulk_create_schedules(db, data.barber_id, data.slots)
+
+
 async def admin_update_schedule_service(
     db: AsyncSession,
     schedule_id: int,
@@ -480,7 +544,9 @@ async def admin_update_schedule_service(
     appointment = result.scalar_one_or_none()
 
     if appointment:
-        appointment.appointment_time = schedule_start
+        if appointment.appointment_time != schedule_start:
+            appointment.appointment_time = schedule_start
+            await reschedule_reminder(db, appointment)
         if old_barber_id != barber_id:
             appointment.barber_id = barber_id
         db.add(appointment)
@@ -488,6 +554,7 @@ async def admin_update_schedule_service(
     db.add(schedule)
     await db.commit()
     await db.refresh(schedule)
+    await invalidate_response_cache()
     logger.info(
         "Schedule updated successfully",
         extra={"schedule_id": schedule.id, "admin_id": admin_id},
@@ -525,6 +592,7 @@ async def admin_delete_schedule_service(
 
     await db.delete(schedule)
     await db.commit()
+    await invalidate_response_cache()
     logger.info(
         "Schedule deleted successfully",
         extra={"schedule_id": schedule_id, "admin_id": admin_id},
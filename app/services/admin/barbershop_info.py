@@ -0,0 +1,30 @@
+import asyncio
+
+from app.core.config import settings
+from app.schemas.barbershop_info import BarbershopInfo
+from app.services.admin.utils import ensure_admin
+from app.services.barbershop_info import publish_shop_info, write_barbershop_info_file
+from app.utils.logger import logger
+from app.utils.redis_client import load_barbershop_info
+
+
+async def get_barbershop_info_service(user_role: str) -> dict:
+    ensure_admin(user_role)
+    return await load_barbershop_info()
+
+
+async def update_barbershop_info_service(
+    info: BarbershopInfo, user_role: str, admin_id: int
+) -> BarbershopInfo:
+    """Save ``info`` to the YAML file, so it survives a Redis flush, and
+    publish it to every worker."""
+    ensure_admin(user_role)
+    await asyncio.to_thread(
+        write_barbershop_info_file, settings.BARBERSHOP_INFO_PATH, info.model_dump()
+    )
+    published = await publish_shop_info(info)
+    logger.info(
+        "Barbershop info updated",
+        extra={"admin_id": admin_id, "published": published},
+    )
+    return info
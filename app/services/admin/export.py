@@ -0,0 +1,114 @@
+from datetime import date, datetime, time, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import Select, select
+
+from app.models.appointment import Appointment
+from app.models.barberschedule import BarberSchedule
+from app.models.review import Review
+from app.services.admin.utils import ensure_admin
+from app.utils.logger import logger
+
+
+def _check_range(start_date: date | None, end_date: date | None):
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=400, detail="start_date must not be after end_date"
+        )
+
+
+def _datetime_range(
+    query: Select, column, start_date: date | None, end_date: date | None
+) -> Select:
+    """Both ends inclusive: ``end_date`` covers the whole day."""
+    if start_date:
+        query = query.where(column >= datetime.combine(start_date, time.min))
+    if end_date:
+        query = query.where(
+            column < datetime.combine(end_date + timedelta(days=1), time.min)
+        )
+    return query
+
+
+def _log_export(name: str, admin_id: int, start_date, end_date):
+    logger.info(
+        f"Admin exporting {name}",
+        extra={"admin_id": admin_id, "start_date": start_date, "end_date": end_date},
+    )
+
+
+def admin_export_appointments_query(
+    role: str,
+    admin_id: int,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> Select:
+    ensure_admin(role)
+    _check_range(start_date, end_date)
+    _log_export("appointments", admin_id, start_date, end_date)
+
+    query = select(
+        Appointment.id,
+        Appointment.appointment_time,
+        Appointment.barber_id,
+        Appointment.schedule_id,
+        Appointment.client_id,
+        Appointment.client_name,
+        Appointment.client_phone,
+        Appointment.status,
+    ).order_by(Appointment.appointment_time, Appointment.id)
+    return _datetime_range(query, Appointment.appointment_time, start_date, end_date)
+
+
+def admin_export_schedules_query(
+    role: str,
+    admin_id: int,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    barber_id: int | None = None,
+) -> Select:
+    ensure_admin(role)
+    _check_range(start_date, end_date)
+    _log_export("schedules", admin_id, start_date, end_date)
+
+    query = select(
+        BarberSchedule.id,
+        BarberSchedule.barber_id,
+        BarberSchedule.date,
+        BarberSchedule.start_time,
+        BarberSchedule.end_time,
+        BarberSchedule.is_active,
+        BarberSchedule.template_id,
+    ).order_by(BarberSchedule.date, BarberSchedule.start_time, BarberSchedule.id)
+    if barber_id:
+        query = query.where(BarberSchedule.barber_id == barber_id)
+    if start_date:
+        query = query.where(BarberSchedule.date >= start_date)
+    if end_date:
+        query = query.where(BarberSchedule.date <= end_date)
+    return query
+
+
+def admin_export_reviews_query(
+    role: str,
+    admin_id: int,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    only_unapproved: bool = False,
+) -> Select:
+    ensure_admin(role)
+    _check_range(start_date, end_date)
+    _log_export("reviews", admin_id, start_date, end_date)
+
+    query = select(
+        Review.id,
+        Review.created_at,
+        Review.barber_id,
+        Review.client_id,
+        Review.rating,
+        Review.comment,
+        Review.is_approved,
+    ).order_by(Review.created_at, Review.id)
+    if only_unapproved:
+        query = query.where(Review.is_approved.is_(False))
+    return _datetime_range(query, Review.created_at, start_date, end_date)
@@ -1,15 +1,23 @@
 from fastapi import HTTPException
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.review import Review
 from app.services.admin.utils import ensure_admin
+from app.services.barber_rating import apply_rating_change
 from app.utils.logger import logger
-from app.utils.redis_client import get_barber_rating, save_barber_rating
-from app.utils.selectors.reviews import get_all_reviews, get_barber_rating_from_db
+from app.utils.redis_client import delete_barber_rating
+from app.utils.response_cache import invalidate_response_cache
+from app.utils.selectors.reviews import get_all_reviews
 
 
 async def get_all_reviews_service(
-    db: AsyncSession, user_role: str, admin_id: int, only_unapproved: bool = False
+    db: AsyncSession,
+    user_role: str,
+    admin_id: int,
+    only_unapproved: bool = False,
+    limit: int = 50,
+    cursor: str | None = None,
 ):
     ensure_admin(user_role)
     logger.info(
@@ -17,10 +25,14 @@ async def get_all_reviews_service(
         extra={
             "admin_id": admin_id,
             "only_unapproved": only_unapproved,
+            "limit": limit,
+            "cursor": cursor,
             "role": user_role,
         },
     )
-    reviews = await get_all_reviews(db, only_unapproved=only_unapproved)
+    reviews = await get_all_reviews(
+        db, only_unapproved=only_unapproved, limit=limit, cursor=cursor
+    )
     logger.info("Reviews fetched", extra={"admin_id": admin_id, "count": len(reviews)})
     return reviews
 
@@ -49,47 +61,33 @@ async def approve_review_service(
         )
         raise HTTPException(status_code=400, detail="Review already approved")
 
-    review.is_approved = True
-    await db.commit()
-    logger.info(
-        "Review approved",
-        extra={"review_id": review_id, "admin_id": admin_id},
+    result = await db.execute(
+        update(Review)
+        .where(Review.id == review_id, Review.is_approved.is_(False))
+        .values(is_approved=True)
     )
-
-    cached_rating = await get_barber_rating(review.barber_id)
-
-    if cached_rating:
-        avg_rating, count = cached_rating
-        total_sum = avg_rating * count + review.rating
-        new_count = count + 1
-        new_avg = total_sum / new_count
-        logger.info(
-            "Updated rating from cache",
-            extra={
-                "barber_id": review.barber_id,
-                "new_avg": new_avg,
-                "new_count": new_count,
-                "admin_id": admin_id,
-            },
-        )
-    else:
-        new_avg, new_count = await get_barber_rating_from_db(db, review.barber_id)
-        logger.info(
-            "Updated rating from DB",
-            extra={
-                "barber_id": review.barber_id,
-                "new_avg": new_avg,
-                "new_count": new_count,
-                "admin_id": admin_id,
-            },
+    if not result.rowcount:
+        logger.warning(
+            "Review approved concurrently",
+            extra={"review_id": review_id, "admin_id": admin_id},
         )
+        raise HTTPException(status_code=400, detail="Review already approved")
 
-    await save_barber_rating(
-        barber_id=review.barber_id,
-        avg_rating=new_avg,
-        count=new_count,
+    await apply_rating_change(
+        db, review.barber_id, rating_delta=review.rating, count_delta=1
+    )
+    await db.commit()
+    logger.info(
+        "Review approved",
+        extra={
+            "review_id": review_id,
+            "barber_id": review.barber_id,
+            "admin_id": admin_id,
+        },
     )
 
+    await delete_barber_rating(review.barber_id)
+    await invalidate_response_cache()
     return review
 
 
@@ -115,6 +113,10 @@ async def delete_review_service(
     removed_rating = review.rating
 
     await db.delete(review)
+    if was_approved:
+        await apply_rating_change(
+            db, barber_id, rating_delta=-removed_rating, count_delta=-1
+        )
     await db.commit()
     logger.info("Review deleted", extra={"review_id": review_id, "admin_id": admin_id})
 
@@ -125,36 +127,6 @@ async def delete_review_service(
         )
         return {"detail": "Review deleted"}
 
-    cached = await get_barber_rating(barber_id)
-
-    if cached:
-        avg_rating, count = cached
-        if count > 1:
-            avg_rating = (avg_rating * count - removed_rating) / (count - 1)
-            count -= 1
-        else:
-            avg_rating = 0
-            count = 0
-        logger.info(
-            "Updated barber rating after review deletion (from cache)",
-            extra={
-                "barber_id": barber_id,
-                "new_avg": avg_rating,
-                "new_count": count,
-                "admin_id": admin_id,
-            },
-        )
-    else:
-        avg_rating, count = await get_barber_rating_from_db(db, barber_id)
-        logger.info(
-            "Updated barber rating after review deletion (from DB)",
-            extra={
-                "barber_id": barber_id,
-                "new_avg": avg_rating,
-                "new_count": count,
-                "admin_id": admin_id,
-            },
-        )
-
-    await save_barber_rating(barber_id=barber_id, avg_rating=avg_rating, count=count)
+    await delete_barber_rating(barber_id)
+    await invalidate_response_cache()
     return {"detail": "Review deleted"}
@@ -1,22 +1,30 @@
+import re
 from typing import Optional
 
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.hash import get_password_hash
+from app.core.config import settings
+from app.core.hash import get_password_hash_async
 from app.models import User
 from app.models.barber import Barber
 from app.models.enums import RoleEnum
 from app.services.admin.utils import ensure_admin
 from app.utils.logger import logger
+from app.utils.pagination import Keyset
+from app.utils.response_cache import invalidate_response_cache
 from app.utils.selectors.barber import get_barber_by_user_id
 from app.utils.selectors.user import (
+    get_password_hash_prefix_counts,
     get_user_by_id,
     get_user_by_phone,
     get_user_by_username,
 )
 
+USER_KEYSET = Keyset(User.id)
+BCRYPT_PREFIX = re.compile(r"^\$2[abxy]?\$(\d\d)\$")
+
 
 async def get_users(
     db: AsyncSession,
@@ -25,6 +33,7 @@ async def get_users(
     skip: int = 0,
     limit: int = 10,
     username_filter: Optional[str] = None,
+    cursor: Optional[str] = None,
 ):
     ensure_admin(user_role)
     logger.info(
@@ -35,13 +44,14 @@ async def get_users(
             "skip": skip,
             "limit": limit,
             "username_filter": username_filter,
+            "cursor": cursor,
         },
     )
 
     query = select(User)
     if username_filter:
         query = query.where(User.username.ilike(f"%{username_filter}%"))
-    query = query.offset(skip).limit(limit)
+    query = USER_KEYSET.paginate(query, limit, cursor=cursor, skip=skip)
 
     result = await db.execute(query)
     users = result.scalars().all()
@@ -150,7 +160,7 @@ async def update_user(
             )
 
     if "password" in data:
-        data["hashed_password"] = get_password_hash(data.pop("password"))
+        data["hashed_password"] = await get_password_hash_async(data.pop("password"))
 
     for key, value in data.items():
         setattr(user, key, value)
@@ -202,6 +212,7 @@ async def delete_user(
 
     await db.delete(user)
     await db.commit()
+    await invalidate_response_cache()
     logger.info("User deleted", extra={"admin_id": admin_id, "user_id": user_id})
 
 
@@ -240,9 +251,46 @@ async def promote_user_to_barber(
     db.add(barber)
     await db.commit()
     await db.refresh(user)
+    await invalidate_response_cache()
 
     logger.info(
         "User promoted to barber",
         extra={"admin_id": admin_id, "user_id": user.id, "barber_id": barber.id},
     )
     return user
+
+
+async def get_password_hash_report(db: AsyncSession, user_role: str, admin_id: int):
+    """How many users are on each hash scheme and bcrypt cost.
+
+    Hashes made with any other cost, higher or lower, are rehashed with the
+    configured one on the user's next login.
+    """
+    ensure_admin(user_role)
+
+    schemes = {}
+    for prefix, count in await get_password_hash_prefix_counts(db):
+        match = BCRYPT_PREFIX.match(prefix or "")
+        key = ("bcrypt", int(match.group(1))) if match else ("other", None)
+        schemes[key] = schemes.get(key, 0) + count
+
+    report = {
+        "total": sum(schemes.values()),
+        "target_rounds": settings.BCRYPT_ROUNDS,
+        "schemes": [
+            {
+                "scheme": scheme,
+                "rounds": rounds,
+                "count": count,
+                "needs_update": rounds != settings.BCRYPT_ROUNDS,
+            }
+            for (scheme, rounds), count in sorted(
+                schemes.items(), key=lambda item: (item[0][0], item[0][1] or 0)
+            )
+        ],
+    }
+    logger.info(
+        "Password hash report generated",
+        extra={"admin_id": admin_id, "total": report["total"]},
+    )
+    return report
@@ -1,42 +1,248 @@
-from openai import OpenAI
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+from time import perf_counter
+from typing import AsyncIterator
+
+from fastapi import HTTPException, status
+from openai import AsyncOpenAI
+from prometheus_client import Counter, Gauge, Histogram
 
 from app.core.config import settings
-from app.utils.redis_client import load_barbershop_info
+from app.services.ai_prompt import PromptContext, get_prompt_context
+from app.utils.ai_answer_cache import get_cached_answer, save_answer
+from app.utils.faq import match_faq, normalize_question
+from app.utils.logger import logger
+
+client = AsyncOpenAI(
+    api_key=settings.OPENAI_API_KEY,
+    base_url=settings.OPENAI_BASE_URL,
+    timeout=settings.AI_REQUEST_TIMEOUT,
+)
+
+AI_ANSWERS = Counter(
+    "ai_assistant_answers_total",
+    "AI assistant answers by where they came from",
+    ["source"],  # faq, cache, similar, model
+)
+AI_MODEL_SECONDS = Histogram(
+    "ai_assistant_model_seconds",
+    "Latency of chat completion calls",
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 16, 32),
+)
+AI_FIRST_TOKEN_SECONDS = Histogram(
+    "ai_assistant_first_token_seconds",
+    "Time to the first streamed token of a chat completion",
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8),
+)
+AI_SAVED_MODEL_SECONDS = Counter(
+    "ai_assistant_saved_model_seconds_total",
+    "Model latency avoided by FAQ and cache answers",
+)
+AI_IN_FLIGHT = Gauge("ai_assistant_in_flight", "Model calls in progress")
+AI_QUEUED = Gauge("ai_assistant_queued", "Questions waiting for a model slot")
+AI_QUEUE_WAIT = Histogram(
+    "ai_assistant_queue_wait_seconds",
+    "Time spent waiting for a model slot",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+AI_QUEUE_TIMEOUTS = Counter(
+    "ai_assistant_queue_timeouts_total",
+    "Questions rejected with 503 after AI_QUEUE_TIMEOUT without a model slot",
+)
+
+# Caps concurrent model calls in this process, so a burst of questions
+# queues here briefly (or is turned away) instead of piling up open
+# connections to the API.
+_model_slots = asyncio.Semaphore(settings.AI_MAX_CONCURRENCY)
+
+
+# Running total of model calls in this process, to estimate what an FAQ
+# answer saved.
+_model_latency = {"calls": 0, "seconds": 0.0}
+
+
+def _mean_model_latency() -> float:
+    calls = _model_latency["calls"]
+    return _model_latency["seconds"] / calls if calls else 0.0
+
+
+def _record_model_latency(latency: float):
+    AI_MODEL_SECONDS.observe(latency)
+    AI_ANSWERS.labels("model").inc()
+    _model_latency["calls"] += 1
+    _model_latency["seconds"] += latency
+
+
+@asynccontextmanager
+async def model_slot():
+    """Hold one of the ``AI_MAX_CONCURRENCY`` model slots; 503 when none
+    frees up within ``AI_QUEUE_TIMEOUT`` seconds."""
+    slots = _model_slots
+    start = perf_counter()
+    AI_QUEUED.inc()
+    try:
+        await asyncio.wait_for(slots.acquire(), settings.AI_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        AI_QUEUE_TIMEOUTS.inc()
+        logger.warning("AI assistant busy: no model slot available")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The assistant is busy, please try again shortly",
+            headers={"Retry-After": str(max(1, round(settings.AI_QUEUE_TIMEOUT)))},
+        )
+    finally:
+        AI_QUEUED.dec()
+        AI_QUEUE_WAIT.observe(perf_counter() - start)
+
+    AI_IN_FLIGHT.inc()
+    try:
+        yield
+    finally:
+        AI_IN_FLIGHT.dec()
+        slots.release()
+
 
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+def _messages(context: PromptContext, user_question: str) -> list[dict]:
+    # The system message is the same dict on every call for one shop info
+    # version, so the request prefix stays byte-identical for prompt caching.
+    return [context.system_message, {"role": "user", "content": user_question}]
+
+
+async def _answer_without_model(
+    shop_info: dict, user_question: str, normalized: str, fingerprint: str
+) -> str | None:
+    """The FAQ rules, then the answer cache."""
+    if settings.AI_FAQ_ENABLED:
+        answer = match_faq(user_question, shop_info)
+        if answer:
+            AI_ANSWERS.labels("faq").inc()
+            AI_SAVED_MODEL_SECONDS.inc(_mean_model_latency())
+            logger.info("AI question answered from FAQ")
+            return answer
+
+    cached = normalized and await get_cached_answer(fingerprint, normalized)
+    if cached:
+        entry, exact = cached
+        AI_ANSWERS.labels("cache" if exact else "similar").inc()
+        AI_SAVED_MODEL_SECONDS.inc(entry["latency"])
+        logger.info("AI question answered from cache", extra={"exact": exact})
+        return entry["answer"]
+    return None
 
 
 async def ask_barber_ai(user_question: str) -> str:
-    shop_info = await load_barbershop_info()
-    services = ", ".join(shop_info.get("services", []))
+    """Answer from the FAQ rules, then the answer cache, then the model."""
+    context = await get_prompt_context()
+    normalized = normalize_question(user_question)
+    answer = await _answer_without_model(
+        context.shop_info, user_question, normalized, context.fingerprint
+    )
+    if answer is not None:
+        return answer
+
+    async with model_slot():
+        start = perf_counter()
+        response = await client.chat.completions.create(
+            model=settings.AI_MODEL,
+            messages=_messages(context, user_question),
+            temperature=0.7,
+            max_tokens=500,
+            # store=True,
+        )
+        latency = perf_counter() - start
+    answer = response.choices[0].message.content
+    _record_model_latency(latency)
+
+    # An empty answer would otherwise be served for every similar question.
+    if normalized and answer:
+        await save_answer(context.fingerprint, normalized, answer, latency)
+    return answer
+
 
-    system_prompt = f"""
-You are a friendly, professional virtual barber working at a premium barbershop.
+async def _single(answer: str) -> AsyncIterator[str]:
+    yield answer
 
-You answer user questions about the shop using the info below. Be helpful, casual but respectful, and give suggestions when appropriate.
 
-Barbershop Description:
-{shop_info.get("description")}
+async def _stream_deltas(
+    stream, start: float, fingerprint: str, normalized: str
+) -> AsyncIterator[str]:
+    parts = []
+    async for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if not delta:
+            continue
+        if not parts:
+            AI_FIRST_TOKEN_SECONDS.observe(perf_counter() - start)
+        parts.append(delta)
+        yield delta
+    latency = perf_counter() - start
+    _record_model_latency(latency)
+    answer = "".join(parts)
+    if normalized and answer:
+        await save_answer(fingerprint, normalized, answer, latency)
 
-Address: {shop_info.get("address")}
-Working Hours: {shop_info.get("working_hours")}
-Services: {services}
 
-Extra Notes:
-{shop_info.get("notes")}
+class _ModelAnswerStream:
+    """The text pieces of a streamed completion, holding a model slot.
 
-Do not give personal info about barbers or bookings — instead, mention that users can check barbers and book appointments via the appropriate sections or endpoints.
-"""
+    An async generator's ``finally`` never runs if it was not started, so
+    the slot and the HTTP stream live in ``stack`` and ``aclose`` closes it
+    directly. The stack is also closed once the answer is exhausted or fails.
+    """
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_question},
-        ],
-        temperature=0.7,
-        max_tokens=500,
-        # store=True,
+    def __init__(self, stack: AsyncExitStack, deltas: AsyncIterator[str]):
+        self._stack = stack
+        self._deltas = deltas
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        try:
+            return await self._deltas.__anext__()
+        except BaseException:
+            await self.aclose()
+            raise
+
+    async def aclose(self):
+        try:
+            await self._deltas.aclose()
+        finally:
+            await self._stack.aclose()
+
+
+async def stream_barber_ai(user_question: str) -> AsyncIterator[str]:
+    """Like ``ask_barber_ai`` but returns the answer as an iterator of text
+    pieces, as the model produces them.
+
+    The model slot is taken and the request sent before returning, so a busy
+    assistant or a failed request is still a plain error response rather
+    than a broken stream. The slot is held until the stream is exhausted or
+    closed; callers must ``aclose`` it even if they never iterate it.
+    """
+    context = await get_prompt_context()
+    normalized = normalize_question(user_question)
+    answer = await _answer_without_model(
+        context.shop_info, user_question, normalized, context.fingerprint
     )
+    if answer is not None:
+        return _single(answer)
 
-    return response.choices[0].message.content
+    stack = AsyncExitStack()
+    await stack.enter_async_context(model_slot())
+    try:
+        start = perf_counter()
+        stream = await client.chat.completions.create(
+            model=settings.AI_MODEL,
+            messages=_messages(context, user_question),
+            temperature=0.7,
+            max_tokens=500,
+            stream=True,
+        )
+        stack.push_async_callback(stream.close)
+    except BaseException:
+        await stack.aclose()
+        raise
+    return _ModelAnswerStream(
+        stack, _stream_deltas(stream, start, context.fingerprint, normalized)
+    )
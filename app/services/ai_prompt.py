@@ -0,0 +1,109 @@
+import asyncio
+from dataclasses import dataclass
+from time import monotonic
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.utils.ai_answer_cache import shop_info_fingerprint
+from app.utils.logger import logger
+from app.utils.redis_client import (
+    BARBERSHOP_INFO_CHANNEL,
+    load_barbershop_info,
+    redis_client,
+)
+
+# Instructions first and shop details after them, so the start of the prompt
+# is byte-identical across shop info versions and the provider's prompt
+# cache can reuse it.
+PROMPT_INSTRUCTIONS = """You are a friendly, professional virtual barber working at a premium barbershop.
+
+You answer user questions about the shop using the info below. Be helpful, casual but respectful, and give suggestions when appropriate.
+
+Do not give personal info about barbers or bookings — instead, mention that users can check barbers and book appointments via the appropriate sections or endpoints.
+"""
+
+
+def build_system_prompt(shop_info: dict) -> str:
+    services = ", ".join(shop_info.get("services", []))
+    return f"""{PROMPT_INSTRUCTIONS}
+Barbershop Description:
+{shop_info.get("description")}
+
+Address: {shop_info.get("address")}
+Working Hours: {shop_info.get("working_hours")}
+Services: {services}
+
+Extra Notes:
+{shop_info.get("notes")}
+"""
+
+
+@dataclass(frozen=True)
+class PromptContext:
+    shop_info: dict
+    fingerprint: str
+    system_message: dict
+
+
+_context: PromptContext | None = None
+_loaded_at = 0.0
+
+
+def compile_prompt_context(shop_info: dict) -> PromptContext:
+    return PromptContext(
+        shop_info=shop_info,
+        fingerprint=shop_info_fingerprint(shop_info),
+        system_message={"role": "system", "content": build_system_prompt(shop_info)},
+    )
+
+
+async def get_prompt_context() -> PromptContext:
+    """The shop info and the system prompt built from it.
+
+    Both are kept in process memory. Reloading is triggered by a message on
+    ``BARBERSHOP_INFO_CHANNEL``; ``AI_PROMPT_REFRESH`` seconds bound how
+    stale a worker gets if it misses one. The prompt is only rebuilt when
+    the content hash changes.
+    """
+    global _context, _loaded_at
+    if _context is not None and monotonic() - _loaded_at < settings.AI_PROMPT_REFRESH:
+        return _context
+
+    shop_info = await load_barbershop_info()
+    fingerprint = shop_info_fingerprint(shop_info)
+    if _context is None or _context.fingerprint != fingerprint:
+        _context = compile_prompt_context(shop_info)
+        logger.info("Compiled AI system prompt", extra={"fingerprint": fingerprint})
+    _loaded_at = monotonic()
+    return _context
+
+
+def invalidate_prompt_context():
+    global _loaded_at
+    # The compiled prompt is kept: if the content hash is unchanged on the
+    # next load it is reused as is.
+    _loaded_at = 0.0
+
+
+async def listen_for_shop_info_updates():
+    """Run for the life of the worker, reloading on every update message."""
+    delay = 1
+    while True:
+        try:
+            async with redis_client.pubsub() as pubsub:
+                await pubsub.subscribe(BARBERSHOP_INFO_CHANNEL)
+                # Updates may have been missed while unsubscribed.
+                invalidate_prompt_context()
+                delay = 1
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        logger.info(
+                            "Barbershop info updated",
+                            extra={"fingerprint": message["data"]},
+                        )
+                        invalidate_prompt_context()
+        except RedisError as e:
+            logger.warning(f"Shop info update listener disconnected: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60)
@@ -1,8 +1,9 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List
 
 from fastapi import HTTPException
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
@@ -16,33 +17,80 @@ from app.schemas.barber import (
     ReviewReadForBarber,
 )
 from app.schemas.barber_schedule import BarberWithScheduleAndReviewsOut
-from app.services.barber_rating import get_rating_for_barber
+from app.services.barber_rating import get_rating_for_barber, get_ratings_for_barbers
+from app.services.reminder_service import add_reminder
+from app.services.schedule_service import claim_schedule
 from app.utils.celery_tasks.sms import send_sms_task
 from app.utils.logger import logger
+from app.utils.response_cache import invalidate_response_cache
 from app.utils.selectors.barber import get_all_barbers
-from app.utils.selectors.schedule import (
-    get_barbers_with_schedules,
-    get_schedule_by_id_simple,
-)
+from app.utils.selectors.schedule import get_barbers_with_schedules
 from app.utils.selectors.user import get_user_by_id
 
 
-async def create_appointment_service(
-    db: AsyncSession, data: AppointmentCreate, current_user: dict | None
-):
-    logger.info(
-        "Attempting to create appointment", extra={"schedule_id": data.schedule_id}
-    )
-
-    schedule = await get_schedule_by_id_simple(db, data.schedule_id)
-    if not schedule or not schedule.is_active:
+async def book_schedule(
+    db: AsyncSession,
+    data: AppointmentCreate,
+    client_name: str,
+    client_phone: str,
+    client_id: int | None,
+) -> Appointment:
+    """Claim the slot and insert the appointment in one transaction.
+
+    The slot is taken with a conditional UPDATE, so of any number of
+    concurrent bookings exactly one succeeds; the unique constraint on
+    ``appointments.schedule_id`` backs this up at the database level.
+    """
+    slot = await claim_schedule(db, data.schedule_id)
+    if slot is None:
+        await db.rollback()
         logger.warning(
             "Schedule not found or not active during appointment creation",
             extra={"schedule_id": data.schedule_id},
         )
         raise HTTPException(400, "Selected time slot is not available")
+    if slot.barber_id != data.barber_id:
+        # Releases the claim too.
+        await db.rollback()
+        logger.warning(
+            "Schedule belongs to another barber",
+            extra={
+                "schedule_id": data.schedule_id,
+                "barber_id": data.barber_id,
+                "slot_barber_id": slot.barber_id,
+            },
+        )
+        raise HTTPException(400, "Selected time slot belongs to another barber")
 
-    appointment_dt = datetime.combine(schedule.date, schedule.start_time)
+    appointment = Appointment(
+        barber_id=slot.barber_id,
+        client_name=client_name,
+        client_phone=client_phone,
+        appointment_time=datetime.combine(slot.date, slot.start_time),
+        status="scheduled",
+        client_id=client_id,
+        schedule_id=data.schedule_id,
+    )
+    db.add(appointment)
+    add_reminder(db, appointment)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        logger.warning(
+            "Schedule already has an appointment",
+            extra={"schedule_id": data.schedule_id},
+        )
+        raise HTTPException(400, "Selected time slot is not available")
+    return appointment
+
+
+async def create_appointment_service(
+    db: AsyncSession, data: AppointmentCreate, current_user: dict | None
+):
+    logger.info(
+        "Attempting to create appointment", extra={"schedule_id": data.schedule_id}
+    )
 
     if current_user:
         user = await get_user_by_id(db, current_user["id"])
@@ -69,21 +117,15 @@ async def create_appointment_service(
             extra={"client_phone": client_phone},
         )
 
-    appointment = Appointment(
-        barber_id=data.barber_id,
+    appointment = await book_schedule(
+        db,
+        data,
         client_name=client_name,
         client_phone=client_phone,
-        appointment_time=appointment_dt,
-        status="scheduled",
         client_id=current_user["id"] if current_user else None,
-        schedule_id=data.schedule_id,
     )
-
-    db.add(appointment)
-    schedule.is_active = False
-
-    await db.commit()
-    await db.refresh(appointment)
+    appointment_dt = appointment.appointment_time
+    await invalidate_response_cache()
 
     logger.info(
         "Appointment created successfully",
@@ -105,21 +147,6 @@ async def create_appointment_service(
     )
     logger.info("Confirmation SMS sent", extra={"appointment_id": appointment.id})
 
-    now = datetime.utcnow()
-    remind_time = appointment_dt - timedelta(hours=2)
-    seconds_until_reminder = (remind_time - now).total_seconds()
-
-    if seconds_until_reminder > 0:
-        send_sms_task.apply_async(
-            args=(
-                client_phone,
-                f"Dear {client_name}, this is a reminder of your appointment scheduled for "
-                f"{appointment_dt.strftime('%A, %B %d, %Y at %I:%M %p')}. See you soon!",
-            ),
-            countdown=seconds_until_reminder,
-        )
-        logger.info("Reminder SMS scheduled", extra={"appointment_id": appointment.id})
-
     return appointment
 
 
@@ -149,10 +176,11 @@ async def get_barbers_with_ratings(db: AsyncSession) -> List[BarberOutwithReview
     logger.info("Fetching barbers with ratings")
 
     barbers = await get_all_barbers(db)
+    ratings = await get_ratings_for_barbers(db, [barber.id for barber in barbers])
     result = []
 
     for barber in barbers:
-        avg_rating, reviews_count = await get_rating_for_barber(db, barber.id)
+        avg_rating, reviews_count = ratings[barber.id]
 
         barber_out = BarberOutwithReviews.from_orm(barber).copy(
             update={
@@ -208,6 +236,7 @@ async def get_barber_detailed_info(
         id=barber.id,
         full_name=barber.full_name,
         avatar_url=barber.avatar_url,
+        avatar_hash=barber.avatar_hash,
         avg_rating=avg_rating,
         reviews_count=reviews_count,
         reviews=reviews,
@@ -220,10 +249,11 @@ async def get_barbers_with_schedules_and_ratings(
     logger.info("Fetching barbers with schedules and ratings")
 
     barbers = await get_barbers_with_schedules(db)
+    ratings = await get_ratings_for_barbers(db, [barber.id for barber in barbers])
     result = []
 
     for barber in barbers:
-        avg_rating, reviews_count = await get_rating_for_barber(db, barber.id)
+        avg_rating, reviews_count = ratings[barber.id]
 
         barber_out = BarberWithScheduleAndReviewsOut.from_orm(barber).copy(
             update={
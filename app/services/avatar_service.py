@@ -0,0 +1,100 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from botocore.exceptions import BotoCoreError, ClientError
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.services import s3_service
+from app.services.s3_gc_service import cancel_s3_deletions
+from app.utils.avatars import avatar_object_keys, avatar_variant_key
+from app.utils.images import AVATAR_FORMATS, build_avatar_variants
+from app.utils.logger import logger
+
+# Variant keys are derived from the content hash, so an object never changes
+# once written.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Decoding and resizing hold the GIL, so they run in separate processes.
+# "spawn" keeps the children free of the parent's event loop and threads.
+_avatar_executor = ProcessPoolExecutor(
+    max_workers=settings.AVATAR_PROCESS_WORKERS,
+    mp_context=multiprocessing.get_context("spawn"),
+)
+
+
+def _put_variants(avatar_hash: str, variants: dict[tuple[int, str], bytes]) -> int:
+    client, bucket = s3_service.s3_client, s3_service.BUCKET
+    stored = 0
+    for (size, fmt), body in variants.items():
+        key = avatar_variant_key(avatar_hash, size, fmt)
+        try:
+            client.head_object(Bucket=bucket, Key=key)
+            continue  # same image uploaded before
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey"):
+                raise
+        client.put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=body,
+            ContentType=AVATAR_FORMATS[fmt][1],
+            CacheControl=IMMUTABLE_CACHE_CONTROL,
+            ACL="public-read",
+        )
+        stored += 1
+    return stored
+
+
+async def create_avatar_variants(db: AsyncSession, file: UploadFile) -> str:
+    """Render and store the resized variants of an uploaded avatar.
+
+    The upload is copied to a temporary file in chunks and the worker process
+    reads it from there, so it is never held in memory whole. Returns the
+    avatar's content hash. Raises 413 for files over ``AVATAR_MAX_BYTES`` and
+    400 for files that are not images. Pending deletions of the same image's
+    variants are cancelled in ``db``'s transaction first, which the caller
+    commits.
+    """
+    path = await asyncio.to_thread(
+        s3_service.spool_upload, file.file, settings.AVATAR_MAX_BYTES
+    )
+    loop = asyncio.get_running_loop()
+    try:
+        avatar_hash, variants = await loop.run_in_executor(
+            _avatar_executor,
+            build_avatar_variants,
+            path,
+            settings.AVATAR_VARIANT_SIZES,
+        )
+    except ValueError as e:
+        logger.warning(
+            "Avatar rejected: image could not be decoded",
+            extra={"upload_name": file.filename, "error": str(e)},
+        )
+        raise HTTPException(status_code=400, detail="Invalid image file")
+    finally:
+        os.unlink(path)
+
+    await cancel_s3_deletions(db, avatar_object_keys(None, avatar_hash))
+    try:
+        stored = await asyncio.to_thread(_put_variants, avatar_hash, variants)
+    except (BotoCoreError, ClientError) as e:
+        logger.error(f"Failed to upload avatar variants to S3: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to upload file to S3: {str(e)}",
+        )
+
+    logger.info(
+        "Avatar variants stored",
+        extra={
+            "avatar_hash": avatar_hash,
+            "variant_count": len(variants),
+            "uploaded_count": stored,
+        },
+    )
+    return avatar_hash
@@ -1,17 +1,83 @@
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.barber_rating_stats import BarberRatingStats
 from app.utils.logger import logger
-from app.utils.redis_client import get_barber_rating, save_barber_rating
-from app.utils.selectors.reviews import get_barber_rating_from_db
+from app.utils.redis_client import fetch_barber_rating, fetch_barber_ratings
+from app.utils.selectors.reviews import (
+    get_approved_rating_totals,
+    get_barber_rating_from_db,
+    get_barber_ratings_from_db,
+)
 
 
 async def get_rating_for_barber(db: AsyncSession, barber_id: int) -> tuple[float, int]:
-    cached = await get_barber_rating(barber_id)
-    if cached:
-        logger.info("Cache hit for barber rating", extra={"barber_id": barber_id})
-        return cached
-
-    logger.info("Cache miss for barber rating", extra={"barber_id": barber_id})
-    avg, count = await get_barber_rating_from_db(db, barber_id)
-    await save_barber_rating(barber_id, avg, count)
-    return avg, count
+    async def from_db() -> tuple[float, int]:
+        logger.info("Cache miss for barber rating", extra={"barber_id": barber_id})
+        return await get_barber_rating_from_db(db, barber_id)
+
+    return await fetch_barber_rating(barber_id, from_db)
+
+
+async def get_ratings_for_barbers(
+    db: AsyncSession, barber_ids: list[int]
+) -> dict[int, tuple[float, int]]:
+    async def from_db(missing: list[int]) -> dict[int, tuple[float, int]]:
+        logger.info(
+            "Loading barber ratings missing from cache",
+            extra={"requested": len(barber_ids), "misses": len(missing)},
+        )
+        return await get_barber_ratings_from_db(db, missing)
+
+    return await fetch_barber_ratings(barber_ids, from_db)
+
+
+def _insert_for(db: AsyncSession):
+    """``INSERT`` with ``ON CONFLICT`` support for the session's database."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
+async def apply_rating_change(
+    db: AsyncSession, barber_id: int, rating_delta: int, count_delta: int
+):
+    """Adjust the stored rating totals inside the caller's transaction.
+
+    The caller commits; approving or deleting a review and updating the
+    totals therefore succeed or fail together.
+    """
+    result = await db.execute(
+        update(BarberRatingStats)
+        .where(BarberRatingStats.barber_id == barber_id)
+        .values(
+            rating_sum=BarberRatingStats.rating_sum + rating_delta,
+            rating_count=BarberRatingStats.rating_count + count_delta,
+        )
+    )
+    if result.rowcount:
+        return
+
+    # No totals row yet (new barber or not backfilled): build it from the
+    # reviews as they stand in this transaction, which already include the
+    # change being applied. A concurrent first change may insert the row
+    # first; its totals cannot see this transaction's review, so only the
+    # delta is added to them.
+    await db.flush()
+    rating_sum, count = await get_approved_rating_totals(db, barber_id)
+    await db.execute(
+        _insert_for(db)(BarberRatingStats)
+        .values(barber_id=barber_id, rating_sum=rating_sum, rating_count=count)
+        .on_conflict_do_update(
+            index_elements=[BarberRatingStats.barber_id],
+            set_={
+                "rating_sum": BarberRatingStats.rating_sum + rating_delta,
+                "rating_count": BarberRatingStats.rating_count + count_delta,
+            },
+        )
+    )
+    logger.info(
+        "Created barber rating stats from reviews",
+        extra={"barber_id": barber_id, "rating_sum": rating_sum, "count": count},
+    )
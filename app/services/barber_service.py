@@ -1,16 +1,22 @@
-import re
 from datetime import datetime
 
 from fastapi import HTTPException, UploadFile, status
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.barber import Barber
 from app.models.barberschedule import BarberSchedule
 from app.models.enums import RoleEnum
 from app.schemas.barber import BarberUpdate
-from app.services.s3_service import delete_file_from_s3, upload_file_to_s3
+from app.schemas.barber_schedule import BarberScheduleBulkCreate
+from app.services.avatar_service import create_avatar_variants
+from app.services.s3_gc_service import enqueue_s3_deletions
+from app.services.s3_service import check_upload_size
+from app.services.schedule_service import bulk_create_schedules
+from app.utils.avatars import avatar_object_keys, avatar_url
 from app.utils.logger import logger
+from app.utils.response_cache import invalidate_response_cache
 from app.utils.selectors.barber import get_barber_by_user_id
 from app.utils.selectors.schedule import get_schedule_by_id
 from app.utils.time_correction import check_time_overlap, trim_time
@@ -37,7 +43,6 @@ async def upload_barber_photo(
         raise HTTPException(status_code=404, detail="Barber not found")
 
     barber_id = barber.id
-    content = await file.read()
 
     if not file.content_type.startswith("image/"):
         logger.warning(
@@ -49,27 +54,29 @@ async def upload_barber_photo(
             },
         )
         raise HTTPException(status_code=400, detail="Only image files are allowed")
-
-    if barber.avatar_url:
-        match = re.search(r"/barbers/.*$", barber.avatar_url)
-        if match:
-            key = match.group(0).lstrip("/")
-            await delete_file_from_s3(key)
-            logger.info(
-                "Deleted old barber avatar from S3",
-                extra={"barber_id": barber_id, "s3_key": key},
-            )
-
-    url = await upload_file_to_s3(content, file.filename, file.content_type)
-
-    stmt = update(Barber).where(Barber.id == barber_id).values(avatar_url=url)
+    check_upload_size(file, settings.AVATAR_MAX_BYTES)
+    avatar_hash = await create_avatar_variants(db, file)
+
+    # The variants are stored before the barber row changes, so a rejected or
+    # failed upload keeps the current avatar.
+    url = avatar_url(avatar_hash)
+
+    old_keys = avatar_object_keys(barber.avatar_url, barber.avatar_hash)
+    stmt = (
+        update(Barber)
+        .where(Barber.id == barber_id)
+        .values(avatar_url=url, avatar_hash=avatar_hash)
+    )
     await db.execute(stmt)
+    enqueue_s3_deletions(db, old_keys)
     await db.commit()
+    await invalidate_response_cache()
 
     logger.info(
         "Uploaded new barber photo", extra={"barber_id": barber_id, "avatar_url": url}
     )
     barber.avatar_url = url
+    barber.avatar_hash = avatar_hash
     return barber
 
 
@@ -90,20 +97,21 @@ async def remove_barber_photo(db: AsyncSession, user_id: int, user_role: str):
         )
         raise HTTPException(status_code=400, detail="Barber has no avatar to delete")
 
-    match = re.search(r"/barbers/.*$", barber.avatar_url)
-    if match:
-        key = match.group(0).lstrip("/")
-        await delete_file_from_s3(key)
-        logger.info(
-            "Deleted barber avatar from S3",
-            extra={"barber_id": barber_id, "s3_key": key},
-        )
-
-    stmt = update(Barber).where(Barber.id == barber_id).values(avatar_url=None)
+    old_keys = avatar_object_keys(barber.avatar_url, barber.avatar_hash)
+    stmt = (
+        update(Barber)
+        .where(Barber.id == barber_id)
+        .values(avatar_url=None, avatar_hash=None)
+    )
     await db.execute(stmt)
+    enqueue_s3_deletions(db, old_keys)
     await db.commit()
+    await invalidate_response_cache()
 
-    logger.info("Removed barber avatar from DB", extra={"barber_id": barber_id})
+    logger.info(
+        "Removed barber avatar from DB",
+        extra={"barber_id": barber_id, "queued_keys": len(old_keys)},
+    )
 
 
 async def create_schedule(db: AsyncSession, user_id: int, data, role: str):
@@ -159,6 +167,7 @@ async def create_schedule(db: AsyncSession, user_id: int, data, role: str):
     db.add(schedule)
     await db.commit()
     await db.refresh(schedule)
+    await invalidate_response_cache()
 
     logger.info(
         "Barber schedule created",
@@ -173,6 +182,22 @@ async def create_schedule(db: AsyncSession, user_id: int, data, role: str):
     return schedule
 
 
+async def create_schedules_bulk(
+    db: AsyncSession, user_id: int, data: BarberScheduleBulkCreate, role: str
+):
+    ensure_barber(role)
+    logger.info("Attempting to bulk create schedules", extra={"user_id": user_id})
+
+    barber = await get_barber_by_user_id(db, user_id)
+    if not barber:
+        logger.warning(
+            "Barber not found when bulk creating schedules", extra={"user_id": user_id}
+        )
+        raise HTTPException(status_code=404, detail="Barber not found")
+
+    return await bulk_create_schedules(db, barber.id, data.slots)
+
+
 async def get_my_schedule(db: AsyncSession, user_id: int, role: str):
     ensure_barber(role)
     logger.info("Attempting to retrieve barber schedule", extra={"user_id": user_id})
@@ -297,6 +322,7 @@ async def update_schedule(
 
     await db.commit()
     await db.refresh(schedule)
+    await invalidate_response_cache()
 
     logger.info(
         "Schedule updated successfully",
@@ -341,6 +367,7 @@ async def delete_schedule(db: AsyncSession, schedule_id: int, user_id: int, role
 
     await db.delete(schedule)
     await db.commit()
+    await invalidate_response_cache()
 
     logger.info(
         "Schedule deleted successfully",
@@ -376,6 +403,7 @@ async def update_my_barber(
     barber.full_name = data.full_name
     await db.commit()
     await db.refresh(barber)
+    await invalidate_response_cache()
 
     logger.info("Barber info updated", extra={"barber_id": barber.id})
     return barber
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import tempfile
+
+import yaml
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.schemas.barbershop_info import BarbershopInfo
+from app.utils.ai_answer_cache import shop_info_fingerprint
+from app.utils.logger import logger
+from app.utils.redis_client import publish_barbershop_info, read_barbershop_info_file
+
+
+def write_barbershop_info_file(path: str, data: dict):
+    """Replace the file in one step, so a watcher never reads half of it."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".yaml.tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+async def publish_shop_info(info: BarbershopInfo) -> bool:
+    data = info.model_dump()
+    return await publish_barbershop_info(data, shop_info_fingerprint(data))
+
+
+async def publish_barbershop_info_file(path: str) -> bool:
+    raw = await asyncio.to_thread(read_barbershop_info_file, path)
+    try:
+        info = BarbershopInfo.model_validate(raw)
+    except ValidationError as e:
+        logger.error(f"Barbershop info file {path} is invalid, not published: {e}")
+        return False
+    return await publish_shop_info(info)
+
+
+def _mtime(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+async def _republish(path: str, reason: str):
+    try:
+        if await publish_barbershop_info_file(path):
+            logger.info(f"Barbershop info file {path} {reason}, republished")
+    except Exception as e:
+        logger.error(f"Failed to republish barbershop info file {path}: {e}")
+
+
+async def watch_barbershop_info_file(path: str | None = None):
+    """Republish the shop info file whenever it changes on disk.
+
+    Publishes the file once on startup, so edits made while the app was down
+    are picked up, then polls the mtime every
+    ``BARBERSHOP_INFO_WATCH_INTERVAL`` seconds. Every worker watches;
+    ``publish_barbershop_info`` makes sure each version is published once.
+    """
+    path = path or settings.BARBERSHOP_INFO_PATH
+    seen = _mtime(path)
+    if seen is not None:
+        await _republish(path, "loaded on startup")
+    while True:
+        await asyncio.sleep(settings.BARBERSHOP_INFO_WATCH_INTERVAL)
+        mtime = _mtime(path)
+        if mtime is None or mtime == seen:
+            continue
+        seen = mtime
+        await _republish(path, "changed")
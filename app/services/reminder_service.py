@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+
+from prometheus_client import Counter
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.appointment import Appointment
+from app.models.appointment_reminder import AppointmentReminder
+from app.utils.celery_tasks.sms import queue_sms
+from app.utils.logger import logger
+from app.utils.selectors.reminder import get_due_reminders
+
+REMINDERS = Counter(
+    "appointment_reminders_total",
+    "Appointment reminders taken off the reminder table",
+    ["result"],  # sent, expired
+)
+
+
+def reminder_send_at(appointment_time: datetime) -> datetime:
+    return appointment_time - timedelta(minutes=settings.REMINDER_LEAD_MINUTES)
+
+
+def reminder_message(appointment: Appointment) -> str:
+    return (
+        f"Dear {appointment.client_name}, this is a reminder of your appointment "
+        "scheduled for "
+        f"{appointment.appointment_time.strftime('%A, %B %d, %Y at %I:%M %p')}. "
+        "See you soon!"
+    )
+
+
+def add_reminder(
+    db: AsyncSession, appointment: Appointment, now: datetime | None = None
+) -> AppointmentReminder | None:
+    """Store a reminder for ``appointment`` in the caller's transaction, so it
+    exists exactly when the booking does. Nothing is stored when the send time
+    has already passed."""
+    send_at = reminder_send_at(appointment.appointment_time)
+    if send_at <= (now or datetime.utcnow()):
+        return None
+    reminder = AppointmentReminder(appointment=appointment, send_at=send_at)
+    db.add(reminder)
+    return reminder
+
+
+async def cancel_reminder(db: AsyncSession, appointment_id: int):
+    await db.execute(
+        delete(AppointmentReminder).where(
+            AppointmentReminder.appointment_id == appointment_id
+        )
+    )
+
+
+async def reschedule_reminder(
+    db: AsyncSession, appointment: Appointment, now: datetime | None = None
+) -> AppointmentReminder | None:
+    """Move the reminder after the appointment time changed. The caller
+    commits."""
+    await cancel_reminder(db, appointment.id)
+    return add_reminder(db, appointment, now)
+
+
+async def send_due_reminders(db: AsyncSession, now: datetime | None = None) -> dict:
+    """Hand due reminders to the SMS outbox in batches of
+    ``REMINDER_BATCH_SIZE``.
+
+    Only one batch is held in memory, however many bookings lie ahead.
+    Reminders for appointments that have already started (the poller was
+    down) are dropped. Rows are deleted after the batch is queued, so a crash
+    in between sends a reminder twice rather than not at all.
+    """
+    now = now or datetime.utcnow()
+    totals = {"sent": 0, "expired": 0}
+
+    while True:
+        batch = await get_due_reminders(db, now, settings.REMINDER_BATCH_SIZE)
+        if not batch:
+            break
+
+        messages = []
+        for reminder, appointment in batch:
+            if appointment.appointment_time > now:
+                messages.append(
+                    (appointment.client_phone, reminder_message(appointment))
+                )
+                totals["sent"] += 1
+            else:
+                totals["expired"] += 1
+            await db.delete(reminder)
+        queue_sms(messages)
+        await db.commit()
+
+        if len(batch) < settings.REMINDER_BATCH_SIZE:
+            break
+
+    for result, count in totals.items():
+        REMINDERS.labels(result).inc(count)
+    logger.info("Due reminders processed", extra=totals)
+    return totals
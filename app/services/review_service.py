@@ -1,7 +1,6 @@
 from typing import List
 
 from fastapi import HTTPException, status
-from sqlalchemy import desc
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -9,6 +8,7 @@ from app.models.review import Review
 from app.schemas.review import ReviewCreate
 from app.utils.logger import logger
 from app.utils.selectors.barber import get_barber_by_id
+from app.utils.selectors.reviews import REVIEW_KEYSET
 
 
 async def create_review_service(
@@ -61,13 +61,13 @@ async def get_reviews_by_user_service(
     user_id: int | str,
     skip: int = 0,
     limit: int = 10,
+    cursor: str | None = None,
 ) -> List[Review]:
-    stmt = (
-        select(Review)
-        .where(Review.client_id == int(user_id))
-        .order_by(desc(Review.created_at))
-        .offset(skip)
-        .limit(limit)
+    stmt = REVIEW_KEYSET.paginate(
+        select(Review).where(Review.client_id == int(user_id)),
+        limit,
+        cursor=cursor,
+        skip=skip,
     )
     result = await db.execute(stmt)
     reviews = result.scalars().all()
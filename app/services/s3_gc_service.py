@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from botocore.exceptions import BotoCoreError, ClientError
+from prometheus_client import Counter, Histogram
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.s3_deletion import S3Deletion
+from app.services import s3_service
+from app.utils.avatars import avatar_hash_from_key
+from app.utils.logger import logger
+from app.utils.selectors.barber import get_referenced_avatar_hashes
+from app.utils.selectors.s3_deletion import get_due_s3_deletions
+
+S3_GC_KEYS = Counter(
+    "s3_gc_keys_total",
+    "Queued S3 keys processed by garbage collection",
+    ["result"],  # deleted, failed, skipped
+)
+S3_GC_BATCH_SECONDS = Histogram(
+    "s3_gc_batch_seconds", "Duration of one DeleteObjects call"
+)
+
+
+def enqueue_s3_deletions(db: AsyncSession, keys: list[str]):
+    """Queue objects for deletion in the caller's transaction, so they are
+    only removed once the change that orphaned them is committed."""
+    db.add_all(S3Deletion(key=key) for key in keys)
+
+
+async def cancel_s3_deletions(db: AsyncSession, keys: list[str]):
+    """Unqueue ``keys`` in the caller's transaction before they are written
+    again. On Postgres this waits for a collection that holds the rows, so
+    the objects are either gone before the write or never deleted."""
+    await db.execute(delete(S3Deletion).where(S3Deletion.key.in_(keys)))
+
+
+def _delete_objects(keys: list[str]) -> dict[str, str]:
+    response = s3_service.s3_client.delete_objects(
+        Bucket=s3_service.BUCKET,
+        Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+    )
+    return {
+        error["Key"]: f"{error.get('Code')}: {error.get('Message')}"
+        for error in response.get("Errors", [])
+    }
+
+
+async def collect_s3_garbage(db: AsyncSession, now: datetime | None = None) -> dict:
+    """Delete due queued keys in batches of up to ``S3_GC_BATCH_SIZE``.
+
+    Variant keys whose avatar hash is in use again (the same image was
+    uploaded since) are dropped from the queue without deleting. The rows
+    stay locked from that check until the commit after the S3 delete, and
+    uploads unqueue their keys through ``cancel_s3_deletions`` before writing
+    them, so a re-upload never races the delete. Keys S3
+    fails to delete are retried with exponential backoff and left in the
+    table once ``S3_GC_MAX_ATTEMPTS`` is reached.
+    """
+    now = now or datetime.utcnow()
+    totals = {"deleted": 0, "failed": 0, "skipped": 0}
+
+    while True:
+        batch = await get_due_s3_deletions(
+            db, now, settings.S3_GC_MAX_ATTEMPTS, settings.S3_GC_BATCH_SIZE
+        )
+        if not batch:
+            break
+
+        hashes = {avatar_hash_from_key(row.key) for row in batch} - {None}
+        in_use = await get_referenced_avatar_hashes(db, hashes) if hashes else set()
+        pending = []
+        for row in batch:
+            if avatar_hash_from_key(row.key) in in_use:
+                await db.delete(row)
+                totals["skipped"] += 1
+            else:
+                pending.append(row)
+
+        errors = {}
+        if pending:
+            keys = list(dict.fromkeys(row.key for row in pending))
+            start = perf_counter()
+            try:
+                errors = await asyncio.to_thread(_delete_objects, keys)
+            except (BotoCoreError, ClientError) as e:
+                errors = {key: str(e) for key in keys}
+            S3_GC_BATCH_SECONDS.observe(perf_counter() - start)
+
+        for row in pending:
+            if row.key in errors:
+                row.attempts += 1
+                row.last_error = errors[row.key][:500]
+                row.next_attempt_at = now + timedelta(
+                    seconds=settings.S3_GC_RETRY_DELAY * 2 ** (row.attempts - 1)
+                )
+                totals["failed"] += 1
+            else:
+                await db.delete(row)
+                totals["deleted"] += 1
+        await db.commit()
+
+        if len(batch) < settings.S3_GC_BATCH_SIZE:
+            break
+
+    for result, count in totals.items():
+        S3_GC_KEYS.labels(result).inc(count)
+    logger.info("S3 garbage collection finished", extra=totals)
+    return totals
@@ -1,8 +1,9 @@
-import uuid
+import os
+import tempfile
+from typing import BinaryIO
 
 import boto3
-from botocore.exceptions import BotoCoreError, ClientError
-from fastapi import HTTPException, status
+from fastapi import HTTPException, UploadFile, status
 
 from app.core.config import settings
 from app.utils.logger import logger
@@ -12,40 +13,53 @@ s3_client = boto3.client(
     aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
     aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
     region_name=settings.AWS_REGION,
+    endpoint_url=settings.S3_ENDPOINT_URL,
 )
 
 BUCKET = settings.S3_BUCKET_NAME
 
+# Uploads are copied to disk in chunks of this size, so a request never holds
+# more than one chunk of the file in memory.
+SPOOL_CHUNK_SIZE = 1024 * 1024
 
-async def upload_file_to_s3(file_bytes: bytes, filename: str, content_type: str) -> str:
-    unique_filename = f"barbers/{uuid.uuid4()}_{filename}"
 
-    try:
-        s3_client.put_object(
-            Bucket=BUCKET,
-            Key=unique_filename,
-            Body=file_bytes,
-            ContentType=content_type,
-            ACL="public-read",
-        )
-        logger.info(f"File uploaded to S3: key={unique_filename} filename={filename}")
-    except (BotoCoreError, ClientError) as e:
-        logger.error(f"Failed to upload file to S3: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to upload file to S3: {str(e)}",
-        )
-    url = f"https://{BUCKET}.s3.{settings.AWS_REGION}.amazonaws.com/{unique_filename}"
-    return url
-
-
-async def delete_file_from_s3(file_key: str):
-    try:
-        s3_client.delete_object(Bucket=BUCKET, Key=file_key)
-        logger.info(f"File deleted from S3: key={file_key}")
-    except (BotoCoreError, ClientError) as e:
-        logger.error(f"Failed to delete file from S3: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to delete file from S3: {str(e)}",
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File is larger than {max_bytes} bytes",
+    )
+
+
+def check_upload_size(file: UploadFile, max_bytes: int):
+    """Reject an upload whose declared size is over the limit before any of it
+    is read. Uploads without a known size are checked by ``spool_upload``."""
+    if file.size is not None and file.size > max_bytes:
+        logger.warning(
+            "Upload rejected: file too large",
+            extra={
+                "upload_name": file.filename,
+                "size": file.size,
+                "max_bytes": max_bytes,
+            },
         )
+        raise _too_large(max_bytes)
+
+
+def spool_upload(body: BinaryIO, max_bytes: int) -> str:
+    """Copy an upload to a temporary file, ``SPOOL_CHUNK_SIZE`` bytes at a
+    time, and return its path; the caller removes it. Raises 413 once more
+    than ``max_bytes`` have been read."""
+    with tempfile.NamedTemporaryFile(suffix=".upload", delete=False) as target:
+        try:
+            copied = 0
+            # One byte past the limit is enough to know the upload is too large.
+            while chunk := body.read(min(SPOOL_CHUNK_SIZE, max_bytes - copied + 1)):
+                copied += len(chunk)
+                if copied > max_bytes:
+                    raise _too_large(max_bytes)
+                target.write(chunk)
+        except BaseException:
+            target.close()
+            os.unlink(target.name)
+            raise
+    return target.name
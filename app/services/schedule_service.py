@@ -0,0 +1,118 @@
+from datetime import datetime
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.barber import Barber
+from app.models.barberschedule import BarberSchedule
+from app.schemas.barber_schedule import BarberScheduleCreate
+from app.utils.logger import logger
+from app.utils.response_cache import invalidate_response_cache
+from app.utils.selectors.schedule import get_schedule_intervals
+from app.utils.time_correction import find_schedule_conflicts, trim_time
+
+
+async def claim_schedule(db: AsyncSession, schedule_id: int):
+    """Atomically mark an active slot as booked.
+
+    Returns the slot's ``(barber_id, date, start_time)`` row, or ``None`` when
+    the slot does not exist or is already taken. Concurrent claims of the same
+    slot serialize on the row lock, and only the first sees ``is_active`` true.
+    The caller commits.
+    """
+    result = await db.execute(
+        update(BarberSchedule)
+        .where(BarberSchedule.id == schedule_id, BarberSchedule.is_active.is_(True))
+        .values(is_active=False)
+        .returning(
+            BarberSchedule.barber_id, BarberSchedule.date, BarberSchedule.start_time
+        )
+    )
+    return result.one_or_none()
+
+
+async def bulk_create_schedules(
+    db: AsyncSession,
+    barber_id: int,
+    slots: list[BarberScheduleCreate],
+    template_id: int | None = None,
+) -> dict:
+    logger.info(
+        "Bulk creating schedules",
+        extra={"barber_id": barber_id, "slot_count": len(slots)},
+    )
+
+    now = datetime.utcnow()
+    candidates = []
+    rejected = {}
+    for index, slot in enumerate(slots):
+        start_time = trim_time(slot.start_time)
+        end_time = trim_time(slot.end_time)
+        candidates.append((slot.date, start_time, end_time))
+        if start_time >= end_time:
+            rejected[index] = "Start time must be earlier than end time"
+        elif datetime.combine(slot.date, start_time) < now:
+            rejected[index] = "Cannot create a schedule in the past"
+
+    valid = [index for index in range(len(slots)) if index not in rejected]
+    if valid:
+        # Serialize schedule writes per barber so two batches cannot both
+        # pass the overlap check (no-op on SQLite).
+        await db.execute(
+            select(Barber.id).where(Barber.id == barber_id).with_for_update()
+        )
+        existing = await get_schedule_intervals(
+            db,
+            barber_id,
+            min(candidates[index][0] for index in valid),
+            max(candidates[index][0] for index in valid),
+        )
+        conflicts = find_schedule_conflicts(
+            existing, [candidates[index] for index in valid]
+        )
+        for position, reason in conflicts.items():
+            rejected[valid[position]] = reason
+
+    accepted = [index for index in valid if index not in rejected]
+    created = {}
+    if accepted:
+        rows = [
+            {
+                "barber_id": barber_id,
+                "date": candidates[index][0],
+                "start_time": candidates[index][1],
+                "end_time": candidates[index][2],
+                "is_active": slots[index].is_active,
+                "template_id": template_id,
+            }
+            for index in accepted
+        ]
+        result = await db.scalars(
+            insert(BarberSchedule).returning(
+                BarberSchedule, sort_by_parameter_order=True
+            ),
+            rows,
+        )
+        created = dict(zip(accepted, result.all()))
+        await db.commit()
+        await invalidate_response_cache()
+
+    results = [
+        {
+            "index": index,
+            "accepted": index in created,
+            "reason": rejected.get(index),
+            "schedule": created.get(index),
+        }
+        for index in range(len(slots))
+    ]
+
+    logger.info(
+        "Bulk schedule creation finished",
+        extra={
+            "barber_id": barber_id,
+            "created_count": len(created),
+            "rejected_count": len(rejected),
+        },
+    )
+    return {"created": len(created), "rejected": len(rejected), "results": results}
@@ -0,0 +1,198 @@
+from datetime import date, datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.barberschedule import BarberSchedule
+from app.models.schedule_template import ScheduleTemplate
+from app.schemas.barber_schedule import BarberScheduleCreate, ScheduleTemplateCreate
+from app.services.barber_service import ensure_barber
+from app.services.schedule_service import bulk_create_schedules
+from app.utils.logger import logger
+from app.utils.response_cache import invalidate_response_cache
+from app.utils.selectors.barber import get_barber_by_user_id
+from app.utils.selectors.schedule_template import (
+    get_template_by_id,
+    get_templates_by_barber,
+    get_templates_due,
+)
+from app.utils.time_correction import trim_time
+
+
+def build_template_slots(
+    template: ScheduleTemplate, start: date, end: date
+) -> list[BarberScheduleCreate]:
+    """Concrete slots of ``template`` for every matching weekday in [start, end]."""
+    step = timedelta(minutes=template.slot_minutes)
+    day = start + timedelta(days=(template.weekday - start.weekday()) % 7)
+    slots = []
+    while day <= end:
+        slot_start = datetime.combine(day, trim_time(template.start_time))
+        day_end = datetime.combine(day, trim_time(template.end_time))
+        while slot_start + step <= day_end:
+            slots.append(
+                BarberScheduleCreate(
+                    date=day,
+                    start_time=slot_start.time(),
+                    end_time=(slot_start + step).time(),
+                )
+            )
+            slot_start += step
+        day += timedelta(days=7)
+    return slots
+
+
+async def expand_template(
+    db: AsyncSession, template: ScheduleTemplate, today: date, horizon_end: date
+) -> int:
+    start = max(template.valid_from, today)
+    if template.generated_until is not None:
+        start = max(start, template.generated_until + timedelta(days=1))
+    end = horizon_end
+    if template.valid_to is not None:
+        end = min(end, template.valid_to)
+    if start > end:
+        return 0
+
+    slots = build_template_slots(template, start, end)
+    created = 0
+    batch_size = settings.SCHEDULE_TEMPLATE_BATCH_SIZE
+    for offset in range(0, len(slots), batch_size):
+        result = await bulk_create_schedules(
+            db,
+            template.barber_id,
+            slots[offset : offset + batch_size],
+            template_id=template.id,
+        )
+        created += result["created"]
+
+    # Slots rejected for overlapping hand-made schedules are not retried:
+    # the template only ever fills dates it has not covered yet.
+    template.generated_until = end
+    await db.commit()
+
+    logger.info(
+        "Schedule template expanded",
+        extra={
+            "template_id": template.id,
+            "barber_id": template.barber_id,
+            "until": end.isoformat(),
+            "slot_count": len(slots),
+            "created_count": created,
+        },
+    )
+    return created
+
+
+async def expand_schedule_templates(db: AsyncSession, today: date | None = None) -> int:
+    today = today or datetime.utcnow().date()
+    horizon_end = today + timedelta(days=settings.SCHEDULE_TEMPLATE_HORIZON_DAYS)
+
+    templates = await get_templates_due(db, today, horizon_end)
+    created = 0
+    for template in templates:
+        created += await expand_template(db, template, today, horizon_end)
+
+    logger.info(
+        "Schedule templates expansion finished",
+        extra={"template_count": len(templates), "created_count": created},
+    )
+    return created
+
+
+async def _get_barber_or_404(db: AsyncSession, user_id: int):
+    barber = await get_barber_by_user_id(db, user_id)
+    if not barber:
+        logger.warning(
+            "Barber not found for schedule template", extra={"user_id": user_id}
+        )
+        raise HTTPException(status_code=404, detail="Barber not found")
+    return barber
+
+
+async def create_schedule_template(
+    db: AsyncSession, user_id: int, data: ScheduleTemplateCreate, role: str
+) -> ScheduleTemplate:
+    ensure_barber(role)
+    logger.info(
+        "Attempting to create schedule template",
+        extra={"user_id": user_id, "weekday": data.weekday},
+    )
+    barber = await _get_barber_or_404(db, user_id)
+
+    template = ScheduleTemplate(
+        barber_id=barber.id,
+        weekday=data.weekday,
+        start_time=trim_time(data.start_time),
+        end_time=trim_time(data.end_time),
+        slot_minutes=data.slot_minutes,
+        valid_from=data.valid_from,
+        valid_to=data.valid_to,
+        is_active=True,
+    )
+    db.add(template)
+    await db.commit()
+    await db.refresh(template)
+
+    # Fill the current horizon right away instead of waiting for the next
+    # beat run; the job picks up later dates as the horizon moves.
+    today = datetime.utcnow().date()
+    await expand_template(
+        db,
+        template,
+        today,
+        today + timedelta(days=settings.SCHEDULE_TEMPLATE_HORIZON_DAYS),
+    )
+    return template
+
+
+async def get_my_schedule_templates(
+    db: AsyncSession, user_id: int, role: str
+) -> list[ScheduleTemplate]:
+    ensure_barber(role)
+    barber = await _get_barber_or_404(db, user_id)
+    return await get_templates_by_barber(db, barber.id)
+
+
+async def delete_schedule_template(
+    db: AsyncSession, template_id: int, user_id: int, role: str
+):
+    ensure_barber(role)
+    logger.info(
+        "Attempting to delete schedule template",
+        extra={"template_id": template_id, "user_id": user_id},
+    )
+    barber = await _get_barber_or_404(db, user_id)
+
+    template = await get_template_by_id(db, template_id, barber.id)
+    if not template:
+        logger.warning(
+            "Schedule template not found for deletion",
+            extra={"template_id": template_id, "barber_id": barber.id},
+        )
+        raise HTTPException(status_code=404, detail="Schedule template not found")
+
+    # Booked slots stay (and lose their template link); free future slots
+    # generated from the template go with it.
+    result = await db.execute(
+        delete(BarberSchedule).where(
+            BarberSchedule.template_id == template.id,
+            BarberSchedule.is_active.is_(True),
+            BarberSchedule.date >= datetime.utcnow().date(),
+        )
+    )
+    await db.delete(template)
+    await db.commit()
+    await invalidate_response_cache()
+
+    logger.info(
+        "Schedule template deleted",
+        extra={
+            "template_id": template_id,
+            "barber_id": barber.id,
+            "removed_slots": result.rowcount,
+        },
+    )
+    return {"detail": "Schedule template deleted"}
@@ -1,9 +1,16 @@
+import asyncio
 from typing import Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.hash import get_password_hash, verify_password
+from app.core.hash import (
+    get_password_hash_async,
+    password_needs_rehash,
+    verify_password_async,
+)
+from app.db.session import async_session
 from app.models.user import User
 from app.utils.celery_tasks.sms import send_sms_task
 from app.utils.code_generator import generate_verification_code
@@ -40,7 +47,7 @@ async def create_user(
         )
         raise HTTPException(status_code=400, detail="Phone number already registered")
 
-    hashed_password = get_password_hash(password)
+    hashed_password = await get_password_hash_async(password)
     user = User(
         username=username, phone=phone, hashed_password=hashed_password, role_id=role_id
     )
@@ -62,11 +69,55 @@ async def create_user(
     return user
 
 
+# Strong references to in-flight rehash tasks; the event loop only keeps weak
+# ones.
+_rehash_tasks: set[asyncio.Task] = set()
+
+
+async def rehash_password(
+    user_id: int,
+    old_hash: str,
+    password: str,
+    session_factory: async_sessionmaker = async_session,
+):
+    """Re-hash with the current scheme/cost and store it, unless the password
+    changed in the meantime."""
+    try:
+        new_hash = await get_password_hash_async(password)
+        async with session_factory() as db:
+            result = await db.execute(
+                update(User)
+                .where(User.id == user_id, User.hashed_password == old_hash)
+                .values(hashed_password=new_hash)
+            )
+            await db.commit()
+        logger.info(
+            "Password hash upgraded",
+            extra={
+                "action": "rehash_password",
+                "user_id": user_id,
+                "updated": bool(result.rowcount),
+            },
+        )
+    except Exception as e:
+        logger.error(
+            f"Password rehash failed: {e}",
+            extra={"action": "rehash_password", "user_id": user_id},
+        )
+
+
+def schedule_password_rehash(user_id: int, old_hash: str, password: str):
+    # The login response does not wait for the extra bcrypt round and write.
+    task = asyncio.create_task(rehash_password(user_id, old_hash, password))
+    _rehash_tasks.add(task)
+    task.add_done_callback(_rehash_tasks.discard)
+
+
 async def authenticate_user(
     db: AsyncSession, username: str, password: str
 ) -> User | None:
     user = await get_user_by_username(db, username)
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await verify_password_async(password, user.hashed_password):
         logger.warning(
             "Login failed: invalid credentials",
             extra={"action": "login", "username": username},
@@ -78,6 +129,8 @@ async def authenticate_user(
         "User authenticated successfully",
         extra={"action": "login", "username": username, "user_id": user.id},
     )
+    if password_needs_rehash(user.hashed_password):
+        schedule_password_rehash(user.id, user.hashed_password, password)
     return user
 
 
@@ -123,7 +176,9 @@ async def update_user_profile(
                 extra={"action": "update_profile", "user_id": user_id, "phone": phone},
             )
             raise HTTPException(status_code=400, detail="Phone already in use")
-        if not old_password or not verify_password(old_password, user.hashed_password):
+        if not old_password or not await verify_password_async(
+            old_password, user.hashed_password
+        ):
             logger.warning(
                 "User profile update failed: password required to change phone",
                 extra={"action": "update_profile", "user_id": user_id, "phone": phone},
@@ -138,13 +193,15 @@ async def update_user_profile(
         )
 
     if new_password:
-        if not old_password or not verify_password(old_password, user.hashed_password):
+        if not old_password or not await verify_password_async(
+            old_password, user.hashed_password
+        ):
             logger.warning(
                 "User profile update failed: old password incorrect",
                 extra={"action": "update_profile", "user_id": user_id},
             )
             raise HTTPException(status_code=400, detail="Old password is incorrect")
-        user.hashed_password = get_password_hash(new_password)
+        user.hashed_password = await get_password_hash_async(new_password)
         logger.info(
             "User password updated",
             extra={"action": "update_profile", "user_id": user_id},
@@ -209,7 +266,7 @@ async def confirm_password_reset(
         )
         raise HTTPException(status_code=400, detail="Invalid or expired code")
 
-    user.hashed_password = get_password_hash(new_password)
+    user.hashed_password = await get_password_hash_async(new_password)
     await delete_verification_code(phone)
     db.add(user)
     await db.commit()
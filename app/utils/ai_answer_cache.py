@@ -0,0 +1,74 @@
+import hashlib
+import json
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.utils.faq import similarity, trigrams
+from app.utils.logger import logger
+from app.utils.redis_client import redis_client
+
+AI_ANSWER_PREFIX = "ai_answer"
+
+
+def shop_info_fingerprint(shop_info: dict) -> str:
+    """Answers are stored per shop info version, so editing
+    barbershop_info.yaml retires every cached answer at once."""
+    body = json.dumps(shop_info, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(body.encode()).hexdigest()[:12]
+
+
+def _answer_key(fingerprint: str, normalized: str) -> str:
+    digest = hashlib.sha1(normalized.encode()).hexdigest()
+    return f"{AI_ANSWER_PREFIX}:{fingerprint}:{digest}"
+
+
+def _recent_key(fingerprint: str) -> str:
+    return f"{AI_ANSWER_PREFIX}:{fingerprint}:recent"
+
+
+async def get_cached_answer(
+    fingerprint: str, normalized: str
+) -> tuple[dict, bool] | None:
+    """Return ``(entry, exact)`` for the question or the most similar recently
+    answered one, or ``None``. Redis errors count as a miss."""
+    try:
+        cached = await redis_client.get(_answer_key(fingerprint, normalized))
+        if cached:
+            return json.loads(cached), True
+
+        threshold = settings.AI_ANSWER_CACHE_SIMILARITY
+        if threshold <= 0:
+            return None
+        recent = await redis_client.lrange(
+            _recent_key(fingerprint), 0, settings.AI_ANSWER_CACHE_RECENT - 1
+        )
+        grams = trigrams(normalized)
+        best, best_score = None, threshold
+        for other in recent:
+            score = similarity(grams, trigrams(other))
+            if score >= best_score:
+                best, best_score = other, score
+        if best is None:
+            return None
+        cached = await redis_client.get(_answer_key(fingerprint, best))
+    except RedisError as e:
+        logger.warning(f"AI answer cache unavailable: {e}")
+        return None
+    return (json.loads(cached), False) if cached else None
+
+
+async def save_answer(fingerprint: str, normalized: str, answer: str, latency: float):
+    ttl = settings.AI_ANSWER_CACHE_TTL
+    entry = json.dumps({"answer": answer, "latency": latency})
+    recent = _recent_key(fingerprint)
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(_answer_key(fingerprint, normalized), entry, ex=ttl)
+            pipe.lrem(recent, 0, normalized)
+            pipe.lpush(recent, normalized)
+            pipe.ltrim(recent, 0, settings.AI_ANSWER_CACHE_RECENT - 1)
+            pipe.expire(recent, ttl)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Failed to cache AI answer: {e}")
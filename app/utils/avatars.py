@@ -0,0 +1,59 @@
+import re
+
+from app.core.config import settings
+from app.utils.images import AVATAR_FORMATS
+from app.utils.storage import object_url
+
+AVATAR_PREFIX = "avatars"
+
+
+def avatar_variant_key(avatar_hash: str, size: int, fmt: str) -> str:
+    return f"{AVATAR_PREFIX}/{avatar_hash}/{size}.{fmt}"
+
+
+def avatar_hash_from_key(key: str) -> str | None:
+    """The content hash a variant key belongs to, ``None`` for other keys."""
+    parts = key.split("/")
+    if len(parts) == 3 and parts[0] == AVATAR_PREFIX:
+        return parts[1]
+    return None
+
+
+def avatar_object_keys(avatar_url: str | None, avatar_hash: str | None) -> list[str]:
+    """Every S3 key behind a barber's avatar: its variants, and the original
+    for avatars uploaded before only variants were stored."""
+    keys = []
+    if avatar_url:
+        match = re.search(r"/barbers/.*$", avatar_url)
+        if match:
+            keys.append(match.group(0).lstrip("/"))
+    if avatar_hash:
+        keys.extend(
+            avatar_variant_key(avatar_hash, size, fmt)
+            for size in settings.AVATAR_VARIANT_SIZES
+            for fmt in AVATAR_FORMATS
+        )
+    return keys
+
+
+def avatar_url(avatar_hash: str) -> str:
+    """The largest JPEG variant. Only the re-encoded variants are public; the
+    upload itself, with its EXIF/GPS metadata, is never stored."""
+    size = max(settings.AVATAR_VARIANT_SIZES)
+    return object_url(
+        settings.S3_BUCKET_NAME, avatar_variant_key(avatar_hash, size, "jpeg")
+    )
+
+
+def avatar_variant_urls(avatar_hash: str | None) -> dict[int, dict[str, str]] | None:
+    if not avatar_hash:
+        return None
+    return {
+        size: {
+            fmt: object_url(
+                settings.S3_BUCKET_NAME, avatar_variant_key(avatar_hash, size, fmt)
+            )
+            for fmt in AVATAR_FORMATS
+        }
+        for size in settings.AVATAR_VARIANT_SIZES
+    }
@@ -0,0 +1,22 @@
+import asyncio
+
+from app.db.session import async_session, engine
+from app.services.reminder_service import send_due_reminders
+from app.utils.celery_tasks.sms import celery
+from app.utils.logger import logger
+
+
+async def _send_due_reminders() -> dict:
+    try:
+        async with async_session() as db:
+            return await send_due_reminders(db)
+    finally:
+        await engine.dispose()
+
+
+@celery.task
+def send_due_reminders_task():
+    logger.info("Sending due appointment reminders")
+    totals = asyncio.run(_send_due_reminders())
+    logger.info(f"Appointment reminders processed: {totals}")
+    return totals
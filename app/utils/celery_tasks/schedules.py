@@ -0,0 +1,24 @@
+import asyncio
+
+from app.db.session import async_session, engine
+from app.services.schedule_template_service import expand_schedule_templates
+from app.utils.celery_tasks.sms import celery
+from app.utils.logger import logger
+
+
+async def _expand_schedule_templates() -> int:
+    try:
+        async with async_session() as db:
+            return await expand_schedule_templates(db)
+    finally:
+        # Each task run gets a fresh event loop; pooled connections are bound
+        # to the loop that opened them.
+        await engine.dispose()
+
+
+@celery.task
+def expand_schedule_templates_task():
+    logger.info("Expanding schedule templates")
+    created = asyncio.run(_expand_schedule_templates())
+    logger.info(f"Schedule templates expanded, {created} slots created")
+    return created
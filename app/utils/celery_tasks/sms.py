@@ -1,49 +1,149 @@
+import json
+import time
+from contextlib import suppress
+
+import redis
 from celery import Celery
-from twilio.rest import Client
+from redis.exceptions import LockNotOwnedError
 
 from app.core.config import settings
 from app.utils.logger import logger
+from app.utils.sms_dispatch import SmsDispatcher, SmsMessage, build_sms_provider
 
 celery = Celery(
     "worker",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
+    include=[
+        "app.utils.celery_tasks.reminders",
+        "app.utils.celery_tasks.schedules",
+        "app.utils.celery_tasks.storage",
+    ],
+)
+celery.conf.beat_schedule = {
+    "expand-schedule-templates": {
+        "task": "app.utils.celery_tasks.schedules.expand_schedule_templates_task",
+        "schedule": settings.SCHEDULE_TEMPLATE_EXPAND_INTERVAL,
+    },
+    "collect-s3-garbage": {
+        "task": "app.utils.celery_tasks.storage.collect_s3_garbage_task",
+        "schedule": settings.S3_GC_INTERVAL,
+    },
+    "send-due-reminders": {
+        "task": "app.utils.celery_tasks.reminders.send_due_reminders_task",
+        "schedule": settings.REMINDER_POLL_INTERVAL,
+    },
+    "dispatch-sms": {
+        "task": "app.utils.celery_tasks.sms.dispatch_sms_task",
+        "schedule": settings.SMS_DISPATCH_INTERVAL,
+    },
+}
+
+sms_provider = build_sms_provider(settings.SMS_BACKEND)
+# One dispatcher per worker process, so token buckets carry over between
+# batches; the dispatch lock keeps a single process sending at a time.
+sms_dispatcher = SmsDispatcher(
+    sms_provider,
+    rate=settings.SMS_RATE_PER_SENDER,
+    burst=settings.SMS_BURST_PER_SENDER,
+    max_retries=settings.SMS_MAX_RETRIES,
+    backoff_base=settings.SMS_BACKOFF_BASE,
 )
 
-twilio_client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+SMS_OUTBOX_KEY = "sms:outbox"
+SMS_PROCESSING_KEY = "sms:processing"
+SMS_DISPATCH_LOCK_KEY = "sms:dispatch-lock"
+outbox = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+
+def queue_sms(messages: list[tuple[str, str]], sender: str | None = None):
+    """Append ``(to_phone, message)`` pairs to the outbox in one round trip and
+    trigger a dispatch."""
+    if not messages:
+        return
+    sender = sender or settings.TWILIO_PHONE_NUMBER
+    outbox.rpush(
+        SMS_OUTBOX_KEY,
+        *(
+            json.dumps({"to": to_phone, "body": message, "sender": sender})
+            for to_phone, message in messages
+        ),
+    )
+    dispatch_sms_task.delay()
+
+
+@celery.task
+def send_sms_task(to_phone: str, message: str, sender: str | None = None):
+    """Queue a message for the next dispatch batch."""
+    queue_sms([(to_phone, message)], sender)
+    logger.info(f"SMS to {to_phone} queued")
+
+
+def _claim_batch() -> list[str]:
+    """Move up to ``SMS_BATCH_SIZE`` messages from the outbox onto the
+    processing list in one transaction and return them."""
+    pipe = outbox.pipeline()
+    for _ in range(settings.SMS_BATCH_SIZE):
+        pipe.lmove(SMS_OUTBOX_KEY, SMS_PROCESSING_KEY, "LEFT", "RIGHT")
+    return [item for item in pipe.execute() if item is not None]
+
+
+def _requeue_processing() -> int:
+    """Put a batch left behind by a crashed drain back at the head of the
+    outbox, keeping its order."""
+    requeued = 0
+    while outbox.lmove(SMS_PROCESSING_KEY, SMS_OUTBOX_KEY, "RIGHT", "LEFT"):
+        requeued += 1
+    return requeued
 
 
 @celery.task
-def send_sms_task(to_phone: str, message: str):
-    logger.info(f"Sending SMS to {to_phone} with message: {message}")
+def dispatch_sms_task() -> dict:
+    """Drain the outbox in batches of ``SMS_BATCH_SIZE``.
+
+    Triggered after every queued message and periodically by beat. Only one
+    worker drains at a time; the others return straight away, and whatever
+    they queued is picked up by the running drain.
+
+    Each batch sits on the processing list until ``dispatch`` returns, so a
+    worker killed mid-batch leaves it there for the next drain to re-queue.
+    Delivery is at-least-once: part of such a batch may be sent twice.
+
+    The lock is extended from inside ``dispatch`` every third of
+    ``SMS_DISPATCH_LOCK_TTL``, so a slow batch keeps it. If it is lost anyway
+    (e.g. the worker stalled), the drain stops and leaves the processing list
+    to whichever worker holds the lock now.
+    """
+    totals = {"sent": 0, "failed": 0, "throttled": 0, "retried": 0}
+    ttl = settings.SMS_DISPATCH_LOCK_TTL
+    lock = outbox.lock(SMS_DISPATCH_LOCK_KEY, timeout=ttl)
+    if not lock.acquire(blocking=False):
+        return totals
+    extended_at = time.monotonic()
+
+    def keep_lock():
+        nonlocal extended_at
+        if time.monotonic() - extended_at >= ttl / 3:
+            lock.reacquire()
+            extended_at = time.monotonic()
+
     try:
-        msg = twilio_client.messages.create(
-            body=message,
-            from_=settings.TWILIO_PHONE_NUMBER,
-            to=to_phone,
-        )
-        logger.info(f"SMS sent successfully to {to_phone}, sid: {msg.sid}")
-        return msg.sid
-    except Exception as e:
-        logger.error(f"Failed to send SMS to {to_phone}: {e}")
-        raise
-
-
-# from celery import Celery
-
-# from app.core.config import settings
-# from app.utils.logger import logger
-
-# celery = Celery(
-#     "worker",
-#     broker=settings.REDIS_URL,
-#     backend=settings.REDIS_URL,
-# )
-
-
-# @celery.task
-# def send_sms_task(to_phone: str, message: str):
-#     logger.info(f"Sending SMS to {to_phone} with message: {message}")
-#     print(f"[MOCK SMS] To: {to_phone}, Message: {message}")
-#     logger.info(f"SMS sent successfully to {to_phone}")
-#     return "mocked-message-id"
+        if requeued := _requeue_processing():
+            logger.warning("Re-queued unfinished SMS batch", extra={"count": requeued})
+        while raw := _claim_batch():
+            counts = sms_dispatcher.dispatch(
+                [SmsMessage(**json.loads(item)) for item in raw], heartbeat=keep_lock
+            )
+            keep_lock()
+            outbox.delete(SMS_PROCESSING_KEY)
+            for result, count in counts.items():
+                totals[result] += count
+    except LockNotOwnedError:
+        logger.warning("SMS dispatch lock lost, stopping the drain", extra=totals)
+        return totals
+    finally:
+        with suppress(LockNotOwnedError):
+            lock.release()
+
+    logger.info("SMS batch dispatched", extra=totals)
+    return totals
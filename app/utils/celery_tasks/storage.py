@@ -0,0 +1,22 @@
+import asyncio
+
+from app.db.session import async_session, engine
+from app.services.s3_gc_service import collect_s3_garbage
+from app.utils.celery_tasks.sms import celery
+from app.utils.logger import logger
+
+
+async def _collect_s3_garbage() -> dict:
+    try:
+        async with async_session() as db:
+            return await collect_s3_garbage(db)
+    finally:
+        await engine.dispose()
+
+
+@celery.task
+def collect_s3_garbage_task():
+    logger.info("Collecting S3 garbage")
+    totals = asyncio.run(_collect_s3_garbage())
+    logger.info(f"S3 garbage collected: {totals}")
+    return totals
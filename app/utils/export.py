@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+from datetime import date, time
+from typing import AsyncIterator, Literal
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+ExportFormat = Literal["csv", "ndjson"]
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _plain(value):
+    return value.isoformat() if isinstance(value, (date, time)) else value
+
+
+def _csv_chunk(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+async def stream_rows(
+    db: AsyncSession, query: Select, fmt: ExportFormat, batch_size: int
+) -> AsyncIterator[str]:
+    """Encode the rows of a column ``query`` as CSV (with a header) or NDJSON.
+
+    Rows are fetched ``batch_size`` at a time from a server-side cursor and
+    written out one batch per chunk, so memory use does not depend on how many
+    rows match. Plain column rows are used rather than ORM entities, which
+    would pile up in the session's identity map.
+
+    FastAPI closes ``get_session`` once the endpoint returns, before the body
+    is streamed; the session can be used again after ``close()``, so the
+    stream runs its own transaction on it and closes it again when done.
+    """
+    try:
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        keys = list(result.keys())
+        if fmt == "csv":
+            yield _csv_chunk([keys])
+        async for partition in result.partitions():
+            if fmt == "csv":
+                yield _csv_chunk([[_plain(v) for v in row] for row in partition])
+            else:
+                yield "".join(
+                    json.dumps(dict(zip(keys, map(_plain, row)))) + "\n"
+                    for row in partition
+                )
+    finally:
+        await db.close()
+
+
+def export_response(
+    db: AsyncSession, query: Select, fmt: ExportFormat, name: str
+) -> StreamingResponse:
+    extension = "csv" if fmt == "csv" else "ndjson"
+    return StreamingResponse(
+        stream_rows(db, query, fmt, settings.EXPORT_BATCH_SIZE),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{extension}"'},
+    )
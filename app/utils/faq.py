@@ -0,0 +1,87 @@
+import re
+import unicodedata
+
+_FILLER_WORDS = {"please", "hi", "hello", "hey", "pls"}
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, drop punctuation and greetings, collapse whitespace, so
+    "Hi! What are your HOURS?" and "what are your hours" are the same key."""
+    text = unicodedata.normalize("NFKC", question).casefold()
+    words = re.findall(r"\w+", text)
+    return " ".join(word for word in words if word not in _FILLER_WORDS)
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: set[str], b: set[str]) -> float:
+    """Jaccard similarity of two trigram sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _join(value) -> str:
+    if isinstance(value, dict):
+        return ", ".join(f"{name} – {price}" for name, price in value.items())
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(item) for item in value)
+    return str(value).strip()
+
+
+# (shop info field, pattern over the normalized question, answer template).
+# A topic is only answered when its field is present in barbershop_info.yaml.
+FAQ_TOPICS = [
+    (
+        "working_hours",
+        re.compile(
+            r"\b(hours|opening|closing|open|close|closed|what time|working time)\b"
+        ),
+        "We're open {}.",
+    ),
+    (
+        "address",
+        re.compile(
+            r"\b(address|located|location|directions|where are you"
+            r"|where is (the )?(shop|barbershop|salon))\b"
+        ),
+        "You can find us at {}.",
+    ),
+    (
+        "services",
+        re.compile(
+            r"\b(services|service list|what do you (do|offer)|do you offer"
+            r"|what can i get)\b"
+        ),
+        "We offer {}.",
+    ),
+    (
+        "prices",
+        re.compile(r"\b(price|prices|pricing|cost|costs|how much)\b"),
+        "Our prices: {}.",
+    ),
+]
+
+# Questions about specific people or bookings always go to the model, which
+# is told to point to the booking endpoints instead.
+_NOT_FAQ = re.compile(r"\b(book|booking|appointment|barber|barbers|cancel)\b")
+
+
+def match_faq(question: str, shop_info: dict) -> str | None:
+    """Answer ``question`` from ``shop_info`` when it only asks about topics
+    the shop info covers; ``None`` means the model should answer."""
+    normalized = normalize_question(question)
+    if not normalized or _NOT_FAQ.search(normalized):
+        return None
+
+    answers = []
+    for field, pattern, template in FAQ_TOPICS:
+        if pattern.search(normalized):
+            value = shop_info.get(field)
+            if not value:
+                return None
+            answers.append(template.format(_join(value)))
+    return " ".join(answers) or None
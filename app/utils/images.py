@@ -0,0 +1,58 @@
+import hashlib
+import io
+import warnings
+
+from PIL import Image, ImageOps
+
+# format name -> (Pillow encoder, content type, encoder options)
+AVATAR_FORMATS = {
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "image/jpeg", {"quality": 85, "optimize": True}),
+}
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_avatar_variants(
+    path: str, sizes: list[int]
+) -> tuple[str, dict[tuple[int, str], bytes]]:
+    """Decode the uploaded image at ``path`` and render square variants of it.
+
+    Returns the sha256 of the file and ``{(size, format): encoded bytes}``.
+    The image is re-encoded from pixels only, so EXIF (including GPS), ICC
+    profiles and comments are dropped; EXIF orientation is applied first.
+    Raises ``ValueError`` for anything Pillow cannot decode safely.
+
+    CPU-bound: called in a worker process, not on the event loop.
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", Image.DecompressionBombWarning)
+            with Image.open(path) as image:
+                image.load()
+                image = ImageOps.exif_transpose(image)
+    except (OSError, SyntaxError, Image.DecompressionBombWarning) as e:
+        raise ValueError(f"Invalid image: {e}") from e
+
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    variants = {}
+    for size in sizes:
+        thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        for name, (encoder, _, options) in AVATAR_FORMATS.items():
+            frame = thumbnail
+            if encoder == "JPEG" and has_alpha:
+                # JPEG has no alpha channel: flatten onto white.
+                frame = Image.new("RGB", thumbnail.size, "white")
+                frame.paste(thumbnail, mask=thumbnail.getchannel("A"))
+            buffer = io.BytesIO()
+            frame.save(buffer, encoder, **options)
+            variants[(size, name)] = buffer.getvalue()
+    return _file_sha256(path), variants
@@ -1,38 +1,147 @@
 import asyncio
 import datetime
 import logging
+import os
+import queue
+import random
+import threading
+import time
 from logging import LogRecord
 
 from elasticsearch import AsyncElasticsearch
+from prometheus_client import Counter, Gauge, Histogram
 
 from app.core.config import settings
 
 ELASTICSEARCH_HOST = settings.ELASTICSEARCH_URL
 ES_INDEX = "app-logs"
 
+BACKPRESSURE_DROP = "drop"
+BACKPRESSURE_SAMPLE = "sample"
+BACKPRESSURE_BLOCK = "block"
+
+LOG_QUEUE_DEPTH = Gauge(
+    "es_log_queue_depth", "Log records waiting to be shipped to Elasticsearch"
+)
+LOG_RECORDS_DROPPED = Counter(
+    "es_log_records_dropped_total",
+    "Log records dropped before reaching Elasticsearch",
+    ["reason"],
+)
+LOG_RECORDS_SHIPPED = Counter(
+    "es_log_records_shipped_total", "Log records shipped to Elasticsearch"
+)
+LOG_FLUSH_LATENCY = Histogram(
+    "es_log_flush_seconds", "Duration of Elasticsearch bulk log flushes"
+)
+
+_EXCLUDED_RECORD_FIELDS = (
+    "name",
+    "msg",
+    "args",
+    "levelname",
+    "levelno",
+    "pathname",
+    "filename",
+    "module",
+    "exc_info",
+    "exc_text",
+    "stack_info",
+    "lineno",
+    "funcName",
+    "created",
+    "msecs",
+    "relativeCreated",
+    "thread",
+    "threadName",
+    "processName",
+    "process",
+)
+
 
 class ElasticsearchHandler(logging.Handler):
-    def __init__(self, es_client: AsyncElasticsearch, index: str):
+    """Queues log documents and ships them to Elasticsearch in bulk.
+
+    ``emit`` never performs I/O: it renders the record into a document and puts
+    it on a bounded queue. A background shipper thread drains the queue and
+    sends a bulk request once ``batch_size`` documents are collected or
+    ``flush_interval`` seconds have passed, whichever happens first.
+
+    When the queue is full the ``backpressure`` policy decides what happens:
+    ``drop`` discards the record, ``sample`` starts keeping only a fraction of
+    sub-WARNING records once the queue is half full, and ``block`` waits up to
+    ``block_timeout`` seconds for space before dropping.
+    """
+
+    def __init__(
+        self,
+        es_client: AsyncElasticsearch,
+        index: str,
+        queue_size: int = settings.ES_LOG_QUEUE_SIZE,
+        batch_size: int = settings.ES_LOG_BATCH_SIZE,
+        flush_interval: float = settings.ES_LOG_FLUSH_INTERVAL,
+        backpressure: str = settings.ES_LOG_BACKPRESSURE,
+        sample_rate: float = settings.ES_LOG_SAMPLE_RATE,
+        block_timeout: float = settings.ES_LOG_BLOCK_TIMEOUT,
+    ):
         super().__init__()
+        if backpressure not in (
+            BACKPRESSURE_DROP,
+            BACKPRESSURE_SAMPLE,
+            BACKPRESSURE_BLOCK,
+        ):
+            raise ValueError(f"Unknown backpressure policy: {backpressure}")
+
         self.es_client = es_client
         self.index = index
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.backpressure = backpressure
+        self.sample_rate = sample_rate
+        self.block_timeout = block_timeout
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._closing = threading.Event()
+        self._start_lock = threading.Lock()
+        self._shipper: threading.Thread | None = None
+        self._shipper_pid: int | None = None
 
     def emit(self, record: LogRecord):
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            try:
-                loop.create_task(self._send(record))
-            except Exception as e:
-                print("Elasticsearch logging failed (emit):", str(e))
-        else:
-            try:
-                loop.run_until_complete(self._send(record))
-            except Exception as e:
-                print("Elasticsearch logging failed (run):", str(e))
+        try:
+            document = self._build_document(record)
+        except Exception as e:
+            print("Elasticsearch logging failed (emit):", str(e))
+            return
+
+        if self._enqueue(document, record.levelno):
+            self._ensure_shipper()
+        LOG_QUEUE_DEPTH.set(self._queue.qsize())
 
-    async def _send(self, record: LogRecord):
-        log_doc = {
-            "timestamp": datetime.datetime.utcnow().isoformat(),
+    def _enqueue(self, document: dict, levelno: int) -> bool:
+        if self.backpressure == BACKPRESSURE_SAMPLE:
+            half_full = self._queue.qsize() >= self._queue.maxsize // 2
+            if (
+                half_full
+                and levelno < logging.WARNING
+                and random.random() >= self.sample_rate
+            ):
+                LOG_RECORDS_DROPPED.labels(reason="sampled").inc()
+                return False
+
+        try:
+            if self.backpressure == BACKPRESSURE_BLOCK:
+                self._queue.put(document, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(document)
+        except queue.Full:
+            reason = "timeout" if self.backpressure == BACKPRESSURE_BLOCK else "full"
+            LOG_RECORDS_DROPPED.labels(reason=reason).inc()
+            return False
+        return True
+
+    def _build_document(self, record: LogRecord) -> dict:
+        return {
+            "timestamp": datetime.datetime.utcfromtimestamp(record.created).isoformat(),
             "level": record.levelname,
             "message": record.getMessage(),
             "logger_name": record.name,
@@ -42,36 +151,100 @@ class ElasticsearchHandler(logging.Handler):
             **{
                 k: v
                 for k, v in record.__dict__.items()
-                if k
-                not in (
-                    "name",
-                    "msg",
-                    "args",
-                    "levelname",
-                    "levelno",
-                    "pathname",
-                    "filename",
-                    "module",
-                    "exc_info",
-                    "exc_text",
-                    "stack_info",
-                    "lineno",
-                    "funcName",
-                    "created",
-                    "msecs",
-                    "relativeCreated",
-                    "thread",
-                    "threadName",
-                    "processName",
-                    "process",
-                )
+                if k not in _EXCLUDED_RECORD_FIELDS
             },
         }
 
+    def _ensure_shipper(self):
+        # Worker processes may be forked after import, and threads do not
+        # survive a fork, so the shipper is (re)started per process.
+        pid = os.getpid()
+        if self._shipper_pid == pid and self._shipper.is_alive():
+            return
+        with self._start_lock:
+            if self._shipper_pid == pid and self._shipper.is_alive():
+                return
+            if self._closing.is_set():
+                return
+            self._shipper = threading.Thread(
+                target=self._run_shipper, name="es-log-shipper", daemon=True
+            )
+            self._shipper_pid = pid
+            self._shipper.start()
+
+    def _run_shipper(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            while True:
+                batch = self._collect_batch()
+                if batch:
+                    loop.run_until_complete(self._ship(batch))
+                if self._closing.is_set() and self._queue.empty():
+                    break
+            loop.run_until_complete(self.es_client.close())
+        except Exception as e:
+            print(f"[Logger] Elasticsearch shipper stopped: {e}")
+        finally:
+            loop.close()
+
+    def _collect_batch(self) -> list[dict]:
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                if self._closing.is_set():
+                    document = self._queue.get_nowait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    document = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(document)
+        LOG_QUEUE_DEPTH.set(self._queue.qsize())
+        return batch
+
+    async def _ship(self, batch: list[dict]):
+        operations = []
+        for document in batch:
+            operations.append({"index": {"_index": self.index}})
+            operations.append(document)
+
+        started = time.perf_counter()
         try:
-            await self.es_client.index(index=self.index, document=log_doc)
+            response = await self.es_client.bulk(operations=operations)
         except Exception as e:
-            print(f"[Logger] Failed to send log to Elasticsearch: {e}")
+            LOG_RECORDS_DROPPED.labels(reason="error").inc(len(batch))
+            print(f"[Logger] Failed to send logs to Elasticsearch: {e}")
+            return
+        finally:
+            LOG_FLUSH_LATENCY.observe(time.perf_counter() - started)
+
+        # A bulk request succeeds as a whole even when single documents are
+        # rejected, e.g. on a mapping conflict.
+        rejected = []
+        if response["errors"]:
+            rejected = [
+                item["index"]["error"]
+                for item in response["items"]
+                if "error" in item["index"]
+            ]
+        if rejected:
+            LOG_RECORDS_DROPPED.labels(reason="rejected").inc(len(rejected))
+            print(
+                f"[Logger] Elasticsearch rejected {len(rejected)} log records: "
+                f"{rejected[0]}"
+            )
+        LOG_RECORDS_SHIPPED.inc(len(batch) - len(rejected))
+
+    def close(self, timeout: float = 5.0):
+        self._closing.set()
+        shipper = self._shipper
+        if shipper is not None and self._shipper_pid == os.getpid():
+            shipper.join(timeout)
+        super().close()
 
 
 es_client = AsyncElasticsearch(hosts=[ELASTICSEARCH_HOST])
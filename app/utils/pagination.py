@@ -0,0 +1,79 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, Response
+from sqlalchemy import Select, literal, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Keyset:
+    """Keyset (cursor) pagination over a unique, ordered column tuple.
+
+    The cursor is the sort key of the last row on a page, base64-encoded, so a
+    page is found with an index range scan instead of skipping ``OFFSET`` rows.
+    Lists keep their plain JSON body; the cursor for the next page is returned
+    in the ``X-Next-Cursor`` header.
+    """
+
+    def __init__(self, *columns, descending: bool = False):
+        self.columns = columns
+        self.descending = descending
+
+    def encode(self, item) -> str:
+        values = []
+        for column in self.columns:
+            value = getattr(item, column.key)
+            values.append(value.isoformat() if isinstance(value, datetime) else value)
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode(self, cursor: str) -> tuple:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(values, list) or len(values) != len(self.columns):
+                raise ValueError("cursor length mismatch")
+            return tuple(
+                (
+                    datetime.fromisoformat(value)
+                    if column.type.python_type is datetime
+                    else column.type.python_type(value)
+                )
+                for column, value in zip(self.columns, values)
+            )
+        except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    def paginate(
+        self, query: Select, limit: int, cursor: str | None = None, skip: int = 0
+    ) -> Select:
+        """Order, filter and limit ``query``; ``skip`` applies only without a cursor."""
+        if self.descending:
+            query = query.order_by(*(column.desc() for column in self.columns))
+        else:
+            query = query.order_by(*(column.asc() for column in self.columns))
+
+        if cursor:
+            key = tuple_(*self.columns)
+            after = tuple_(
+                *(
+                    literal(value, column.type)
+                    for column, value in zip(self.columns, self.decode(cursor))
+                )
+            )
+            query = query.where(key < after if self.descending else key > after)
+        elif skip:
+            query = query.offset(skip)
+        return query.limit(limit)
+
+    def next_cursor(self, items: list, limit: int) -> str | None:
+        if len(items) < limit:
+            return None
+        return self.encode(items[-1])
+
+
+def set_next_cursor(response: Response, keyset: Keyset, items: list, limit: int):
+    cursor = keyset.next_cursor(items, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -1,7 +1,16 @@
+import asyncio
 import json
+import math
+import random
+import secrets
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
 
 import redis.asyncio as redis
 import yaml
+from prometheus_client import Counter, Histogram
+from redis.exceptions import WatchError
 
 from app.core.config import settings
 from app.utils.logger import logger
@@ -44,71 +53,331 @@ async def can_request_code(phone: str, limit_seconds: int = 60) -> bool:
     return True
 
 
+CACHE_REQUESTS = Counter(
+    "redis_cache_requests_total",
+    "Cached values by how they were served",
+    ["cache", "result"],  # hit, stale, computed, waited
+)
+CACHE_COMPUTE_SECONDS = Histogram(
+    "redis_cache_compute_seconds",
+    "Time spent recomputing cached values",
+    ["cache"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    computed_at: float
+    compute_time: float
+
+
+class SwrCache:
+    """JSON values in Redis with a soft and a hard TTL.
+
+    An entry is fresh for ``soft_ttl`` seconds, and may be refreshed a little
+    before that: the closer to expiry and the slower the value was to
+    compute, the likelier (XFetch; ``beta`` scales it, 0 turns it off).
+    After ``soft_ttl`` it is stale, and Redis drops it after ``hard_ttl``.
+
+    Only the caller holding the key's lock recomputes. While it does, the
+    others are served the stale value when ``serve_stale`` is set, and
+    otherwise wait for the new one, as they always do for a missing key.
+    A waiter computes the value itself after ``lock_ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        soft_ttl: int,
+        hard_ttl: int,
+        lock_ttl: int | None = None,
+        serve_stale: bool = True,
+        beta: float | None = None,
+    ):
+        self.name = name
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.lock_ttl = lock_ttl or settings.CACHE_LOCK_TTL
+        self.serve_stale = serve_stale
+        self.beta = settings.CACHE_XFETCH_BETA if beta is None else beta
+
+    def encode(self, value, compute_time: float = 0.0) -> str:
+        return json.dumps({"v": value, "t": time.time(), "d": compute_time})
+
+    @staticmethod
+    def decode(raw: str | None) -> CacheEntry | None:
+        if raw is None:
+            return None
+        try:
+            data = json.loads(raw)
+            return CacheEntry(data["v"], data["t"], data["d"])
+        except (ValueError, TypeError, KeyError):
+            # Written by an older version of the app; treat as a miss.
+            return None
+
+    def is_fresh(self, entry: CacheEntry, now: float) -> bool:
+        return now < entry.computed_at + self.soft_ttl
+
+    def needs_refresh(self, entry: CacheEntry, now: float) -> bool:
+        if self.beta and entry.compute_time:
+            # -log(U) for U in (0, 1] is exponentially distributed: usually
+            # small, occasionally large enough to refresh well ahead.
+            now -= entry.compute_time * self.beta * math.log(1.0 - random.random())
+        return not self.is_fresh(entry, now)
+
+    async def get_many(self, keys: list[str]) -> list[CacheEntry | None]:
+        return [self.decode(raw) for raw in await redis_client.mget(keys)]
+
+    async def get(self, key: str) -> CacheEntry | None:
+        return (await self.get_many([key]))[0]
+
+    async def set_many(self, values: dict[str, Any], compute_time: float = 0.0):
+        if not values:
+            return
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key, value in values.items():
+                pipe.set(key, self.encode(value, compute_time), ex=self.hard_ttl)
+            await pipe.execute()
+
+    async def set(self, key: str, value, compute_time: float = 0.0):
+        await self.set_many({key: value}, compute_time)
+
+    async def delete(self, key: str):
+        await redis_client.delete(key)
+
+    async def _lock_many(self, keys: list[str], token: str) -> list[bool]:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.set(f"{key}:lock", token, nx=True, ex=self.lock_ttl)
+            return [bool(locked) for locked in await pipe.execute()]
+
+    async def _unlock_many(self, keys: list[str], token: str):
+        """Release the locks on ``keys`` that still hold ``token``; a lock that
+        expired during a slow compute may belong to another caller by now."""
+        lock_keys = [f"{key}:lock" for key in keys]
+        async with redis_client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(*lock_keys)
+                    owned = [
+                        lock_key
+                        for lock_key, holder in zip(
+                            lock_keys, await pipe.mget(lock_keys)
+                        )
+                        if holder == token
+                    ]
+                    if not owned:
+                        return
+                    pipe.multi()
+                    pipe.delete(*owned)
+                    await pipe.execute()
+                    return
+                except WatchError:
+                    continue
+
+    async def _compute(
+        self,
+        keys: list[str],
+        compute: Callable[[list[str]], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        start = time.perf_counter()
+        values = await compute(keys)
+        compute_time = time.perf_counter() - start
+        CACHE_COMPUTE_SECONDS.labels(self.name).observe(compute_time)
+        CACHE_REQUESTS.labels(self.name, "computed").inc(len(keys))
+        await self.set_many(values, compute_time)
+        return values
+
+    async def _wait(
+        self,
+        keys: list[str],
+        stale: dict[str, CacheEntry | None],
+        compute: Callable[[list[str]], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        """Poll until another caller has stored newer values for ``keys``."""
+        values = {}
+        pending = list(keys)
+        deadline = time.monotonic() + self.lock_ttl
+        while pending and time.monotonic() < deadline:
+            await asyncio.sleep(settings.CACHE_POLL_INTERVAL)
+            waiting = []
+            for key, entry in zip(pending, await self.get_many(pending)):
+                old = stale[key]
+                if entry and (old is None or entry.computed_at > old.computed_at):
+                    values[key] = entry.value
+                else:
+                    waiting.append(key)
+            pending = waiting
+        CACHE_REQUESTS.labels(self.name, "waited").inc(len(values))
+        if pending:
+            logger.warning(
+                f"Timed out waiting for cache {self.name}, computing {len(pending)} keys"
+            )
+            values.update(await self._compute(pending, compute))
+        return values
+
+    async def fetch_many(
+        self,
+        keys: list[str],
+        compute: Callable[[list[str]], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        """Values for ``keys``; ``compute`` is called with the keys that need
+        (re)computing and this caller holds the lock for."""
+        if not keys:
+            return {}
+        entries = dict(zip(keys, await self.get_many(keys)))
+        now = time.time()
+
+        values = {}
+        expired = []
+        for key, entry in entries.items():
+            if entry is not None and not self.needs_refresh(entry, now):
+                values[key] = entry.value
+            else:
+                expired.append(key)
+        CACHE_REQUESTS.labels(self.name, "hit").inc(len(values))
+        if not expired:
+            return values
+
+        token = secrets.token_hex(16)
+        mine = []
+        waiting = []
+        for key, locked in zip(expired, await self._lock_many(expired, token)):
+            entry = entries[key]
+            if locked:
+                mine.append(key)
+            elif entry is not None and (self.serve_stale or self.is_fresh(entry, now)):
+                CACHE_REQUESTS.labels(self.name, "stale").inc()
+                values[key] = entry.value
+            else:
+                waiting.append(key)
+
+        if mine:
+            try:
+                values.update(await self._compute(mine, compute))
+            finally:
+                await self._unlock_many(mine, token)
+        if waiting:
+            values.update(await self._wait(waiting, entries, compute))
+        return values
+
+    async def fetch(self, key: str, compute: Callable[[], Awaitable[Any]]):
+        async def compute_one(keys: list[str]) -> dict[str, Any]:
+            return {key: await compute()}
+
+        return (await self.fetch_many([key], compute_one))[key]
+
+
+# Ratings are deleted whenever a review changes them, so the TTLs only bound
+# how long an entry lives if that is missed.
 BARBER_RATING_EXPIRE = 86400
+BARBER_RATING_STALE = 3600
 
+barber_rating_cache = SwrCache(
+    "barber_rating",
+    soft_ttl=BARBER_RATING_EXPIRE,
+    hard_ttl=BARBER_RATING_EXPIRE + BARBER_RATING_STALE,
+)
+
+
+def barber_rating_key(barber_id: int) -> str:
+    return f"barber_rating:{barber_id}"
 
-async def save_barber_rating(
-    barber_id: int,
-    avg_rating: float,
-    count: int,
-    expire_seconds: int = BARBER_RATING_EXPIRE,
-):
-    key = f"barber_rating:{barber_id}"
-    value = f"{avg_rating}:{count}"
-    await redis_client.set(key, value, ex=expire_seconds)
-    logger.info(
-        f"Saved barber rating for barber_id={barber_id}: avg_rating={avg_rating}, count={count}, expiry={expire_seconds}s"
-    )
 
+async def fetch_barber_ratings(
+    barber_ids: list[int],
+    compute: Callable[[list[int]], Awaitable[dict[int, tuple[float, int]]]],
+) -> dict[int, tuple[float, int]]:
+    """Cached ratings for ``barber_ids``, calling ``compute`` for the ones
+    that are missing or due for a refresh."""
+    ids = {barber_rating_key(barber_id): barber_id for barber_id in barber_ids}
 
-async def get_barber_rating(barber_id: int) -> tuple[float, int] | None:
-    key = f"barber_rating:{barber_id}"
-    value = await redis_client.get(key)
-    if not value:
-        logger.debug(f"No cached rating found for barber_id={barber_id}")
-        return None
+    async def compute_keys(keys: list[str]) -> dict[str, list]:
+        ratings = await compute([ids[key] for key in keys])
+        return {
+            barber_rating_key(barber_id): list(r) for barber_id, r in ratings.items()
+        }
 
-    await redis_client.expire(key, BARBER_RATING_EXPIRE)
-    logger.debug(f"Refreshed expiry for barber rating cache barber_id={barber_id}")
+    values = await barber_rating_cache.fetch_many(list(ids), compute_keys)
+    return {ids[key]: (float(avg), int(count)) for key, (avg, count) in values.items()}
 
-    avg_rating_str, count_str = value.split(":")
-    return float(avg_rating_str), int(count_str)
+
+async def fetch_barber_rating(
+    barber_id: int, compute: Callable[[], Awaitable[tuple[float, int]]]
+) -> tuple[float, int]:
+    avg, count = await barber_rating_cache.fetch(barber_rating_key(barber_id), compute)
+    return float(avg), int(count)
 
 
 async def delete_barber_rating(barber_id: int):
-    key = f"barber_rating:{barber_id}"
-    await redis_client.delete(key)
+    await barber_rating_cache.delete(barber_rating_key(barber_id))
     logger.info(f"Deleted cached barber rating for barber_id={barber_id}")
 
 
 BARBERSHOP_INFO_KEY = "barbershop_info"
+# Re-read from the file after an hour at most; edits normally arrive sooner
+# through publish_barbershop_info.
 BARBERSHOP_INFO_EXPIRE = 3600
+BARBERSHOP_INFO_STALE = 86400
+# Workers keep the parsed shop info and the prompt built from it in memory;
+# a message on this channel tells them to reload.
+BARBERSHOP_INFO_CHANNEL = "barbershop_info:updated"
+BARBERSHOP_INFO_VERSION_KEY = "barbershop_info:version"
 
+barbershop_info_cache = SwrCache(
+    "barbershop_info",
+    soft_ttl=BARBERSHOP_INFO_EXPIRE,
+    hard_ttl=BARBERSHOP_INFO_EXPIRE + BARBERSHOP_INFO_STALE,
+    lock_ttl=settings.BARBERSHOP_INFO_LOCK_TTL,
+)
 
-async def load_barbershop_info_from_redis() -> dict | None:
-    cached = await redis_client.get(BARBERSHOP_INFO_KEY)
-    if cached:
-        logger.debug("Loaded barbershop info from Redis cache")
-        return json.loads(cached)
-    return None
 
+def read_barbershop_info_file(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
 
-async def save_barbershop_info_to_redis(data: dict):
-    await redis_client.set(
-        BARBERSHOP_INFO_KEY, json.dumps(data), ex=BARBERSHOP_INFO_EXPIRE
-    )
-    logger.info(
-        f"Saved barbershop info to Redis cache with expiry {BARBERSHOP_INFO_EXPIRE}s"
-    )
 
+async def load_barbershop_info(path: str | None = None) -> dict:
+    """The published shop info, re-read from the YAML file when it expires.
 
-async def load_barbershop_info(path: str = "data/barbershop_info.yaml") -> dict:
-    cached = await load_barbershop_info_from_redis()
-    if cached:
-        return cached
+    Only one worker reads the file at a time; the others keep the stale copy
+    meanwhile, or wait for the file to be read on a cold start.
+    """
+    path = path or settings.BARBERSHOP_INFO_PATH
+    return await barbershop_info_cache.fetch(
+        BARBERSHOP_INFO_KEY,
+        lambda: asyncio.to_thread(read_barbershop_info_file, path),
+    )
 
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
 
-    await save_barbershop_info_to_redis(data)
-    return data
+async def publish_barbershop_info(data: dict, fingerprint: str) -> bool:
+    """Make ``data`` the current shop info and tell every worker to reload.
+
+    Returns ``False`` without publishing when ``fingerprint`` is already the
+    current version, e.g. when several workers notice the same file edit.
+    The version is recorded in the same transaction as the data, so a
+    failed publish can be retried.
+    """
+    async with redis_client.pipeline(transaction=True) as pipe:
+        while True:
+            try:
+                await pipe.watch(BARBERSHOP_INFO_VERSION_KEY)
+                if await pipe.get(BARBERSHOP_INFO_VERSION_KEY) == fingerprint:
+                    return False
+                pipe.multi()
+                pipe.set(BARBERSHOP_INFO_VERSION_KEY, fingerprint)
+                pipe.set(
+                    BARBERSHOP_INFO_KEY,
+                    barbershop_info_cache.encode(data),
+                    ex=barbershop_info_cache.hard_ttl,
+                )
+                pipe.publish(BARBERSHOP_INFO_CHANNEL, fingerprint)
+                *_, receivers = await pipe.execute()
+                break
+            except WatchError:
+                # Another worker published meanwhile; check its version.
+                continue
+    logger.info(f"Published barbershop info {fingerprint} to {receivers} workers")
+    return True
@@ -0,0 +1,123 @@
+import hashlib
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Awaitable, Callable
+
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.utils.logger import logger
+from app.utils.redis_client import redis_client
+
+RESPONSE_CACHE_PREFIX = "response_cache"
+RESPONSE_CACHE_VERSION_KEY = f"{RESPONSE_CACHE_PREFIX}:version"
+
+# Cached bodies are stored under the current cache version, so invalidation is
+# a single INCR: every worker sees the new version on its next request and
+# entries written under older versions are never read again.
+_local_cache: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+async def _get_cache_version() -> str | None:
+    try:
+        return await redis_client.get(RESPONSE_CACHE_VERSION_KEY) or "0"
+    except RedisError as e:
+        logger.warning(f"Response cache unavailable: {e}")
+        return None
+
+
+def _get_local(key: str) -> bytes | None:
+    entry = _local_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, body = entry
+    if expires_at < monotonic():
+        _local_cache.pop(key, None)
+        return None
+    _local_cache.move_to_end(key)
+    return body
+
+
+def _set_local(key: str, body: bytes, ttl: int):
+    _local_cache[key] = (monotonic() + ttl, body)
+    _local_cache.move_to_end(key)
+    while len(_local_cache) > settings.RESPONSE_CACHE_LOCAL_SIZE:
+        _local_cache.popitem(last=False)
+
+
+async def _load_body(
+    name: str, build: Callable[[], Awaitable[Any]], adapter: TypeAdapter, ttl: int
+) -> bytes:
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return adapter.dump_json(await build())
+
+    version = await _get_cache_version()
+    if version is None:
+        return adapter.dump_json(await build())
+
+    key = f"{RESPONSE_CACHE_PREFIX}:{version}:{name}"
+    body = _get_local(key)
+    if body is not None:
+        logger.debug(f"Response cache local hit: {name}")
+        return body
+
+    try:
+        cached = await redis_client.get(key)
+    except RedisError as e:
+        logger.warning(f"Response cache read failed for {name}: {e}")
+        cached = None
+
+    if cached is not None:
+        body = cached.encode()
+        logger.debug(f"Response cache hit: {name}")
+    else:
+        logger.info(f"Response cache miss: {name}")
+        body = adapter.dump_json(await build())
+        try:
+            await redis_client.set(key, body.decode(), ex=ttl)
+        except RedisError as e:
+            logger.warning(f"Response cache write failed for {name}: {e}")
+
+    _set_local(key, body, ttl)
+    return body
+
+
+async def cached_json_response(
+    request: Request,
+    name: str,
+    build: Callable[[], Awaitable[Any]],
+    adapter: TypeAdapter,
+    ttl: int = settings.RESPONSE_CACHE_TTL,
+) -> Response:
+    body = await _load_body(name, build, adapter, ttl)
+    etag = make_etag(body)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def invalidate_response_cache():
+    _local_cache.clear()
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return
+    try:
+        await redis_client.incr(RESPONSE_CACHE_VERSION_KEY)
+        logger.info("Response cache invalidated")
+    except RedisError as e:
+        logger.warning(f"Response cache invalidation failed: {e}")
@@ -40,3 +40,10 @@ async def get_all_barbers(db: AsyncSession) -> List[Barber]:
     result = await db.execute(select(Barber))
     barbers = result.scalars().all()
     return barbers
+
+
+async def get_referenced_avatar_hashes(db: AsyncSession, hashes: set[str]) -> set[str]:
+    result = await db.execute(
+        select(Barber.avatar_hash).where(Barber.avatar_hash.in_(hashes)).distinct()
+    )
+    return set(result.scalars().all())
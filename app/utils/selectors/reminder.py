@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.appointment import Appointment
+from app.models.appointment_reminder import AppointmentReminder
+
+
+async def get_due_reminders(
+    db: AsyncSession, now: datetime, limit: int
+) -> list[tuple[AppointmentReminder, Appointment]]:
+    """Reminders whose send time has come, with their appointment, oldest
+    first. Reminder rows are locked so concurrent pollers take disjoint
+    batches (no-op on SQLite)."""
+    result = await db.execute(
+        select(AppointmentReminder, Appointment)
+        .join(Appointment, Appointment.id == AppointmentReminder.appointment_id)
+        .where(AppointmentReminder.send_at <= now)
+        .order_by(AppointmentReminder.send_at)
+        .limit(limit)
+        .with_for_update(of=AppointmentReminder, skip_locked=True)
+    )
+    return result.tuples().all()
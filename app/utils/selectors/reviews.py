@@ -2,28 +2,74 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
+from app.models.barber_rating_stats import BarberRatingStats
 from app.models.review import Review
+from app.utils.pagination import Keyset
+
+REVIEW_KEYSET = Keyset(Review.created_at, Review.id, descending=True)
 
 
 async def get_all_reviews(
-    db: AsyncSession, only_unapproved: bool = False
+    db: AsyncSession,
+    only_unapproved: bool = False,
+    limit: int = 50,
+    cursor: str | None = None,
 ) -> list[Review]:
     query = select(Review).options(joinedload(Review.client), joinedload(Review.barber))
     if only_unapproved:
         query = query.where(Review.is_approved.is_(False))
+    query = REVIEW_KEYSET.paginate(query, limit, cursor=cursor)
 
     result = await db.execute(query)
     return result.scalars().all()
 
 
+def _avg(rating_sum: int, rating_count: int) -> float:
+    return rating_sum / rating_count if rating_count else 0.0
+
+
 async def get_barber_rating_from_db(
     db: AsyncSession, barber_id: int
 ) -> tuple[float, int]:
     result = await db.execute(
-        select(func.avg(Review.rating), func.count(Review.id)).where(
+        select(BarberRatingStats.rating_sum, BarberRatingStats.rating_count).where(
+            BarberRatingStats.barber_id == barber_id
+        )
+    )
+    row = result.one_or_none()
+    if row is None:
+        return 0.0, 0
+    rating_sum, count = row
+    return _avg(rating_sum, count), count
+
+
+async def get_barber_ratings_from_db(
+    db: AsyncSession, barber_ids: list[int]
+) -> dict[int, tuple[float, int]]:
+    result = await db.execute(
+        select(
+            BarberRatingStats.barber_id,
+            BarberRatingStats.rating_sum,
+            BarberRatingStats.rating_count,
+        ).where(BarberRatingStats.barber_id.in_(barber_ids))
+    )
+    ratings = {
+        barber_id: (_avg(rating_sum, count), count)
+        for barber_id, rating_sum, count in result.all()
+    }
+    for barber_id in barber_ids:
+        ratings.setdefault(barber_id, (0.0, 0))
+    return ratings
+
+
+async def get_approved_rating_totals(
+    db: AsyncSession, barber_id: int
+) -> tuple[int, int]:
+    result = await db.execute(
+        select(func.coalesce(func.sum(Review.rating), 0), func.count(Review.id)).where(
             Review.barber_id == barber_id,
             Review.is_approved.is_(True),
         )
     )
-    avg_rating, count = result.one()
-    return avg_rating or 0.0, count or 0
+    rating_sum, count = result.one()
+    return int(rating_sum), count
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.s3_deletion import S3Deletion
+
+
+async def get_due_s3_deletions(
+    db: AsyncSession, now: datetime, max_attempts: int, limit: int
+) -> list[S3Deletion]:
+    """Queued deletions whose retry time has come, oldest first. Rows are
+    locked so concurrent workers take disjoint batches (no-op on SQLite)."""
+    result = await db.execute(
+        select(S3Deletion)
+        .where(S3Deletion.next_attempt_at <= now, S3Deletion.attempts < max_attempts)
+        .order_by(S3Deletion.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return result.scalars().all()
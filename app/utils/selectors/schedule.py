@@ -1,10 +1,13 @@
-from datetime import date, datetime
+from datetime import date, datetime, time
 
 from sqlalchemy import and_, asc, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, with_loader_criteria
 
 from app.models import Barber, BarberSchedule
+from app.utils.pagination import Keyset
+
+SCHEDULE_KEYSET = Keyset(BarberSchedule.id)
 
 
 async def get_schedule_by_id(
@@ -60,6 +63,8 @@ async def select_all_schedules_flat(
     barber_id: int | None = None,
     start_date: date | None = None,
     end_date: date | None = None,
+    limit: int = 100,
+    cursor: str | None = None,
 ) -> list[BarberSchedule]:
     now = datetime.utcnow()
     today = now.date()
@@ -93,6 +98,22 @@ async def select_all_schedules_flat(
     query = select(BarberSchedule)
     if filters:
         query = query.where(and_(*filters))
+    query = SCHEDULE_KEYSET.paginate(query, limit, cursor=cursor)
 
     result = await db.execute(query)
     return result.scalars().all()
+
+
+async def get_schedule_intervals(
+    db: AsyncSession, barber_id: int, start_date: date, end_date: date
+) -> list[tuple[date, time, time]]:
+    result = await db.execute(
+        select(
+            BarberSchedule.date, BarberSchedule.start_time, BarberSchedule.end_time
+        ).where(
+            BarberSchedule.barber_id == barber_id,
+            BarberSchedule.date >= start_date,
+            BarberSchedule.date <= end_date,
+        )
+    )
+    return [tuple(row) for row in result.all()]
@@ -0,0 +1,51 @@
+from datetime import date
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.schedule_template import ScheduleTemplate
+
+
+async def get_templates_by_barber(
+    db: AsyncSession, barber_id: int
+) -> list[ScheduleTemplate]:
+    result = await db.execute(
+        select(ScheduleTemplate)
+        .where(ScheduleTemplate.barber_id == barber_id)
+        .order_by(ScheduleTemplate.weekday, ScheduleTemplate.start_time)
+    )
+    return result.scalars().all()
+
+
+async def get_template_by_id(
+    db: AsyncSession, template_id: int, barber_id: int
+) -> ScheduleTemplate | None:
+    result = await db.execute(
+        select(ScheduleTemplate).where(
+            ScheduleTemplate.id == template_id,
+            ScheduleTemplate.barber_id == barber_id,
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_templates_due(
+    db: AsyncSession, today: date, horizon_end: date
+) -> list[ScheduleTemplate]:
+    """Active templates that still have dates to expand before ``horizon_end``."""
+    result = await db.execute(
+        select(ScheduleTemplate)
+        .where(
+            ScheduleTemplate.is_active.is_(True),
+            ScheduleTemplate.valid_from <= horizon_end,
+            or_(
+                ScheduleTemplate.valid_to.is_(None), ScheduleTemplate.valid_to >= today
+            ),
+            or_(
+                ScheduleTemplate.generated_until.is_(None),
+                ScheduleTemplate.generated_until < horizon_end,
+            ),
+        )
+        .order_by(ScheduleTemplate.barber_id, ScheduleTemplate.id)
+    )
+    return result.scalars().all()
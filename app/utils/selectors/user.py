@@ -1,4 +1,4 @@
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import User
@@ -17,3 +17,10 @@ async def get_user_by_phone(db: AsyncSession, phone: str) -> User | None:
 async def get_user_by_id(db: AsyncSession, user_id: int) -> User | None:
     result = await db.execute(select(User).filter(User.id == user_id))
     return result.scalars().first()
+
+
+async def get_password_hash_prefix_counts(db: AsyncSession) -> list[tuple[str, int]]:
+    """Count users per hash prefix, e.g. ``$2b$12$`` for bcrypt at cost 12."""
+    prefix = func.substr(User.hashed_password, 1, 7)
+    result = await db.execute(select(prefix, func.count()).group_by(prefix))
+    return [(row[0], row[1]) for row in result.all()]
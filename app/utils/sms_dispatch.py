@@ -0,0 +1,290 @@
+import heapq
+import itertools
+import random
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Callable, Protocol
+
+from prometheus_client import Counter
+from twilio.base.exceptions import TwilioRestException
+
+from app.core.config import settings
+from app.utils.logger import logger
+
+SMS_MESSAGES = Counter(
+    "sms_messages_total",
+    "SMS dispatch outcomes",
+    ["result"],  # sent, failed, throttled, retried
+)
+
+
+@dataclass
+class SmsMessage:
+    to: str
+    body: str
+    sender: str
+
+
+class SmsProviderError(Exception):
+    def __init__(self, status: int | None, message: str):
+        super().__init__(message)
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        # Rate limited, provider-side failure or no HTTP response at all.
+        return self.status is None or self.status == 429 or self.status >= 500
+
+
+class SmsProvider(Protocol):
+    def send(self, message: SmsMessage) -> str:
+        """Send one message and return the provider's message id. Raises
+        ``SmsProviderError`` on failure."""
+
+
+class TwilioSmsProvider:
+    """Sends through the Twilio REST API. Without a ``client`` one is built
+    from the Twilio settings on the first send, so importing the task module
+    needs neither the Twilio SDK client nor credentials."""
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            from twilio.rest import Client
+
+            self._client = Client(
+                settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN
+            )
+        return self._client
+
+    def send(self, message: SmsMessage) -> str:
+        try:
+            sent = self.client.messages.create(
+                body=message.body, from_=message.sender, to=message.to
+            )
+        except TwilioRestException as e:
+            raise SmsProviderError(e.status, str(e)) from e
+        except Exception as e:
+            raise SmsProviderError(None, str(e)) from e
+        return sent.sid
+
+
+class LogSmsProvider:
+    """Writes each message to the log instead of sending it (local runs)."""
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+
+    def send(self, message: SmsMessage) -> str:
+        logger.info(
+            f"[LOG SMS] To: {message.to}, Message: {message.body}",
+            extra={"sender": message.sender},
+        )
+        return f"LOG{next(self._ids):08d}"
+
+
+class FakeSmsProvider:
+    """In-memory provider for tests, benchmarks and load runs.
+
+    Every accepted message is kept in ``sent``. Optionally it accepts only
+    ``rate_limit`` messages per second per sender (sliding one-second window)
+    and answers 429 beyond that, like a real provider; ``latency`` simulates
+    the API round trip and ``error_rate`` random 503s.
+    """
+
+    def __init__(
+        self,
+        rate_limit: float | None = None,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate_limit = rate_limit
+        self.latency = latency
+        self.error_rate = error_rate
+        self.clock = clock
+        self.sleep = sleep
+        self.sent: list[SmsMessage] = []
+        self.rejected = 0
+        self._recent: dict[str, deque] = defaultdict(deque)
+        self._ids = itertools.count(1)
+
+    def send(self, message: SmsMessage) -> str:
+        if self.latency:
+            self.sleep(self.latency)
+        now = self.clock()
+        recent = self._recent[message.sender]
+        while recent and recent[0] <= now - 1:
+            recent.popleft()
+        if self.rate_limit is not None and len(recent) >= self.rate_limit:
+            self.rejected += 1
+            raise SmsProviderError(429, "Too Many Requests")
+        if self.error_rate and random.random() < self.error_rate:
+            self.rejected += 1
+            raise SmsProviderError(503, "Service Unavailable")
+        recent.append(now)
+        self.sent.append(message)
+        return f"FAKE{next(self._ids):08d}"
+
+
+SMS_BACKENDS: dict[str, Callable[[], SmsProvider]] = {
+    "twilio": TwilioSmsProvider,
+    "log": LogSmsProvider,
+    "memory": FakeSmsProvider,
+}
+
+
+def build_sms_provider(backend: str) -> SmsProvider:
+    try:
+        return SMS_BACKENDS[backend]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown SMS backend {backend!r}, expected one of "
+            f"{', '.join(SMS_BACKENDS)}"
+        ) from None
+
+
+class TokenBucket:
+    """``rate`` tokens per second, holding at most ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """Take a token and return how long to wait before using it.
+
+        The balance may go negative: each caller reserves the next free slot,
+        so waiting callers are never woken just to find the token gone.
+        """
+        self._refill(now)
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+    def drain(self, now: float):
+        """Empty the bucket after the provider pushed back."""
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+
+
+@dataclass(order=True)
+class _Pending:
+    ready_at: float
+    seq: int
+    message: SmsMessage = field(compare=False)
+    attempt: int = field(default=0, compare=False)
+    reserved: bool = field(default=False, compare=False)
+
+
+class SmsDispatcher:
+    """Send a batch of messages, pacing each sender number with a token bucket.
+
+    Messages are kept in a heap ordered by the time they may next be sent, so
+    a sender that is throttled or backing off does not hold up the others.
+    Retryable failures (429, 5xx, network) are retried with exponential
+    backoff and jitter up to ``max_retries`` times; a 429 also empties that
+    sender's bucket.
+
+    ``heartbeat``, if given, is called before each send or wait, so a caller
+    can keep a lock alive through a long batch.
+    """
+
+    def __init__(
+        self,
+        provider: SmsProvider,
+        rate: float,
+        burst: float,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.provider = provider
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.clock = clock
+        self.sleep = sleep
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def _bucket(self, sender: str, now: float) -> TokenBucket:
+        if sender not in self._buckets:
+            self._buckets[sender] = TokenBucket(self.rate, self.burst, now)
+        return self._buckets[sender]
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    def dispatch(
+        self,
+        messages: list[SmsMessage],
+        heartbeat: Callable[[], None] | None = None,
+    ) -> dict:
+        counts = {"sent": 0, "failed": 0, "throttled": 0, "retried": 0}
+        seq = itertools.count()
+        start = self.clock()
+        queue = [_Pending(start, next(seq), message) for message in messages]
+        heapq.heapify(queue)
+
+        while queue:
+            if heartbeat:
+                heartbeat()
+            pending = heapq.heappop(queue)
+            now = self.clock()
+            if pending.ready_at > now:
+                self.sleep(pending.ready_at - now)
+                now = self.clock()
+
+            message = pending.message
+            bucket = self._bucket(message.sender, now)
+            if not pending.reserved:
+                wait = bucket.reserve(now)
+                if wait:
+                    counts["throttled"] += 1
+                    pending.ready_at = now + wait
+                    pending.reserved = True
+                    pending.seq = next(seq)
+                    heapq.heappush(queue, pending)
+                    continue
+
+            try:
+                sid = self.provider.send(message)
+            except SmsProviderError as e:
+                if e.status == 429:
+                    bucket.drain(self.clock())
+                if e.retryable and pending.attempt < self.max_retries:
+                    counts["retried"] += 1
+                    pending.ready_at = self.clock() + self._backoff(pending.attempt)
+                    pending.attempt += 1
+                    pending.reserved = False
+                    pending.seq = next(seq)
+                    heapq.heappush(queue, pending)
+                    continue
+                counts["failed"] += 1
+                logger.error(
+                    f"Failed to send SMS to {message.to}: {e}",
+                    extra={"status": e.status, "attempts": pending.attempt + 1},
+                )
+                continue
+
+            counts["sent"] += 1
+            logger.info(f"SMS sent successfully to {message.to}, sid: {sid}")
+
+        for result, count in counts.items():
+            SMS_MESSAGES.labels(result).inc(count)
+        return counts
@@ -0,0 +1,8 @@
+from app.core.config import settings
+
+
+def object_url(bucket: str, key: str) -> str:
+    """Public URL of an S3 object (or of the configured S3 stand-in)."""
+    if settings.S3_ENDPOINT_URL:
+        return f"{settings.S3_ENDPOINT_URL.rstrip('/')}/{bucket}/{key}"
+    return f"https://{bucket}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
@@ -1,10 +1,15 @@
-from datetime import time
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, time
 
 from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.barberschedule import BarberSchedule
 
+OVERLAPS_EXISTING = "This time slot overlaps with an existing schedule"
+OVERLAPS_BATCH = "This time slot overlaps with another slot in this request"
+
 
 def trim_time(t: time) -> time:
     return time(t.hour, t.minute)
@@ -18,7 +23,7 @@ async def check_time_overlap(
     end_time: time,
     exclude_schedule_id: int | None = None,
 ):
-    query = select(BarberSchedule).where(
+    query = select(BarberSchedule.id).where(
         BarberSchedule.barber_id == barber_id,
         BarberSchedule.date == date_,
         or_(
@@ -39,6 +44,48 @@ async def check_time_overlap(
     if exclude_schedule_id:
         query = query.where(BarberSchedule.id != exclude_schedule_id)
 
-    result = await db.execute(query)
-    overlap = result.scalar_one_or_none()
+    result = await db.execute(query.limit(1))
+    overlap = result.scalar()
     return overlap is not None
+
+
+def find_schedule_conflicts(
+    existing: list[tuple[date, time, time]],
+    candidates: list[tuple[date, time, time]],
+) -> dict[int, str]:
+    """Return ``{candidate index: reason}`` for every rejected candidate.
+
+    Intervals are grouped by date and swept in start order. A candidate is
+    checked against existing slots with a binary search over their starts and
+    a running maximum of their ends, then against the latest end of the
+    candidates already accepted on that date. When two submitted slots
+    overlap, the one starting first wins.
+    """
+    existing_by_date = defaultdict(list)
+    for day, start, end in existing:
+        existing_by_date[day].append((start, end))
+
+    candidates_by_date = defaultdict(list)
+    for index, (day, start, end) in enumerate(candidates):
+        candidates_by_date[day].append((start, end, index))
+
+    conflicts = {}
+    for day, day_candidates in candidates_by_date.items():
+        booked = sorted(existing_by_date.get(day, []))
+        booked_starts = [start for start, _ in booked]
+        max_booked_end = []
+        for _, end in booked:
+            max_booked_end.append(
+                max(end, max_booked_end[-1]) if max_booked_end else end
+            )
+
+        accepted_until = None
+        for start, end, index in sorted(day_candidates):
+            before = bisect_left(booked_starts, end) - 1
+            if before >= 0 and max_booked_end[before] > start:
+                conflicts[index] = OVERLAPS_EXISTING
+            elif accepted_until is not None and accepted_until > start:
+                conflicts[index] = OVERLAPS_BATCH
+            else:
+                accepted_until = end
+    return conflicts
@@ -0,0 +1,159 @@
+"""AI assistant latency and concurrency against the stub model server.
+
+Starts ``benchmarks.stub_model_server`` on ``--port`` and the app itself
+(uvicorn, startup hooks off) on ``--port + 1``, both in this process, and
+drives the real /ai-assistant routes over HTTP with unique questions, so
+every request reaches the model and streamed bytes arrive as sent. ``ask`` and ``stream`` use the async
+client; ``blocking`` wraps the synchronous client the way the route used to
+call it. A probe client measures how long a cheap request waits meanwhile.
+
+    AI_MAX_CONCURRENCY=20 AI_QUEUE_TIMEOUT=5 \\
+        python -m benchmarks.ai_assistant --concurrency 50 --requests 200
+"""
+
+import argparse
+import asyncio
+from time import perf_counter
+
+import yaml
+from httpx import AsyncClient, Limits
+from openai import AsyncOpenAI, OpenAI
+
+from app.core.config import settings
+from app.main import app
+from app.services import ai_assistant_service, ai_prompt
+from benchmarks.stub_model_server import create_app, serve_in_thread
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+class BlockingClient:
+    """The synchronous OpenAI client behind an ``async`` call, as before."""
+
+    def __init__(self, base_url: str):
+        sync = OpenAI(api_key="stub", base_url=base_url)
+        self.chat = self
+        self.completions = self
+
+        async def create(**kwargs):
+            return sync.chat.completions.create(**kwargs)
+
+        self.create = create
+
+
+async def measure(client: AsyncClient, mode: str, requests: int, concurrency: int):
+    stats = {"total_ms": [], "first_ms": [], "busy": 0, "probe_ms": []}
+    remaining = iter(range(requests))
+    done = asyncio.Event()
+    path = "/ai-assistant/ask/stream" if mode == "stream" else "/ai-assistant/ask"
+
+    async def worker():
+        for i in remaining:
+            question = {"question": f"Question {i}: do you cut kids hair?"}
+            start = perf_counter()
+            async with client.stream("POST", path, json=question) as res:
+                if res.status_code == 503:
+                    stats["busy"] += 1
+                    continue
+                res.raise_for_status()
+                first = None
+                async for _ in res.aiter_bytes():
+                    first = first or perf_counter()
+            stats["first_ms"].append((first - start) * 1000)
+            stats["total_ms"].append((perf_counter() - start) * 1000)
+
+    async def probe():
+        while not done.is_set():
+            start = perf_counter()
+            await asyncio.sleep(0.01)
+            await client.get("/openapi.json")
+            stats["probe_ms"].append((perf_counter() - start - 0.01) * 1000)
+
+    probe_task = asyncio.create_task(probe())
+    started = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = perf_counter() - started
+    done.set()
+    await probe_task
+    return stats, elapsed
+
+
+async def run(args):
+    stub = create_app(args.first_token, args.token_delay)
+    stub_server = serve_in_thread(stub, args.port)
+    base_url = f"http://127.0.0.1:{args.port}/v1"
+
+    with open("data/barbershop_info.yaml", encoding="utf-8") as f:
+        shop_info = yaml.safe_load(f)
+
+    async def load_shop_info():
+        return shop_info
+
+    async def no_cached_answer(*args):
+        return None
+
+    # Redis is not needed: shop info comes from the file and nothing is cached.
+    ai_prompt.load_barbershop_info = load_shop_info
+    ai_assistant_service.get_cached_answer = no_cached_answer
+    ai_assistant_service.save_answer = no_cached_answer
+    async_client = AsyncOpenAI(api_key="stub", base_url=base_url)
+
+    print(
+        f"max_concurrency={settings.AI_MAX_CONCURRENCY} "
+        f"queue_timeout={settings.AI_QUEUE_TIMEOUT}s "
+        f"first_token={args.first_token}s token_delay={args.token_delay}s "
+        f"concurrency={args.concurrency} requests={args.requests}"
+    )
+    print(
+        f"{'mode':<9} {'req/s':>6} {'first p50':>10} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'503s':>5} {'probe p99':>10} {'stub peak':>10}"
+    )
+    # Startup hooks need Redis and the database; these routes need neither.
+    app_server = serve_in_thread(app, args.port + 1, lifespan="off")
+    async with AsyncClient(
+        base_url=f"http://127.0.0.1:{args.port + 1}",
+        timeout=120,
+        limits=Limits(max_connections=args.concurrency + 1),
+    ) as client:
+        for mode in args.modes:
+            ai_assistant_service.client = (
+                BlockingClient(base_url) if mode == "blocking" else async_client
+            )
+            stub.state.peak = 0
+            stats, elapsed = await measure(
+                client, mode, args.requests, args.concurrency
+            )
+            print(
+                f"{mode:<9} {len(stats['total_ms']) / elapsed:>6.1f} "
+                f"{percentile(stats['first_ms'], 0.5):>10.1f} "
+                f"{percentile(stats['total_ms'], 0.5):>8.1f} "
+                f"{percentile(stats['total_ms'], 0.95):>8.1f} "
+                f"{stats['busy']:>5} "
+                f"{percentile(stats['probe_ms'], 0.99):>10.1f} "
+                f"{stub.state.peak:>10}"
+            )
+    app_server.should_exit = True
+    stub_server.should_exit = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--first-token", type=float, default=0.3)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=["blocking", "ask", "stream"],
+        choices=["blocking", "ask", "stream"],
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Cost of the bearer-token auth dependency per request.
+
+Calls ``get_current_user_info`` directly with a pool of distinct tokens (one
+per simulated user) and reports the mean cost per call and the share of one
+CPU core it would take at ``--rps``. Each algorithm is measured with the
+verification cache disabled and enabled.
+
+    python -m benchmarks.auth_dependency --rps 10000 --users 1000
+"""
+
+import argparse
+import asyncio
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from ecdsa import NIST256p, SigningKey
+
+from app.api.deps import get_current_user_info
+from app.core import security
+from app.core.config import settings
+
+
+def use_algorithm(algorithm: str, key_dir: Path):
+    private_key_file = None
+    if algorithm == "ES256":
+        private_key_file = key_dir / "es256.pem"
+        private_key_file.write_bytes(SigningKey.generate(curve=NIST256p).to_pem())
+    settings.ALGORITHM = algorithm
+    security._signing_key, security._verification_key = security.load_keys(
+        algorithm, settings.SECRET_KEY, private_key_file and str(private_key_file)
+    )
+    security.clear_token_cache()
+
+
+async def measure(tokens: list[str], requests: int) -> float:
+    for token in tokens:
+        await get_current_user_info(token)
+    start = perf_counter()
+    for i in range(requests):
+        await get_current_user_info(tokens[i % len(tokens)])
+    return (perf_counter() - start) / requests
+
+
+async def run(args):
+    cache_size = settings.JWT_CACHE_SIZE
+    print(f"users={args.users} requests={args.requests} target={args.rps} req/s")
+    print(f"{'algorithm':<10} {'cache':<6} {'us/req':>8} {'cpu @ target':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for algorithm in args.algorithms:
+            use_algorithm(algorithm, Path(tmp))
+            tokens = [
+                security.create_access_token({"id": i, "role": "user"})
+                for i in range(args.users)
+            ]
+            for cached in (False, True):
+                settings.JWT_CACHE_SIZE = cache_size if cached else 0
+                security.clear_token_cache()
+                per_request = await measure(tokens, args.requests)
+                print(
+                    f"{algorithm:<10} {'on' if cached else 'off':<6} "
+                    f"{per_request * 1e6:>8.1f} "
+                    f"{per_request * args.rps:>12.1%}"
+                )
+    settings.JWT_CACHE_SIZE = cache_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rps", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        default=["HS256", "ES256"],
+        choices=["HS256", "ES256"],
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
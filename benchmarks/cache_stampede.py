@@ -0,0 +1,93 @@
+"""Redis cache behaviour when many requests hit an expired key at once.
+
+Fires ``--concurrency`` lookups at the same moment against the configured
+Redis, each needing a value that takes ``--compute-ms`` to compute (think of
+the rating query). ``naive`` is the old pattern, GET and on a miss compute
+and SET. ``swr`` is ``SwrCache.fetch``. Each runs on a ``cold`` key
+(missing) and a ``stale`` key (past its soft TTL). Reports how many times
+the value was computed and the request latency.
+
+    python -m benchmarks.cache_stampede --concurrency 500 --compute-ms 50
+"""
+
+import argparse
+import asyncio
+import json
+import uuid
+from time import perf_counter
+
+from app.utils.redis_client import SwrCache, redis_client
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+async def run_round(mode: str, state: str, args) -> tuple[int, list[float]]:
+    cache = SwrCache("benchmark", soft_ttl=60, hard_ttl=600)
+    key = f"benchmark:stampede:{uuid.uuid4().hex}"
+    if state == "stale":
+        await redis_client.set(
+            key,
+            json.dumps({"v": "old", "t": 0, "d": args.compute_ms / 1000}),
+            ex=cache.hard_ttl,
+        )
+    computes = 0
+
+    async def compute():
+        nonlocal computes
+        computes += 1
+        await asyncio.sleep(args.compute_ms / 1000)
+        return "value"
+
+    async def naive():
+        cached = await redis_client.get(key)
+        if cached is not None and state == "cold":
+            return cached
+        value = await compute()
+        await redis_client.set(key, value, ex=cache.hard_ttl)
+        return value
+
+    async def request(start: asyncio.Event) -> float:
+        await start.wait()
+        began = perf_counter()
+        if mode == "naive":
+            await naive()
+        else:
+            await cache.fetch(key, compute)
+        return (perf_counter() - began) * 1000
+
+    start = asyncio.Event()
+    tasks = [asyncio.create_task(request(start)) for _ in range(args.concurrency)]
+    await asyncio.sleep(0.1)
+    start.set()
+    latencies = await asyncio.gather(*tasks)
+    await redis_client.delete(key, f"{key}:lock")
+    return computes, latencies
+
+
+async def run(args):
+    await redis_client.ping()
+    print(f"concurrency={args.concurrency} compute={args.compute_ms}ms")
+    print(f"{'mode':<6} {'key':<6} {'computes':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for state in ("cold", "stale"):
+        for mode in ("naive", "swr"):
+            computes, latencies = await run_round(mode, state, args)
+            print(
+                f"{mode:<6} {state:<6} {computes:>9} "
+                f"{percentile(latencies, 0.5):>8.1f} "
+                f"{percentile(latencies, 0.99):>8.1f}"
+            )
+    await redis_client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--compute-ms", type=float, default=50)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
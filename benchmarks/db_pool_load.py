@@ -0,0 +1,100 @@
+"""Pool-exhaustion load test for the application's DB engine.
+
+Drives ``app.db.session.engine`` (configured from the usual DB_* settings)
+with more concurrent checkouts than the pool can serve and reports checkout
+wait percentiles, timeouts and peak connections in use, plus the Postgres
+``max_connections`` needed for a given number of uvicorn workers.
+
+    DATABASE_URL_ASYNC=postgresql+asyncpg://... DB_POOL_SIZE=5 DB_MAX_OVERFLOW=10 \\
+        python -m benchmarks.db_pool_load --concurrency 100 --hold 0.05 --workers 4
+"""
+
+import argparse
+import asyncio
+import statistics
+from time import perf_counter
+
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import settings
+from app.db.session import engine
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def client(deadline: float, hold: float, stats: dict):
+    pool = engine.pool
+    while perf_counter() < deadline:
+        start = perf_counter()
+        try:
+            async with engine.connect() as conn:
+                stats["waits"].append(perf_counter() - start)
+                stats["peak"] = max(stats["peak"], pool.checkedout())
+                await conn.execute(text("SELECT 1"))
+                # Stand-in for request work done while holding the connection.
+                await asyncio.sleep(hold)
+            stats["ok"] += 1
+        except PoolTimeoutError:
+            stats["timeouts"] += 1
+
+
+async def run(args):
+    stats = {"waits": [], "ok": 0, "timeouts": 0, "peak": 0}
+    started = perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(
+        *(client(deadline, args.hold, stats) for _ in range(args.concurrency))
+    )
+    elapsed = perf_counter() - started
+    await engine.dispose()
+
+    per_worker = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    waits_ms = [w * 1000 for w in stats["waits"]]
+    print(
+        f"pool_size={settings.DB_POOL_SIZE} max_overflow={settings.DB_MAX_OVERFLOW} "
+        f"pool_timeout={settings.DB_POOL_TIMEOUT}s concurrency={args.concurrency} "
+        f"hold={args.hold * 1000:.0f}ms"
+    )
+    print(f"checkouts:        {stats['ok']} ({stats['ok'] / elapsed:.0f}/s)")
+    print(f"timeouts:         {stats['timeouts']}")
+    print(f"peak in use:      {stats['peak']} / {per_worker}")
+    if waits_ms:
+        print(
+            "checkout wait ms: "
+            f"mean={statistics.mean(waits_ms):.1f} "
+            f"p50={percentile(waits_ms, 0.50):.1f} "
+            f"p95={percentile(waits_ms, 0.95):.1f} "
+            f"p99={percentile(waits_ms, 0.99):.1f}"
+        )
+    # Little's law: connections busy per worker = checkout rate * hold time.
+    busy = stats["ok"] / elapsed * args.hold
+    print(f"busy connections: {busy:.1f} per worker at this load")
+    print(
+        f"max_connections >= {args.workers} workers x {per_worker} "
+        f"+ {args.reserved} reserved = {args.workers * per_worker + args.reserved}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--hold", type=float, default=0.05, help="seconds per checkout")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=4, help="uvicorn workers")
+    parser.add_argument(
+        "--reserved",
+        type=int,
+        default=10,
+        help="connections kept for migrations, celery and superuser access",
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
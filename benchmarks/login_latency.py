@@ -0,0 +1,146 @@
+"""Login latency under concurrent load, with bcrypt on and off the event loop.
+
+Runs the real /users/login route in-process (httpx ASGI transport, SQLite
+temp database) with ``--concurrency`` clients, while a probe client keeps
+hitting a cheap endpoint to show how much the event loop stalls. The
+``blocking`` mode swaps the pooled verify for the old inline call.
+
+    BCRYPT_ROUNDS=12 PASSWORD_HASH_WORKERS=4 python -m benchmarks.login_latency
+"""
+
+import argparse
+import asyncio
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.services.user_service as user_service
+from app.api.deps import get_session
+from app.api.routes.users import get_login_rate_limiter
+from app.core.config import settings
+from app.core.hash import get_password_hash, verify_password
+from app.db.base import Base
+from app.main import app
+from app.models import Role, User
+
+USERNAME = "bench-user"
+PASSWORD = "bench-pass1#"
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+async def blocking_verify(plain_password: str, hashed_password: str) -> bool:
+    return verify_password(plain_password, hashed_password)
+
+
+async def measure(client: AsyncClient, requests: int, concurrency: int):
+    login_ms, probe_ms = [], []
+    remaining = iter(range(requests))
+    done = asyncio.Event()
+
+    async def login_worker():
+        for _ in remaining:
+            start = perf_counter()
+            res = await client.post(
+                "/users/login", data={"username": USERNAME, "password": PASSWORD}
+            )
+            res.raise_for_status()
+            login_ms.append((perf_counter() - start) * 1000)
+
+    async def probe():
+        # Scheduling delay plus response time of a cheap request: how long any
+        # other request on this worker waits while logins are in flight.
+        while not done.is_set():
+            start = perf_counter()
+            await asyncio.sleep(0.01)
+            await client.get("/openapi.json")
+            probe_ms.append((perf_counter() - start - 0.01) * 1000)
+
+    probe_task = asyncio.create_task(probe())
+    started = perf_counter()
+    await asyncio.gather(*(login_worker() for _ in range(concurrency)))
+    elapsed = perf_counter() - started
+    done.set()
+    await probe_task
+    return login_ms, probe_ms, elapsed
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with sessions() as db:
+            db.add(Role(id=3, name="user"))
+            db.add(
+                User(
+                    username=USERNAME,
+                    phone="+10000000099",
+                    hashed_password=get_password_hash(PASSWORD),
+                    role_id=3,
+                )
+            )
+            await db.commit()
+
+        async def session_override():
+            async with sessions() as session:
+                yield session
+
+        async def no_rate_limit():
+            return None
+
+        app.dependency_overrides[get_session] = session_override
+        app.dependency_overrides[get_login_rate_limiter] = lambda: no_rate_limit
+
+        pooled_verify = user_service.verify_password_async
+        print(
+            f"bcrypt rounds={settings.BCRYPT_ROUNDS} "
+            f"hash workers={settings.PASSWORD_HASH_WORKERS} "
+            f"concurrency={args.concurrency} requests={args.requests}"
+        )
+        print(
+            f"{'mode':<9} {'login/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'probe p99':>10}"
+        )
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.get("/openapi.json")
+            for mode in args.modes:
+                user_service.verify_password_async = (
+                    blocking_verify if mode == "blocking" else pooled_verify
+                )
+                login_ms, probe_ms, elapsed = await measure(
+                    client, args.requests, args.concurrency
+                )
+                print(
+                    f"{mode:<9} {len(login_ms) / elapsed:>8.1f} "
+                    f"{percentile(login_ms, 0.5):>8.1f} "
+                    f"{percentile(login_ms, 0.99):>8.1f} "
+                    f"{percentile(probe_ms, 0.99):>10.1f}"
+                )
+        user_service.verify_password_async = pooled_verify
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=["blocking", "pooled"],
+        choices=["blocking", "pooled"],
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""OpenAI-compatible stub model server for offline load tests.
+
+Serves ``POST /v1/chat/completions`` (plain and ``stream=True``) with a fixed
+answer and configurable latency: ``--first-token`` seconds before the first
+token, then ``--token-delay`` seconds per token. ``--max-concurrency`` makes
+it answer 429 above that many requests in flight, like a rate-limited API.
+
+    python -m benchmarks.stub_model_server --port 8001 --first-token 0.5
+    OPENAI_BASE_URL=http://localhost:8001/v1 OPENAI_API_KEY=stub uvicorn app.main:app
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+ANSWER = (
+    "Sure! We'd be happy to help. Check the barbers section to pick a time "
+    "that suits you, and feel free to ask anything else about the shop."
+)
+
+
+def create_app(
+    first_token: float = 0.5,
+    token_delay: float = 0.02,
+    answer: str = ANSWER,
+    max_concurrency: int | None = None,
+) -> FastAPI:
+    app = FastAPI()
+    tokens = [word + " " for word in answer.split()]
+    app.state.in_flight = 0
+    app.state.peak = 0
+    app.state.requests = 0
+
+    def chunk(completion_id: str, model: str, delta: dict, finish: str | None):
+        return {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "stub")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        app.state.requests += 1
+        if max_concurrency is not None and app.state.in_flight >= max_concurrency:
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached", "type": "rate_limit"}},
+                status_code=429,
+            )
+
+        app.state.in_flight += 1
+        app.state.peak = max(app.state.peak, app.state.in_flight)
+        if not body.get("stream"):
+            try:
+                await asyncio.sleep(first_token + token_delay * len(tokens))
+            finally:
+                app.state.in_flight -= 1
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": answer},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 0,
+                    "completion_tokens": len(tokens),
+                    "total_tokens": len(tokens),
+                },
+            }
+
+        async def events():
+            try:
+                await asyncio.sleep(first_token)
+                for i, token in enumerate(tokens):
+                    if i:
+                        await asyncio.sleep(token_delay)
+                    data = chunk(completion_id, model, {"content": token}, None)
+                    yield f"data: {json.dumps(data)}\n\n"
+                data = chunk(completion_id, model, {}, "stop")
+                yield f"data: {json.dumps(data)}\n\n"
+                yield "data: [DONE]\n\n"
+            finally:
+                app.state.in_flight -= 1
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def serve_in_thread(app: FastAPI, port: int, **config) -> uvicorn.Server:
+    """Start ``app`` on 127.0.0.1:``port`` in a daemon thread."""
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", **config)
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--first-token", type=float, default=0.5)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    parser.add_argument("--max-concurrency", type=int, default=None)
+    args = parser.parse_args()
+    app = create_app(args.first_token, args.token_delay, ANSWER, args.max_concurrency)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Cost of getting the AI assistant's system prompt per question.
+
+``cold`` is what every question used to pay: parse the cached shop info JSON
+(the Redis reply, without the round trip) and format the prompt. ``reload``
+is the first question after an update message when the content did not
+change: parse and hash, but reuse the compiled prompt. ``hot`` is every
+other question: the in-process context.
+
+    python -m benchmarks.system_prompt --calls 100000
+"""
+
+import argparse
+import asyncio
+import json
+from time import perf_counter
+
+import yaml
+
+from app.services import ai_prompt
+from app.services.ai_assistant_service import _messages
+from app.utils.ai_answer_cache import shop_info_fingerprint
+
+
+async def measure(step, calls: int) -> float:
+    await step()
+    start = perf_counter()
+    for _ in range(calls):
+        await step()
+    return (perf_counter() - start) / calls
+
+
+async def run(args):
+    with open(args.shop_info, encoding="utf-8") as f:
+        cached = json.dumps(yaml.safe_load(f))
+
+    async def load_shop_info():
+        return json.loads(cached)
+
+    ai_prompt.load_barbershop_info = load_shop_info
+
+    async def cold():
+        shop_info = await load_shop_info()
+        shop_info_fingerprint(shop_info)
+        prompt = ai_prompt.build_system_prompt(shop_info)
+        return [{"role": "system", "content": prompt}, {"role": "user", "content": ""}]
+
+    async def reload():
+        ai_prompt.invalidate_prompt_context()
+        return _messages(await ai_prompt.get_prompt_context(), "")
+
+    async def hot():
+        return _messages(await ai_prompt.get_prompt_context(), "")
+
+    context = await ai_prompt.get_prompt_context()
+    print(
+        f"shop_info={len(cached)} bytes "
+        f"prompt={len(context.system_message['content'])} chars calls={args.calls}"
+    )
+    print(f"{'path':<8} {'us/call':>8}")
+    for name, step in (("cold", cold), ("reload", reload), ("hot", hot)):
+        print(f"{name:<8} {await measure(step, args.calls) * 1e6:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100000)
+    parser.add_argument("--shop-info", default="data/barbershop_info.yaml")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
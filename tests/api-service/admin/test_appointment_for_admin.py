@@ -6,6 +6,7 @@ import pytest_asyncio
 from sqlalchemy import select
 
 from app.models.appointment import Appointment
+from app.models.appointment_reminder import AppointmentReminder
 from app.models.barberschedule import BarberSchedule
 
 
@@ -80,16 +81,23 @@ async def test_admin_get_appointments_pagination(
     admin_client, db_session_with_rollback, barber_schedule
 ):
     for i in range(3):
-        appointment_dt = datetime.combine(
-            barber_schedule.date + timedelta(days=i), barber_schedule.start_time
+        schedule_date = barber_schedule.date + timedelta(days=i)
+        schedule = BarberSchedule(
+            barber_id=barber_schedule.barber_id,
+            date=schedule_date,
+            start_time=time(12, 0),
+            end_time=time(13, 0),
+            is_active=False,
         )
+        db_session_with_rollback.add(schedule)
+        await db_session_with_rollback.flush()
         appt = Appointment(
             client_name=f"Client {i}",
             client_phone=f"+12345678{i}",
             barber_id=barber_schedule.barber_id,
-            appointment_time=appointment_dt,
+            appointment_time=datetime.combine(schedule_date, schedule.start_time),
             status="scheduled",
-            schedule_id=barber_schedule.id,
+            schedule_id=schedule.id,
         )
         db_session_with_rollback.add(appt)
     await db_session_with_rollback.commit()
@@ -109,12 +117,11 @@ async def test_admin_get_appointments_empty(admin_client):
 
 @pytest.mark.asyncio
 @patch("app.services.admin.appointment.send_sms_task.delay")
-@patch("app.services.admin.appointment.send_sms_task.apply_async")
 async def test_admin_create_appointment_success(
-    mock_apply_async,
     mock_delay,
     admin_client,
     barber_schedule,
+    db_session_with_rollback,
 ):
     payload = {
         "barber_id": barber_schedule.barber_id,
@@ -129,14 +136,17 @@ async def test_admin_create_appointment_success(
     assert data["client_name"] == "AdminTest"
 
     mock_delay.assert_called_once()
-    mock_apply_async.assert_called_once()
+    reminder = await db_session_with_rollback.scalar(
+        select(AppointmentReminder).where(
+            AppointmentReminder.appointment_id == data["id"]
+        )
+    )
+    assert reminder is not None
 
 
 @pytest.mark.asyncio
 @patch("app.services.admin.appointment.send_sms_task.delay")
-@patch("app.services.admin.appointment.send_sms_task.apply_async")
 async def test_admin_create_appointment_missing_data(
-    mock_apply_async,
     mock_delay,
     admin_client,
     barber_schedule,
@@ -150,14 +160,11 @@ async def test_admin_create_appointment_missing_data(
     assert "name and phone" in res.text.lower()
 
     mock_delay.assert_not_called()
-    mock_apply_async.assert_not_called()
 
 
 @pytest.mark.asyncio
 @patch("app.services.admin.appointment.send_sms_task.delay")
-@patch("app.services.admin.appointment.send_sms_task.apply_async")
 async def test_admin_create_appointment_on_inactive_schedule(
-    mock_apply_async,
     mock_delay,
     admin_client,
     barber_schedule,
@@ -237,3 +244,54 @@ async def test_non_admin_cannot_access_appointment_admin_routes(
 
     await check(authorized_client)
     await check(barber_client)
+
+
+@pytest.mark.asyncio
+async def test_admin_get_appointments_cursor_pagination(
+    admin_client, db_session_with_rollback
+):
+    start = datetime.combine(date.today() + timedelta(days=3), time(9, 0))
+    created = []
+    for i in range(5):
+        schedule = BarberSchedule(
+            barber_id=1,
+            date=start.date(),
+            start_time=(start + timedelta(hours=i)).time(),
+            end_time=(start + timedelta(hours=i + 1)).time(),
+            is_active=False,
+        )
+        db_session_with_rollback.add(schedule)
+        await db_session_with_rollback.flush()
+        appt = Appointment(
+            client_name=f"Client {i}",
+            client_phone=f"+12345670{i}",
+            barber_id=1,
+            # Two appointments share a start time; id breaks the tie.
+            appointment_time=start + timedelta(hours=min(i, 3)),
+            status="scheduled",
+            schedule_id=schedule.id,
+        )
+        db_session_with_rollback.add(appt)
+        created.append(appt)
+    await db_session_with_rollback.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        res = await admin_client.get("/admin/appointments/", params=params)
+        assert res.status_code == 200, res.text
+        seen.extend(a["id"] for a in res.json())
+        cursor = res.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert seen == [appt.id for appt in created]
+
+
+@pytest.mark.asyncio
+async def test_admin_get_appointments_invalid_cursor(admin_client):
+    res = await admin_client.get("/admin/appointments/?cursor=garbage")
+    assert res.status_code == 400
@@ -140,42 +140,31 @@ async def test_admin_cannot_delete_barber(admin_client):
     assert response.status_code == 404
 
 
-@patch("app.services.admin.barbers.upload_file_to_s3", new_callable=AsyncMock)
-@patch("app.services.admin.barbers.delete_file_from_s3", new_callable=AsyncMock)
+@patch(
+    "app.services.admin.barbers.create_avatar_variants",
+    new_callable=AsyncMock,
+    return_value="ab" * 32,
+)
 @pytest.mark.asyncio
 async def test_admin_can_upload_barber_avatar(
-    mock_delete_file_from_s3,
-    mock_upload_file_to_s3,
+    mock_create_avatar_variants,
     admin_client,
 ):
     barber_id = 1
 
-    mock_upload_file_to_s3.return_value = (
-        "https://mock-bucket.s3.amazonaws.com/barbers/avatar.jpg"
-    )
-    mock_delete_file_from_s3.return_value = None
-
     files = {"file": ("avatar.jpg", b"fake image data", "image/jpeg")}
     res = await admin_client.post(f"/admin/barbers/{barber_id}/avatar", files=files)
 
     assert res.status_code == 200, res.text
     data = res.json()
-    assert data["avatar_url"].startswith("https://mock-bucket")
+    assert data["avatar_url"].endswith(f"avatars/{'ab' * 32}/512.jpeg")
+    assert data["avatar_variants"]["256"]["webp"].endswith(
+        f"avatars/{'ab' * 32}/256.webp"
+    )
 
 
-@patch("app.services.admin.barbers.upload_file_to_s3", new_callable=AsyncMock)
-@patch("app.services.admin.barbers.delete_file_from_s3", new_callable=AsyncMock)
 @pytest.mark.asyncio
-async def test_admin_can_delete_barber_avatar(
-    mock_delete_file_from_s3,
-    mock_upload_file_to_s3,
-    admin_client,
-):
-    mock_upload_file_to_s3.return_value = (
-        "https://mock-bucket.s3.amazonaws.com/barbers/avatar.jpg"
-    )
-    mock_delete_file_from_s3.return_value = None
-
+async def test_admin_can_delete_barber_avatar(admin_client):
     barber_id = 1
 
     res = await admin_client.delete(f"/admin/barbers/{barber_id}/avatar")
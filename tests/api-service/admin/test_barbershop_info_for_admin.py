@@ -0,0 +1,113 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+import yaml
+
+from app.services import barbershop_info
+from app.utils.ai_answer_cache import shop_info_fingerprint
+from app.utils.faq import match_faq
+from app.utils.redis_client import load_barbershop_info
+
+SHOP_INFO = {
+    "address": "7 New St, Kyiv",
+    "working_hours": "09:00 - 21:00, every day",
+    "services": ["Fades", "Shaves"],
+    "description": "Moved to a bigger place.",
+    "notes": "",
+    "prices": {"Fade": "$25"},
+}
+
+
+@pytest.fixture
+def info_file(tmp_path, monkeypatch):
+    path = tmp_path / "barbershop_info.yaml"
+    path.write_text(yaml.safe_dump({**SHOP_INFO, "address": "12 Example St"}))
+    monkeypatch.setattr(barbershop_info.settings, "BARBERSHOP_INFO_PATH", str(path))
+    return path
+
+
+@pytest.fixture
+def publish(monkeypatch):
+    publish = AsyncMock(return_value=True)
+    monkeypatch.setattr(barbershop_info, "publish_barbershop_info", publish)
+    return publish
+
+
+@pytest.mark.asyncio
+async def test_admin_update_writes_file_and_publishes(admin_client, info_file, publish):
+    res = await admin_client.put("/admin/barbershop-info/", json=SHOP_INFO)
+
+    assert res.status_code == 200
+    assert res.json() == SHOP_INFO
+    assert yaml.safe_load(info_file.read_text()) == SHOP_INFO
+    publish.assert_awaited_once_with(SHOP_INFO, shop_info_fingerprint(SHOP_INFO))
+
+
+@pytest.mark.asyncio
+async def test_admin_update_rejects_invalid_info(admin_client, info_file, publish):
+    res = await admin_client.put(
+        "/admin/barbershop-info/", json={**SHOP_INFO, "services": []}
+    )
+
+    assert res.status_code == 422
+    assert yaml.safe_load(info_file.read_text())["address"] == "12 Example St"
+    publish.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_update_barbershop_info_forbidden_for_client(
+    authorized_client, info_file, publish
+):
+    res = await authorized_client.put("/admin/barbershop-info/", json=SHOP_INFO)
+
+    assert res.status_code == 403
+    publish.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_watcher_republishes_edited_file(info_file, publish, monkeypatch):
+    monkeypatch.setattr(
+        barbershop_info.settings, "BARBERSHOP_INFO_WATCH_INTERVAL", 0.01
+    )
+    watcher = asyncio.create_task(barbershop_info.watch_barbershop_info_file())
+    try:
+        await asyncio.sleep(0.05)
+        # The file as found on startup is published once.
+        startup_info = {**SHOP_INFO, "address": "12 Example St"}
+        publish.assert_awaited_once_with(
+            startup_info, shop_info_fingerprint(startup_info)
+        )
+        publish.reset_mock()
+
+        info_file.write_text("address: ''\n")
+        await asyncio.sleep(0.05)
+        # Invalid edits are logged and skipped.
+        publish.assert_not_awaited()
+
+        barbershop_info.write_barbershop_info_file(str(info_file), SHOP_INFO)
+        await asyncio.sleep(0.05)
+        publish.assert_awaited_once_with(SHOP_INFO, shop_info_fingerprint(SHOP_INFO))
+    finally:
+        watcher.cancel()
+
+
+@pytest.mark.asyncio
+async def test_publishing_keeps_prices_and_extra_fields(
+    admin_client, info_file, memory_redis
+):
+    info = {**SHOP_INFO, "instagram": "@barbers"}
+
+    res = await admin_client.put("/admin/barbershop-info/", json=info)
+
+    assert res.status_code == 200
+    assert yaml.safe_load(info_file.read_text()) == info
+    published = await load_barbershop_info()
+    assert published == info
+    assert match_faq("How much is a fade?", published) == "Our prices: Fade – $25."
+
+    # The watcher publishes the file as it is, too.
+    info_file.write_text(yaml.safe_dump({**info, "prices": {"Shave": "$15"}}))
+    assert await barbershop_info.publish_barbershop_info_file(str(info_file))
+    assert (await load_barbershop_info())["prices"] == {"Shave": "$15"}
+    assert (await load_barbershop_info())["instagram"] == "@barbers"
@@ -0,0 +1,142 @@
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.models.appointment import Appointment
+from app.models.barberschedule import BarberSchedule
+from app.models.review import Review
+from app.utils.export import stream_rows
+
+DAY = date(2031, 3, 10)
+
+
+@pytest_asyncio.fixture
+async def booked_days(db_session_with_rollback):
+    """One booked slot on each of three consecutive days."""
+    db = db_session_with_rollback
+    appointments = []
+    for offset in range(3):
+        day = DAY + timedelta(days=offset)
+        schedule = BarberSchedule(
+            barber_id=1,
+            date=day,
+            start_time=time(10, 0),
+            end_time=time(11, 0),
+            is_active=False,
+        )
+        db.add(schedule)
+        await db.flush()
+        appointments.append(
+            Appointment(
+                client_name=f"Client {offset}",
+                client_phone=f"+1555000000{offset}",
+                barber_id=1,
+                appointment_time=datetime.combine(day, time(10, 0)),
+                status="scheduled",
+                schedule_id=schedule.id,
+            )
+        )
+    db.add_all(appointments)
+    db.add(
+        Review(
+            client_id=4,
+            barber_id=1,
+            rating=4,
+            comment='Good, "quoted", cut',
+            is_approved=False,
+            created_at=datetime.combine(DAY, time(12, 0)),
+        )
+    )
+    await db.commit()
+    return appointments
+
+
+@pytest.mark.asyncio
+async def test_export_appointments_csv_with_date_range(admin_client, booked_days):
+    res = await admin_client.get(
+        "/admin/appointments/export",
+        params={
+            "start_date": (DAY + timedelta(days=1)).isoformat(),
+            "end_date": (DAY + timedelta(days=2)).isoformat(),
+        },
+    )
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/csv")
+    assert 'filename="appointments.csv"' in res.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(res.text)))
+    assert [row["client_name"] for row in rows] == ["Client 1", "Client 2"]
+    assert rows[0]["appointment_time"] == "2031-03-11T10:00:00"
+
+
+@pytest.mark.asyncio
+async def test_export_schedules_ndjson(admin_client, booked_days):
+    res = await admin_client.get(
+        "/admin/barbers/schedules/export",
+        params={"format": "ndjson", "start_date": DAY.isoformat(), "barber_id": 1},
+    )
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in res.text.splitlines()]
+    assert [row["date"] for row in rows] == ["2031-03-10", "2031-03-11", "2031-03-12"]
+    assert rows[0]["start_time"] == "10:00:00"
+    assert rows[0]["is_active"] is False
+
+
+@pytest.mark.asyncio
+async def test_export_reviews_csv_quotes_comments(admin_client, booked_days):
+    res = await admin_client.get(
+        "/admin/reviews/export",
+        params={"start_date": DAY.isoformat(), "end_date": DAY.isoformat()},
+    )
+
+    assert res.status_code == 200
+    (row,) = list(csv.DictReader(io.StringIO(res.text)))
+    assert row["comment"] == 'Good, "quoted", cut'
+    assert row["rating"] == "4"
+
+
+@pytest.mark.asyncio
+async def test_export_rejects_inverted_range(admin_client):
+    res = await admin_client.get(
+        "/admin/appointments/export",
+        params={"start_date": "2031-03-12", "end_date": "2031-03-10"},
+    )
+
+    assert res.status_code == 400
+    assert "start_date" in res.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_export_is_admin_only(authorized_client):
+    for url in [
+        "/admin/appointments/export",
+        "/admin/barbers/schedules/export",
+        "/admin/reviews/export",
+    ]:
+        res = await authorized_client.get(url)
+        assert res.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_stream_rows_yields_one_chunk_per_batch(
+    db_session_with_rollback, booked_days
+):
+    query = (
+        select(Appointment.id, Appointment.client_name)
+        .where(Appointment.appointment_time >= datetime.combine(DAY, time.min))
+        .order_by(Appointment.id)
+    )
+
+    chunks = [
+        chunk async for chunk in stream_rows(db_session_with_rollback, query, "csv", 2)
+    ]
+
+    assert chunks[0] == "id,client_name\r\n"
+    assert [chunk.count("\r\n") for chunk in chunks[1:]] == [2, 1]
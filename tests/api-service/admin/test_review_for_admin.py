@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, patch
 import pytest
 import pytest_asyncio
 
+from app.models.barber_rating_stats import BarberRatingStats
 from app.models.review import Review
 
 
@@ -45,18 +46,28 @@ async def test_admin_list_reviews(admin_client, two_reviews):
 
 
 @pytest.mark.asyncio
-@patch("app.services.admin.reviews.get_barber_rating", new_callable=AsyncMock)
-@patch("app.services.admin.reviews.save_barber_rating", new_callable=AsyncMock)
+async def test_admin_list_reviews_is_paged_newest_first(admin_client, two_reviews):
+    res = await admin_client.get("/admin/reviews/?limit=1")
+    assert res.status_code == 200
+    assert [r["id"] for r in res.json()] == [two_reviews["unapproved"].id]
+    cursor = res.headers["X-Next-Cursor"]
+
+    res = await admin_client.get(
+        "/admin/reviews/", params={"limit": 1, "cursor": cursor}
+    )
+    assert [r["id"] for r in res.json()] == [two_reviews["approved"].id]
+
+
+@pytest.mark.asyncio
+@patch("app.services.admin.reviews.delete_barber_rating", new_callable=AsyncMock)
 async def test_admin_approve_review_success(
-    mock_save_rating,
-    mock_get_rating,
+    mock_delete_rating,
     admin_client,
     two_reviews,
+    db_session_with_rollback,
 ):
     review = two_reviews["unapproved"]
 
-    mock_get_rating.return_value = (4.0, 2)
-
     res = await admin_client.post(f"/admin/reviews/{review.id}/approve")
 
     assert res.status_code == 200
@@ -64,8 +75,9 @@ async def test_admin_approve_review_success(
     assert data["id"] == review.id
     assert data["is_approved"] is True
 
-    mock_get_rating.assert_called_once_with(review.barber_id)
-    mock_save_rating.assert_called_once()
+    stats = await db_session_with_rollback.get(BarberRatingStats, review.barber_id)
+    assert (stats.rating_sum, stats.rating_count) == (8, 2)
+    mock_delete_rating.assert_called_once_with(review.barber_id)
 
 
 @pytest.mark.asyncio
@@ -87,16 +99,18 @@ async def test_admin_approve_nonexistent_review(admin_client):
 
 
 @pytest.mark.asyncio
-@patch("app.services.admin.reviews.get_barber_rating", new_callable=AsyncMock)
-@patch("app.services.admin.reviews.save_barber_rating", new_callable=AsyncMock)
+@patch("app.services.admin.reviews.delete_barber_rating", new_callable=AsyncMock)
 async def test_admin_delete_approved_review(
-    mock_save_rating,
-    mock_get_rating,
+    mock_delete_rating,
     admin_client,
     two_reviews,
+    db_session_with_rollback,
 ):
     review = two_reviews["approved"]
-    mock_get_rating.return_value = (4.5, 3)
+    db_session_with_rollback.add(
+        BarberRatingStats(barber_id=review.barber_id, rating_sum=9, rating_count=2)
+    )
+    await db_session_with_rollback.commit()
 
     res = await admin_client.delete(f"/admin/reviews/{review.id}")
 
@@ -104,8 +118,10 @@ async def test_admin_delete_approved_review(
     data = res.json()
     assert data["detail"] == "Review deleted"
 
-    mock_get_rating.assert_called_once_with(review.barber_id)
-    mock_save_rating.assert_called_once()
+    stats = await db_session_with_rollback.get(BarberRatingStats, review.barber_id)
+    await db_session_with_rollback.refresh(stats)
+    assert (stats.rating_sum, stats.rating_count) == (4, 1)
+    mock_delete_rating.assert_called_once_with(review.barber_id)
 
 
 @pytest.mark.asyncio
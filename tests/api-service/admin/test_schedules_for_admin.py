@@ -248,3 +248,37 @@ async def test_non_admin_cannot_access_schedule_endpoints(
 
     await check_schedule_access_denied(authorized_client)
     await check_schedule_access_denied(barber_client)
+
+
+@pytest.mark.asyncio
+async def test_admin_can_bulk_create_schedules(admin_client):
+    day = (date.today() + timedelta(days=2)).isoformat()
+    payload = {
+        "barber_id": 1,
+        "slots": [
+            {"date": day, "start_time": "10:00", "end_time": "11:00"},
+            {"date": day, "start_time": "11:00", "end_time": "12:00"},
+        ],
+    }
+    response = await admin_client.post("/admin/barbers/schedules/bulk", json=payload)
+    assert response.status_code == 201, response.text
+    data = response.json()
+    assert data["created"] == 2
+    assert data["rejected"] == 0
+    assert all(result["accepted"] for result in data["results"])
+
+
+@pytest.mark.asyncio
+async def test_admin_bulk_create_schedules_for_missing_barber(admin_client):
+    payload = {
+        "barber_id": 9999,
+        "slots": [
+            {
+                "date": (date.today() + timedelta(days=2)).isoformat(),
+                "start_time": "10:00",
+                "end_time": "11:00",
+            }
+        ],
+    }
+    response = await admin_client.post("/admin/barbers/schedules/bulk", json=payload)
+    assert response.status_code == 404
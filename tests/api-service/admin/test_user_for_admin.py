@@ -1,5 +1,6 @@
 import pytest
 
+from app.core.config import settings
 from app.models.enums import RoleEnum
 
 
@@ -206,3 +207,35 @@ async def test_non_admin_cannot_access_admin_endpoints(
 
     await check_non_admin_access(authorized_client)
     await check_non_admin_access(barber_client)
+
+
+@pytest.mark.asyncio
+async def test_admin_can_page_users_with_cursor(admin_client):
+    first = await admin_client.get("/admin/users/?limit=2")
+    assert first.status_code == 200
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = await admin_client.get(
+        "/admin/users/", params={"limit": 2, "cursor": cursor}
+    )
+    offset = await admin_client.get("/admin/users/?limit=2&skip=2")
+
+    assert second.json() == offset.json()
+    assert {u["id"] for u in first.json()}.isdisjoint(u["id"] for u in second.json())
+
+
+@pytest.mark.asyncio
+async def test_admin_password_hash_report(admin_client, authorized_client):
+    response = await admin_client.get("/admin/users/password-hashes")
+    assert response.status_code == 200
+    report = response.json()
+    assert report["target_rounds"] == settings.BCRYPT_ROUNDS
+    assert report["total"] == sum(s["count"] for s in report["schemes"])
+    for scheme in report["schemes"]:
+        if scheme["scheme"] == "bcrypt":
+            assert scheme["needs_update"] == (
+                scheme["rounds"] != settings.BCRYPT_ROUNDS
+            )
+
+    denied = await authorized_client.get("/admin/users/password-hashes")
+    assert denied.status_code == 403
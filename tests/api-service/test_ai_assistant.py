@@ -1,6 +1,17 @@
-from unittest.mock import patch
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from httpx import ASGITransport, AsyncClient
+from openai import AsyncOpenAI
+
+from app.api.routes.ai_assistant import ask_ai_stream
+from app.schemas.ai_assistant import QuestionIn
+from app.services import ai_assistant_service, ai_prompt
+from app.utils import ai_answer_cache
+from app.utils.ai_answer_cache import get_cached_answer, save_answer
+from benchmarks.stub_model_server import ANSWER, create_app
 
 
 def fake_create(*args, **kwargs):
@@ -23,18 +34,415 @@ async def fake_load_barbershop_info():
     }
 
 
+class FakeRedis:
+    """Just enough of the Redis API for the answer cache."""
+
+    def __init__(self):
+        self.values = {}
+        self.lists = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def lrange(self, key, start, end):
+        return self.lists.get(key, [])[start : end + 1]
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class Pipeline:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def set(self, key, value, ex=None):
+                redis.values[key] = value
+
+            def lrem(self, key, count, value):
+                redis.lists[key] = [v for v in redis.lists.get(key, []) if v != value]
+
+            def lpush(self, key, value):
+                redis.lists.setdefault(key, []).insert(0, value)
+
+            def ltrim(self, key, start, end):
+                redis.lists[key] = redis.lists.get(key, [])[start : end + 1]
+
+            def expire(self, key, ttl):
+                pass
+
+            async def execute(self):
+                return []
+
+        return Pipeline()
+
+
+@pytest.fixture(autouse=True)
+def fresh_prompt_context(monkeypatch):
+    monkeypatch.setattr(ai_prompt, "_context", None)
+    monkeypatch.setattr(ai_prompt, "_loaded_at", 0.0)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(ai_answer_cache, "redis_client", redis)
+    return redis
+
+
 @pytest.mark.asyncio
 @patch(
     "app.services.ai_assistant_service.client.chat.completions.create",
+    new_callable=AsyncMock,
     side_effect=fake_create,
 )
 @patch(
-    "app.services.ai_assistant_service.load_barbershop_info",
+    "app.services.ai_prompt.load_barbershop_info",
     side_effect=fake_load_barbershop_info,
 )
-async def test_ask_ai_success(mock_load_info, mock_create, client):
+async def test_ask_ai_success(mock_load_info, mock_create, client, fake_redis):
     response = await client.post("/ai-assistant/ask", json={"question": "How are you?"})
     assert response.status_code == 200
     assert response.json() == {"answer": "Mocked response"}
     mock_load_info.assert_awaited_once()
     mock_create.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.ai_assistant_service.client.chat.completions.create",
+    new_callable=AsyncMock,
+    side_effect=fake_create,
+)
+@patch(
+    "app.services.ai_prompt.load_barbershop_info",
+    side_effect=fake_load_barbershop_info,
+)
+async def test_faq_question_skips_the_model(mock_load_info, mock_create, client):
+    response = await client.post(
+        "/ai-assistant/ask", json={"question": "What are your opening hours?"}
+    )
+
+    assert response.json() == {"answer": "We're open 9am - 6pm."}
+    mock_create.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.ai_assistant_service.client.chat.completions.create",
+    new_callable=AsyncMock,
+    side_effect=fake_create,
+)
+@patch(
+    "app.services.ai_prompt.load_barbershop_info",
+    side_effect=fake_load_barbershop_info,
+)
+async def test_repeated_question_is_answered_from_cache(
+    mock_load_info, mock_create, client, fake_redis
+):
+    for question in [
+        "Do you cut kids' hair?",
+        "do you cut kids hair",
+        "DO YOU CUT KIDS HAIR!",
+    ]:
+        response = await client.post("/ai-assistant/ask", json={"question": question})
+        assert response.json() == {"answer": "Mocked response"}
+
+    mock_create.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.ai_assistant_service.get_cached_answer",
+    new_callable=AsyncMock,
+    return_value=None,
+)
+@patch(
+    "app.services.ai_assistant_service.client.chat.completions.create",
+    new_callable=AsyncMock,
+    side_effect=fake_create,
+)
+@patch(
+    "app.services.ai_prompt.load_barbershop_info",
+    side_effect=fake_load_barbershop_info,
+)
+async def test_faq_can_be_disabled(
+    mock_load_info, mock_create, mock_cache, client, monkeypatch, fake_redis
+):
+    monkeypatch.setattr(ai_assistant_service.settings, "AI_FAQ_ENABLED", False)
+
+    response = await client.post(
+        "/ai-assistant/ask", json={"question": "What are your opening hours?"}
+    )
+
+    assert response.json() == {"answer": "Mocked response"}
+    mock_create.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_similar_question_reuses_answer(fake_redis):
+    question = "do you cut kids hair on weekends"
+    await save_answer("v1", question, "Yes!", 1.5)
+
+    assert await get_cached_answer("v1", question) == (
+        {"answer": "Yes!", "latency": 1.5},
+        True,
+    )
+    assert await get_cached_answer("v1", "do you cut kids hair on weekend") == (
+        {"answer": "Yes!", "latency": 1.5},
+        False,
+    )
+    assert await get_cached_answer("v1", "do you dye kids hair on weekends") is None
+    # A new shop info version does not see old answers.
+    assert await get_cached_answer("v2", question) is None
+
+
+@pytest.mark.asyncio
+async def test_similarity_lookup_can_be_disabled(fake_redis, monkeypatch):
+    monkeypatch.setattr(ai_answer_cache.settings, "AI_ANSWER_CACHE_SIMILARITY", 0)
+    await save_answer("v1", "do you cut kids hair on weekends", "Yes!", 1.5)
+
+    assert await get_cached_answer("v1", "do you cut kids hair on weekend") is None
+    assert json.loads(next(iter(fake_redis.values.values())))["answer"] == "Yes!"
+
+
+class EmptyStream:
+    """A streamed completion that ends without any content."""
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+    async def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.ai_prompt.load_barbershop_info",
+    side_effect=fake_load_barbershop_info,
+)
+async def test_empty_answers_are_not_cached(mock_load_info, fake_redis):
+    create = AsyncMock(return_value=fake_create())
+    create.return_value.choices[0].message = Mock(content="")
+    with patch.object(ai_assistant_service.client.chat.completions, "create", create):
+        assert await ai_assistant_service.ask_barber_ai("Do you cut kids hair?") == ""
+
+        create.return_value = EmptyStream()
+        deltas = await ai_assistant_service.stream_barber_ai("Do you cut kids hair?")
+        assert [delta async for delta in deltas] == []
+
+    assert create.await_count == 2
+    assert fake_redis.values == {}
+
+
+@pytest.fixture
+def stub_model(monkeypatch):
+    """Route the assistant's model calls to the in-process stub server."""
+    stub = create_app(first_token=0, token_delay=0)
+    http_client = AsyncClient(transport=ASGITransport(app=stub))
+    monkeypatch.setattr(
+        ai_assistant_service,
+        "client",
+        AsyncOpenAI(api_key="stub", base_url="http://stub/v1", http_client=http_client),
+    )
+    monkeypatch.setattr(ai_prompt, "load_barbershop_info", fake_load_barbershop_info)
+    return stub
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines.get("event", "message"), json.loads(lines["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_ask_uses_async_client(client, stub_model, fake_redis):
+    response = await client.post(
+        "/ai-assistant/ask", json={"question": "Do you cut kids hair?"}
+    )
+
+    assert response.json() == {"answer": ANSWER}
+    assert stub_model.state.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_deltas_then_done(client, stub_model, fake_redis):
+    response = await client.post(
+        "/ai-assistant/ask/stream", json={"question": "Do you cut kids hair?"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    assert events[-1] == ("done", {})
+    deltas = [data["delta"] for event, data in events[:-1]]
+    assert len(deltas) > 1
+    assert "".join(deltas).strip() == ANSWER
+    # The streamed answer is cached like a plain one.
+    assert await get_cached_answer(
+        ai_answer_cache.shop_info_fingerprint(await fake_load_barbershop_info()),
+        "do you cut kids hair",
+    )
+    assert (
+        ai_assistant_service._model_slots._value
+        == ai_assistant_service.settings.AI_MAX_CONCURRENCY
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_faq_answer_is_one_event(client, stub_model):
+    response = await client.post(
+        "/ai-assistant/ask/stream", json={"question": "Where are you located?"}
+    )
+
+    assert _events(response.text) == [
+        ("message", {"delta": "You can find us at 123 Main St."}),
+        ("done", {}),
+    ]
+    assert stub_model.state.requests == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/ai-assistant/ask", "/ai-assistant/ask/stream"])
+async def test_busy_assistant_returns_503(
+    client, stub_model, fake_redis, monkeypatch, path
+):
+    monkeypatch.setattr(ai_assistant_service, "_model_slots", asyncio.Semaphore(0))
+    monkeypatch.setattr(ai_assistant_service.settings, "AI_QUEUE_TIMEOUT", 0.01)
+
+    response = await client.post(path, json={"question": "Do you cut kids hair?"})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert stub_model.state.requests == 0
+
+
+class ClosableStream(EmptyStream):
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_unstarted_stream_releases_model_slot(fake_redis, monkeypatch):
+    monkeypatch.setattr(ai_prompt, "load_barbershop_info", fake_load_barbershop_info)
+    stream = ClosableStream()
+    create = AsyncMock(return_value=stream)
+    with patch.object(ai_assistant_service.client.chat.completions, "create", create):
+        deltas = await ai_assistant_service.stream_barber_ai("Do you cut kids hair?")
+
+    slots = ai_assistant_service._model_slots
+    assert slots._value == ai_assistant_service.settings.AI_MAX_CONCURRENCY - 1
+
+    await deltas.aclose()
+
+    assert slots._value == ai_assistant_service.settings.AI_MAX_CONCURRENCY
+    assert stream.closed
+
+
+@pytest.mark.asyncio
+async def test_disconnect_before_first_chunk_releases_model_slot(
+    fake_redis, monkeypatch
+):
+    monkeypatch.setattr(ai_prompt, "load_barbershop_info", fake_load_barbershop_info)
+    stream = ClosableStream()
+    create = AsyncMock(return_value=stream)
+    with patch.object(ai_assistant_service.client.chat.completions, "create", create):
+        response = await ask_ai_stream(QuestionIn(question="Do you cut kids hair?"))
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    send = AsyncMock()
+    await response({"type": "http"}, receive, send)
+
+    assert (
+        ai_assistant_service._model_slots._value
+        == ai_assistant_service.settings.AI_MAX_CONCURRENCY
+    )
+    assert stream.closed
+
+
+@pytest.mark.asyncio
+async def test_prompt_is_built_once_per_shop_info_version(monkeypatch):
+    shop_info = await fake_load_barbershop_info()
+    load = AsyncMock(side_effect=lambda: dict(shop_info))
+    monkeypatch.setattr(ai_prompt, "load_barbershop_info", load)
+
+    first = await ai_prompt.get_prompt_context()
+    assert await ai_prompt.get_prompt_context() is first
+    load.assert_awaited_once()
+
+    # Reloaded, but the content is the same: the compiled prompt is reused.
+    ai_prompt.invalidate_prompt_context()
+    assert await ai_prompt.get_prompt_context() is first
+    assert load.await_count == 2
+
+    shop_info["working_hours"] = "10am - 8pm"
+    ai_prompt.invalidate_prompt_context()
+    second = await ai_prompt.get_prompt_context()
+    assert second.fingerprint != first.fingerprint
+    assert "10am - 8pm" in second.system_message["content"]
+
+
+@pytest.mark.asyncio
+async def test_prompt_is_reloaded_after_refresh_interval(monkeypatch):
+    load = AsyncMock(side_effect=fake_load_barbershop_info)
+    monkeypatch.setattr(ai_prompt, "load_barbershop_info", load)
+    monkeypatch.setattr(ai_prompt.settings, "AI_PROMPT_REFRESH", 0)
+
+    await ai_prompt.get_prompt_context()
+    await ai_prompt.get_prompt_context()
+
+    assert load.await_count == 2
+
+
+def test_system_prompt_prefix_does_not_depend_on_shop_info():
+    a = ai_prompt.build_system_prompt({"address": "1 First St"})
+    b = ai_prompt.build_system_prompt({"address": "2 Second Ave"})
+
+    assert a.startswith(ai_prompt.PROMPT_INSTRUCTIONS)
+    assert b.startswith(ai_prompt.PROMPT_INSTRUCTIONS)
+    assert "Do not give personal info" in ai_prompt.PROMPT_INSTRUCTIONS
+
+
+@pytest.mark.asyncio
+async def test_update_message_invalidates_prompt(monkeypatch):
+    class FakePubSub:
+        def __init__(self):
+            self.channels = []
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def subscribe(self, channel):
+            self.channels.append(channel)
+
+        async def listen(self):
+            yield {"type": "subscribe", "data": 1}
+            yield {"type": "message", "data": "abc123"}
+            await asyncio.Event().wait()
+
+    pubsub = FakePubSub()
+    monkeypatch.setattr(ai_prompt.redis_client, "pubsub", lambda: pubsub)
+    invalidate = Mock()
+    monkeypatch.setattr(ai_prompt, "invalidate_prompt_context", invalidate)
+
+    listener = asyncio.create_task(ai_prompt.listen_for_shop_info_updates())
+    await asyncio.sleep(0.01)
+    listener.cancel()
+
+    assert pubsub.channels == [ai_prompt.BARBERSHOP_INFO_CHANNEL]
+    # Once on subscribing, once for the message.
+    assert invalidate.call_count == 2
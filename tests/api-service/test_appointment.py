@@ -1,10 +1,15 @@
-from datetime import date, time, timedelta
+from datetime import date, datetime, time, timedelta
 from unittest.mock import AsyncMock, patch
 
 import pytest
 import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import select
 
+from app.models.appointment_reminder import AppointmentReminder
 from app.models.barberschedule import BarberSchedule
+from app.schemas.appointment import AppointmentCreate
+from app.services.appointment_service import create_appointment_service
 
 
 @pytest_asyncio.fixture
@@ -22,14 +27,21 @@ async def barber_schedule(db_session_with_rollback):
     return schedule
 
 
+async def _reminder(db, appointment_id: int) -> AppointmentReminder | None:
+    return await db.scalar(
+        select(AppointmentReminder).where(
+            AppointmentReminder.appointment_id == appointment_id
+        )
+    )
+
+
 @pytest.mark.asyncio
 @patch("app.services.appointment_service.send_sms_task.delay")
-@patch("app.services.appointment_service.send_sms_task.apply_async")
 async def test_create_appointment_success_authorized_client(
-    mock_remind_sms,
     mock_send_sms,
     barber_schedule,
     authorized_client,
+    db_session_with_rollback,
 ):
     res = await authorized_client.post(
         "/appointments/",
@@ -44,17 +56,19 @@ async def test_create_appointment_success_authorized_client(
     assert data["schedule_id"] == barber_schedule.id
 
     mock_send_sms.assert_called_once()
-    mock_remind_sms.assert_called_once()
+    reminder = await _reminder(db_session_with_rollback, data["id"])
+    assert reminder.send_at == datetime.combine(
+        barber_schedule.date, barber_schedule.start_time
+    ) - timedelta(hours=2)
 
 
 @pytest.mark.asyncio
 @patch("app.services.appointment_service.send_sms_task.delay")
-@patch("app.services.appointment_service.send_sms_task.apply_async")
 async def test_create_appointment_success_anonymous_client(
-    mock_remind_sms,
     mock_send_sms,
     barber_schedule,
     client,
+    db_session_with_rollback,
 ):
     res = await client.post(
         "/appointments/",
@@ -71,14 +85,12 @@ async def test_create_appointment_success_anonymous_client(
     assert data["schedule_id"] == barber_schedule.id
 
     mock_send_sms.assert_called_once()
-    mock_remind_sms.assert_called_once()
+    assert await _reminder(db_session_with_rollback, data["id"]) is not None
 
 
 @pytest.mark.asyncio
 @patch("app.services.appointment_service.send_sms_task.delay")
-@patch("app.services.appointment_service.send_sms_task.apply_async")
 async def test_create_appointment_fail_anonymous_missing_name_phone(
-    mock_remind_sms,
     mock_send_sms,
     barber_schedule,
     client,
@@ -94,16 +106,52 @@ async def test_create_appointment_fail_anonymous_missing_name_phone(
     assert res.json()["detail"] == "Name and phone required for anonymous booking"
 
     mock_send_sms.assert_not_called()
-    mock_remind_sms.assert_not_called()
 
 
 @pytest.mark.asyncio
-@patch("app.services.appointment_service.send_sms_task.delay", new_callable=AsyncMock)
 @patch(
-    "app.services.appointment_service.send_sms_task.apply_async", new_callable=AsyncMock
+    "app.services.appointment_service.invalidate_response_cache", new_callable=AsyncMock
 )
+@patch("app.services.appointment_service.send_sms_task.delay")
+async def test_create_appointment_rejects_other_barbers_slot(
+    mock_send_sms, mock_invalidate, race_sessionmaker
+):
+    async with race_sessionmaker() as db:
+        schedule = BarberSchedule(
+            barber_id=1,
+            date=date.today() + timedelta(days=1),
+            start_time=time(10, 0),
+            end_time=time(11, 0),
+            is_active=True,
+        )
+        db.add(schedule)
+        await db.commit()
+
+    def booking(barber_id: int) -> AppointmentCreate:
+        return AppointmentCreate(
+            barber_id=barber_id,
+            schedule_id=schedule.id,
+            client_name="client",
+            client_phone="+15550000000",
+        )
+
+    async with race_sessionmaker() as db:
+        with pytest.raises(HTTPException) as exc:
+            await create_appointment_service(db, booking(2), current_user=None)
+    assert exc.value.status_code == 400
+    mock_send_sms.assert_not_called()
+
+    # The claim was rolled back: the slot's own barber can still be booked.
+    async with race_sessionmaker() as db:
+        appointment = await create_appointment_service(
+            db, booking(1), current_user=None
+        )
+    assert appointment.barber_id == 1
+
+
+@pytest.mark.asyncio
+@patch("app.services.appointment_service.send_sms_task.delay", new_callable=AsyncMock)
 async def test_get_my_appointments(
-    mock_apply_async,
     mock_delay,
     barber_schedule,
     authorized_client,
@@ -122,15 +170,19 @@ async def test_get_my_appointments(
 
 
 @pytest.mark.asyncio
-@patch("app.services.appointment_service.get_rating_for_barber", new_callable=AsyncMock)
-async def test_get_barbers(mock_get_rating, client):
-    mock_get_rating.return_value = (4.5, 10)
+@patch(
+    "app.services.appointment_service.get_ratings_for_barbers", new_callable=AsyncMock
+)
+async def test_get_barbers(mock_get_ratings, client):
+    mock_get_ratings.side_effect = lambda db, ids: {i: (4.5, 10) for i in ids}
     res = await client.get("/appointments/barbers")
     assert res.status_code == 200
     data = res.json()
     assert isinstance(data, list)
     assert "avg_rating" in data[0]
     assert data[0]["reviews_count"] == 10
+    assert "avatar_variants" in data[0]
+    mock_get_ratings.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -142,12 +194,15 @@ async def test_get_barber_detail(mock_get_rating, client):
     data = res.json()
     assert data["id"] == 1
     assert "reviews" in data
+    assert "avatar_variants" in data
 
 
 @pytest.mark.asyncio
-@patch("app.services.appointment_service.get_rating_for_barber", new_callable=AsyncMock)
-async def test_get_available_slots(mock_get_rating, barber_schedule, client):
-    mock_get_rating.return_value = (4.2, 8)
+@patch(
+    "app.services.appointment_service.get_ratings_for_barbers", new_callable=AsyncMock
+)
+async def test_get_available_slots(mock_get_ratings, barber_schedule, client):
+    mock_get_ratings.side_effect = lambda db, ids: {i: (4.2, 8) for i in ids}
 
     res = await client.get("/appointments/available-slots")
     assert res.status_code == 200
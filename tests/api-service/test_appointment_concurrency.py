@@ -0,0 +1,92 @@
+import asyncio
+from datetime import date, time, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from app.models.appointment import Appointment
+from app.models.barberschedule import BarberSchedule
+from app.schemas.appointment import AppointmentCreate
+from app.services.appointment_service import create_appointment_service
+
+CONCURRENT_BOOKINGS = 200
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.appointment_service.invalidate_response_cache", new_callable=AsyncMock
+)
+@patch("app.services.appointment_service.send_sms_task")
+async def test_parallel_bookings_claim_slot_once(
+    mock_sms, mock_invalidate, race_sessionmaker
+):
+    async with race_sessionmaker() as db:
+        schedule = BarberSchedule(
+            barber_id=1,
+            date=date.today() + timedelta(days=1),
+            start_time=time(10, 0),
+            end_time=time(11, 0),
+            is_active=True,
+        )
+        db.add(schedule)
+        await db.commit()
+        schedule_id = schedule.id
+
+    async def book(i: int):
+        data = AppointmentCreate(
+            barber_id=1,
+            schedule_id=schedule_id,
+            client_name=f"client {i}",
+            client_phone=f"+1555{i:07d}",
+        )
+        async with race_sessionmaker() as db:
+            return await create_appointment_service(db, data, current_user=None)
+
+    results = await asyncio.gather(
+        *(book(i) for i in range(CONCURRENT_BOOKINGS)), return_exceptions=True
+    )
+
+    booked = [r for r in results if isinstance(r, Appointment)]
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(booked) == 1
+    assert len(rejected) == CONCURRENT_BOOKINGS - 1
+    assert all(r.status_code == 400 for r in rejected)
+
+    async with race_sessionmaker() as db:
+        count = await db.scalar(
+            select(func.count(Appointment.id)).where(
+                Appointment.schedule_id == schedule_id
+            )
+        )
+        schedule = await db.get(BarberSchedule, schedule_id)
+    assert count == 1
+    assert schedule.is_active is False
+    mock_sms.delay.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_appointment_schedule_id_is_unique(db_session_with_rollback):
+    schedule = BarberSchedule(
+        barber_id=1,
+        date=date.today() + timedelta(days=1),
+        start_time=time(10, 0),
+        end_time=time(11, 0),
+        is_active=False,
+    )
+    db_session_with_rollback.add(schedule)
+    await db_session_with_rollback.flush()
+    for name in ("first", "second"):
+        db_session_with_rollback.add(
+            Appointment(
+                barber_id=1,
+                client_name=name,
+                client_phone="+15550000000",
+                schedule_id=schedule.id,
+            )
+        )
+
+    with pytest.raises(IntegrityError):
+        await db_session_with_rollback.flush()
@@ -0,0 +1,92 @@
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from PIL import Image
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.barber import Barber
+from app.services.avatar_service import IMMUTABLE_CACHE_CONTROL, create_avatar_variants
+from app.utils.avatars import avatar_variant_key
+
+
+def _png() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (300, 200), "blue").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _variant_keys(s3_bucket) -> set[str]:
+    listing = s3_bucket.list_objects_v2(Bucket="test-bucket", Prefix="avatars/")
+    return {obj["Key"] for obj in listing.get("Contents", [])}
+
+
+@pytest.mark.asyncio
+async def test_avatar_upload_stores_content_addressed_variants(
+    barber_client, s3_bucket, db_session_with_rollback
+):
+    files = {"file": ("avatar.png", _png(), "image/png")}
+    res = await barber_client.post("/barber/avatar", files=files)
+
+    assert res.status_code == 200, res.text
+    barber = await db_session_with_rollback.scalar(select(Barber).where(Barber.id == 1))
+    key = avatar_variant_key(barber.avatar_hash, 512, "webp")
+    assert res.json()["avatar_variants"]["512"]["webp"].endswith(key)
+    assert len(_variant_keys(s3_bucket)) == 6
+
+    stored = s3_bucket.get_object(Bucket="test-bucket", Key=key)
+    assert stored["ContentType"] == "image/webp"
+    assert stored["CacheControl"] == IMMUTABLE_CACHE_CONTROL
+
+    # Uploading the same image again reuses the existing variants.
+    res = await barber_client.post("/barber/avatar", files=files)
+    assert res.status_code == 200, res.text
+    assert len(_variant_keys(s3_bucket)) == 6
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data, status", [(b"x" * 11, 413), (b"fake", 400)])
+async def test_spooled_upload_is_removed_when_rejected(
+    s3_bucket, db_session_with_rollback, tmp_path, monkeypatch, data, status
+):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    monkeypatch.setattr(settings, "AVATAR_MAX_BYTES", 10)
+    # No declared size, so only spooling can notice the upload is too large.
+    file = UploadFile(io.BytesIO(data), filename="avatar.png")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await create_avatar_variants(db_session_with_rollback, file)
+
+    assert exc_info.value.status_code == status
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_non_image_upload_is_rejected(barber_client, s3_bucket):
+    files = {"file": ("avatar.jpg", b"fake image data", "image/jpeg")}
+    res = await barber_client.post("/barber/avatar", files=files)
+
+    assert res.status_code == 400
+    assert res.json()["detail"] == "Invalid image file"
+    assert s3_bucket.list_objects_v2(Bucket="test-bucket")["KeyCount"] == 0
+
+
+@pytest.mark.asyncio
+async def test_upload_with_gps_exif_stores_only_stripped_variants(
+    barber_client, s3_bucket
+):
+    exif = Image.Exif()
+    exif[0x8825] = {2: (50.0, 27.0, 0.0)}  # GPSInfo: latitude
+    buffer = io.BytesIO()
+    Image.new("RGB", (300, 200), "blue").save(buffer, "JPEG", exif=exif)
+    files = {"file": ("avatar.jpg", buffer.getvalue(), "image/jpeg")}
+
+    res = await barber_client.post("/barber/avatar", files=files)
+
+    assert res.status_code == 200, res.text
+    listing = s3_bucket.list_objects_v2(Bucket="test-bucket")
+    assert all(obj["Key"].startswith("avatars/") for obj in listing["Contents"])
+    key = "/".join(res.json()["avatar_url"].split("/")[-3:])
+    body = s3_bucket.get_object(Bucket="test-bucket", Key=key)["Body"].read()
+    assert not Image.open(io.BytesIO(body)).getexif()
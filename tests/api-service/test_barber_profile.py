@@ -2,6 +2,8 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from app.core.config import settings
+
 
 @pytest.mark.asyncio
 async def test_get_my_barber_profile(barber_client):
@@ -43,37 +45,39 @@ async def test_update_barber_full_name_invalid_chars(barber_client):
     )
 
 
-@patch("app.services.barber_service.upload_file_to_s3", new_callable=AsyncMock)
-@patch("app.services.barber_service.delete_file_from_s3", new_callable=AsyncMock)
+@patch(
+    "app.services.barber_service.create_avatar_variants",
+    new_callable=AsyncMock,
+    return_value="ab" * 32,
+)
 @pytest.mark.asyncio
-async def test_upload_barber_avatar(
-    mock_delete_file_from_s3, mock_upload_file_to_s3, barber_client
-):
-    mock_upload_file_to_s3.return_value = (
-        "https://mock-bucket.s3.amazonaws.com/barbers/avatar.jpg"
-    )
-    mock_delete_file_from_s3.return_value = None
-
+async def test_upload_barber_avatar(mock_create_avatar_variants, barber_client):
     files = {"file": ("avatar.jpg", b"fake image data", "image/jpeg")}
     res = await barber_client.post("/barber/avatar", files=files)
 
     assert res.status_code == 200, res.text
     data = res.json()
-    assert "avatar_url" in data
-    assert data["avatar_url"].startswith("https://mock-bucket")
+    # The public avatar is a re-encoded variant, never the upload itself.
+    assert data["avatar_url"] == data["avatar_variants"]["512"]["jpeg"]
+    assert set(data["avatar_variants"]) == {"64", "256", "512"}
 
 
-@patch("app.services.barber_service.upload_file_to_s3", new_callable=AsyncMock)
-@patch("app.services.barber_service.delete_file_from_s3", new_callable=AsyncMock)
 @pytest.mark.asyncio
-async def test_delete_barber_avatar(
-    mock_delete_file_from_s3, mock_upload_file_to_s3, barber_client
-):
-    mock_upload_file_to_s3.return_value = (
-        "https://mock-bucket.s3.amazonaws.com/barbers/avatar.jpg"
-    )
-    mock_delete_file_from_s3.return_value = None
-
+async def test_delete_barber_avatar(barber_client):
     res = await barber_client.delete("/barber/avatar")
     assert res.status_code == 200
     assert res.json() == {"detail": "Avatar deleted"}
+
+
+@patch("app.services.barber_service.create_avatar_variants", new_callable=AsyncMock)
+@pytest.mark.asyncio
+async def test_upload_barber_avatar_too_large(
+    mock_create_avatar_variants, barber_client, monkeypatch
+):
+    monkeypatch.setattr(settings, "AVATAR_MAX_BYTES", 10)
+
+    files = {"file": ("avatar.jpg", b"x" * 11, "image/jpeg")}
+    res = await barber_client.post("/barber/avatar", files=files)
+
+    assert res.status_code == 413
+    mock_create_avatar_variants.assert_not_called()
@@ -0,0 +1,122 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.db.backfill_rating_stats import rebuild_rating_stats
+from app.models.barber_rating_stats import BarberRatingStats
+from app.models.review import Review
+from app.services import barber_rating
+from app.services.admin.reviews import approve_review_service
+from app.services.barber_rating import (
+    apply_rating_change,
+    get_rating_for_barber,
+    get_ratings_for_barbers,
+)
+from app.utils.redis_client import barber_rating_cache
+from app.utils.selectors.reviews import get_barber_rating_from_db
+
+
+@pytest.mark.asyncio
+@patch("app.services.barber_rating.get_barber_ratings_from_db", new_callable=AsyncMock)
+async def test_get_ratings_for_barbers_fills_misses_in_one_query(
+    mock_get_from_db, memory_redis
+):
+    await barber_rating_cache.set("barber_rating:1", [4.5, 10])
+    mock_get_from_db.return_value = {2: (3.0, 1), 3: (0.0, 0)}
+
+    ratings = await get_ratings_for_barbers("db", [1, 2, 3])
+
+    assert ratings == {1: (4.5, 10), 2: (3.0, 1), 3: (0.0, 0)}
+    mock_get_from_db.assert_awaited_once_with("db", [2, 3])
+
+
+@pytest.mark.asyncio
+@patch("app.services.barber_rating.get_barber_ratings_from_db", new_callable=AsyncMock)
+async def test_get_ratings_for_barbers_all_cached(mock_get_from_db, memory_redis):
+    await barber_rating_cache.set("barber_rating:1", [4.5, 10])
+    await barber_rating_cache.set("barber_rating:2", [5.0, 1])
+
+    ratings = await get_ratings_for_barbers("db", [1, 2])
+
+    assert ratings == {1: (4.5, 10), 2: (5.0, 1)}
+    mock_get_from_db.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("app.services.barber_rating.get_barber_rating_from_db", new_callable=AsyncMock)
+async def test_get_rating_for_barber_computes_once_under_load(
+    mock_get_from_db, memory_redis
+):
+    mock_get_from_db.return_value = (4.0, 3)
+
+    ratings = await asyncio.gather(*(get_rating_for_barber("db", 7) for _ in range(20)))
+
+    assert ratings == [(4.0, 3)] * 20
+    mock_get_from_db.assert_awaited_once_with("db", 7)
+
+
+@pytest.mark.asyncio
+async def test_rebuild_rating_stats(db_session_with_rollback):
+    db_session_with_rollback.add_all(
+        [
+            Review(client_id=4, barber_id=1, rating=5, is_approved=True),
+            Review(client_id=4, barber_id=1, rating=2, is_approved=True),
+            Review(client_id=4, barber_id=1, rating=1, is_approved=False),
+        ]
+    )
+    await db_session_with_rollback.commit()
+
+    assert await rebuild_rating_stats(db_session_with_rollback) == 1
+    assert await get_barber_rating_from_db(db_session_with_rollback, 1) == (3.5, 2)
+
+
+@pytest.mark.asyncio
+@patch("app.services.admin.reviews.invalidate_response_cache", new_callable=AsyncMock)
+@patch("app.services.admin.reviews.delete_barber_rating", new_callable=AsyncMock)
+async def test_concurrent_first_approvals_create_stats_once(
+    mock_delete_rating, mock_invalidate, race_sessionmaker
+):
+    async with race_sessionmaker() as db:
+        reviews = [
+            Review(client_id=4, barber_id=1, rating=rating, is_approved=False)
+            for rating in (5, 2)
+        ]
+        db.add_all(reviews)
+        await db.commit()
+
+    async def approve(review_id: int):
+        async with race_sessionmaker() as db:
+            return await approve_review_service(db, review_id, "1", admin_id=1)
+
+    await asyncio.gather(*(approve(review.id) for review in reviews))
+
+    async with race_sessionmaker() as db:
+        stats = await db.get(BarberRatingStats, 1)
+        assert (stats.rating_sum, stats.rating_count) == (7, 2)
+
+
+@pytest.mark.asyncio
+async def test_first_change_adds_to_stats_inserted_concurrently(
+    db_session_with_rollback, monkeypatch
+):
+    db = db_session_with_rollback
+    db.add(Review(client_id=4, barber_id=1, rating=4, is_approved=True))
+    await db.flush()
+    totals = barber_rating.get_approved_rating_totals
+
+    async def totals_then_concurrent_insert(session, barber_id):
+        result = await totals(session, barber_id)
+        # Another approval created the row between our UPDATE and INSERT.
+        session.add(BarberRatingStats(barber_id=1, rating_sum=5, rating_count=1))
+        await session.flush()
+        return result
+
+    monkeypatch.setattr(
+        barber_rating, "get_approved_rating_totals", totals_then_concurrent_insert
+    )
+
+    await apply_rating_change(db, 1, rating_delta=4, count_delta=1)
+
+    stats = await db.get(BarberRatingStats, 1, populate_existing=True)
+    assert (stats.rating_sum, stats.rating_count) == (9, 2)
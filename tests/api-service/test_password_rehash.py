@@ -0,0 +1,94 @@
+from contextlib import asynccontextmanager
+
+import pytest
+from passlib.hash import bcrypt
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.hash import verify_password
+from app.models import User
+from app.services import user_service
+from app.utils.selectors.user import get_user_by_id
+
+
+async def _set_weak_hash(db, user_id: int, password: str) -> str:
+    weak = bcrypt.using(rounds=4).hash(password)
+    await db.execute(
+        update(User).where(User.id == user_id).values(hashed_password=weak)
+    )
+    await db.flush()
+    return weak
+
+
+@pytest.mark.asyncio
+async def test_login_schedules_rehash_for_outdated_hash(
+    client, db_session_with_rollback, monkeypatch
+):
+    weak = await _set_weak_hash(db_session_with_rollback, 4, "testuser1#")
+    scheduled = []
+    monkeypatch.setattr(
+        user_service,
+        "schedule_password_rehash",
+        lambda *args: scheduled.append(args),
+    )
+
+    response = await client.post(
+        "/users/login",
+        data={"username": "testuser", "password": "testuser1#"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+
+    assert response.status_code == 200
+    assert scheduled == [(4, weak, "testuser1#")]
+
+
+@pytest.mark.asyncio
+async def test_login_does_not_rehash_current_hash(client, monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(
+        user_service,
+        "schedule_password_rehash",
+        lambda *args: scheduled.append(args),
+    )
+
+    response = await client.post(
+        "/users/login",
+        data={"username": "testuser", "password": "testuser1#"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+
+    assert response.status_code == 200
+    assert scheduled == []
+
+
+@pytest.mark.asyncio
+async def test_rehash_password_upgrades_cost(db_session_with_rollback):
+    db = db_session_with_rollback
+    weak = await _set_weak_hash(db, 4, "testuser1#")
+
+    @asynccontextmanager
+    async def session_factory():
+        yield db
+
+    await user_service.rehash_password(4, weak, "testuser1#", session_factory)
+
+    user = await get_user_by_id(db, 4)
+    await db.refresh(user)
+    assert user.hashed_password.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+    assert verify_password("testuser1#", user.hashed_password)
+
+
+@pytest.mark.asyncio
+async def test_rehash_password_skips_changed_password(db_session_with_rollback):
+    db = db_session_with_rollback
+    await _set_weak_hash(db, 4, "newpass1#")
+
+    @asynccontextmanager
+    async def session_factory():
+        yield db
+
+    await user_service.rehash_password(4, "stale-hash", "testuser1#", session_factory)
+
+    user = await get_user_by_id(db, 4)
+    await db.refresh(user)
+    assert user.hashed_password.startswith("$2b$04$")
@@ -0,0 +1,129 @@
+from datetime import date, datetime, time, timedelta
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.appointment import Appointment
+from app.models.appointment_reminder import AppointmentReminder
+from app.models.barberschedule import BarberSchedule
+from app.services.reminder_service import add_reminder, send_due_reminders
+
+
+async def _book(db, start: datetime) -> Appointment:
+    schedule = BarberSchedule(
+        barber_id=1,
+        date=start.date(),
+        start_time=start.time(),
+        end_time=(start + timedelta(hours=1)).time(),
+        is_active=False,
+    )
+    db.add(schedule)
+    await db.flush()
+    appointment = Appointment(
+        client_name="Jane",
+        client_phone=f"+1555{schedule.id:07d}",
+        barber_id=1,
+        appointment_time=start,
+        status="scheduled",
+        schedule_id=schedule.id,
+    )
+    db.add(appointment)
+    add_reminder(db, appointment, now=start - timedelta(days=1))
+    await db.commit()
+    return appointment
+
+
+async def _reminders(db) -> list[AppointmentReminder]:
+    result = await db.scalars(
+        select(AppointmentReminder)
+        .order_by(AppointmentReminder.id)
+        .execution_options(populate_existing=True)
+    )
+    return result.all()
+
+
+@pytest_asyncio.fixture
+async def appointment(db_session_with_rollback):
+    start = datetime.combine(date.today() + timedelta(days=2), time(10, 0))
+    return await _book(db_session_with_rollback, start)
+
+
+def test_add_reminder_skips_send_time_in_the_past():
+    appointment = Appointment(appointment_time=datetime(2030, 1, 1, 10, 0))
+
+    assert add_reminder(None, appointment, now=datetime(2030, 1, 1, 9, 0)) is None
+
+
+@pytest.mark.asyncio
+@patch("app.services.reminder_service.queue_sms")
+async def test_send_due_reminders_sends_only_due_ones(
+    mock_queue, db_session_with_rollback
+):
+    db = db_session_with_rollback
+    now = datetime(2030, 1, 1, 12, 0)
+    due = await _book(db, now + timedelta(minutes=30))
+    later = await _book(db, now + timedelta(days=1))
+    expired = await _book(db, now - timedelta(minutes=5))
+
+    totals = await send_due_reminders(db, now=now)
+
+    assert totals == {"sent": 1, "expired": 1}
+    (messages,) = mock_queue.call_args.args
+    assert [to for to, _ in messages] == [due.client_phone]
+    assert "Tuesday, January 01, 2030 at 12:30 PM" in messages[0][1]
+    remaining = await _reminders(db)
+    assert [r.appointment_id for r in remaining] == [later.id]
+    assert expired.id not in {r.appointment_id for r in remaining}
+
+
+@pytest.mark.asyncio
+@patch("app.services.reminder_service.queue_sms")
+async def test_send_due_reminders_works_in_batches(
+    mock_queue, db_session_with_rollback, monkeypatch
+):
+    db = db_session_with_rollback
+    monkeypatch.setattr(settings, "REMINDER_BATCH_SIZE", 2)
+    now = datetime(2030, 1, 1, 12, 0)
+    for i in range(5):
+        await _book(db, now + timedelta(minutes=10 + i))
+
+    totals = await send_due_reminders(db, now=now)
+
+    assert totals == {"sent": 5, "expired": 0}
+    assert [len(call.args[0]) for call in mock_queue.call_args_list] == [2, 2, 1]
+    assert await _reminders(db) == []
+
+
+@pytest.mark.asyncio
+async def test_deleting_appointment_cancels_reminder(
+    admin_client, appointment, db_session_with_rollback
+):
+    res = await admin_client.delete(f"/admin/appointments/{appointment.id}")
+
+    assert res.status_code == 204
+    assert await _reminders(db_session_with_rollback) == []
+
+
+@pytest.mark.asyncio
+async def test_moving_schedule_reschedules_reminder(
+    admin_client, appointment, db_session_with_rollback
+):
+    new_start = appointment.appointment_time + timedelta(days=1, hours=3)
+    res = await admin_client.put(
+        f"/admin/barbers/schedules/{appointment.schedule_id}",
+        json={
+            "date": new_start.date().isoformat(),
+            "start_time": new_start.time().isoformat(),
+            "end_time": (new_start + timedelta(hours=1)).time().isoformat(),
+        },
+    )
+
+    assert res.status_code == 200, res.text
+    (reminder,) = await _reminders(db_session_with_rollback)
+    assert reminder.appointment_id == appointment.id
+    assert reminder.send_at == new_start - timedelta(
+        minutes=settings.REMINDER_LEAD_MINUTES
+    )
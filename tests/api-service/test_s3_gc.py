@@ -0,0 +1,163 @@
+import io
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import ClientError
+from PIL import Image
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.barber import Barber
+from app.models.s3_deletion import S3Deletion
+from app.services import s3_gc_service
+from app.services.s3_gc_service import collect_s3_garbage, enqueue_s3_deletions
+
+
+def _png(color: str) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (120, 120), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _keys(s3_bucket) -> set[str]:
+    listing = s3_bucket.list_objects_v2(Bucket="test-bucket")
+    return {obj["Key"] for obj in listing.get("Contents", [])}
+
+
+async def _queued(db) -> list[S3Deletion]:
+    return (await db.scalars(select(S3Deletion).order_by(S3Deletion.id))).all()
+
+
+async def _upload(client, color: str):
+    files = {"file": ("avatar.png", _png(color), "image/png")}
+    res = await client.post("/barber/avatar", files=files)
+    assert res.status_code == 200, res.text
+
+
+@pytest.mark.asyncio
+async def test_replaced_avatar_is_queued_and_collected(
+    barber_client, s3_bucket, db_session_with_rollback
+):
+    db = db_session_with_rollback
+    await _upload(barber_client, "red")
+    first = _keys(s3_bucket)
+    await _upload(barber_client, "green")
+
+    # The request only queued the old objects; they are still in the bucket.
+    assert {row.key for row in await _queued(db)} == first
+    assert first <= _keys(s3_bucket)
+
+    totals = await collect_s3_garbage(db)
+
+    assert totals == {"deleted": 6, "failed": 0, "skipped": 0}
+    assert await _queued(db) == []
+    assert not first & _keys(s3_bucket)
+    assert len(_keys(s3_bucket)) == 6
+
+
+@pytest.mark.asyncio
+async def test_variants_still_in_use_are_not_deleted(
+    barber_client, s3_bucket, db_session_with_rollback
+):
+    db = db_session_with_rollback
+    await _upload(barber_client, "red")
+    await _upload(barber_client, "red")
+    barber = await db.scalar(select(Barber).where(Barber.id == 1))
+
+    totals = await collect_s3_garbage(db)
+
+    # The re-upload queued its own variants; they are still in use.
+    assert totals == {"deleted": 0, "failed": 0, "skipped": 6}
+    assert sum(key.startswith("avatars/") for key in _keys(s3_bucket)) == 6
+    assert all(
+        barber.avatar_hash in key
+        for key in _keys(s3_bucket)
+        if key.startswith("avatars/")
+    )
+
+
+@pytest.mark.asyncio
+async def test_reupload_cancels_queued_deletion_of_same_image(
+    barber_client, s3_bucket, db_session_with_rollback
+):
+    db = db_session_with_rollback
+    await _upload(barber_client, "red")
+    red = _keys(s3_bucket)
+    await _upload(barber_client, "green")
+    green = _keys(s3_bucket) - red
+    assert {row.key for row in await _queued(db)} == red
+
+    # Uploading red again unqueues its variants before writing them.
+    await _upload(barber_client, "red")
+
+    assert {row.key for row in await _queued(db)} == green
+    totals = await collect_s3_garbage(db)
+    assert totals == {"deleted": 6, "failed": 0, "skipped": 0}
+    assert _keys(s3_bucket) == red
+
+
+@pytest.mark.asyncio
+async def test_failed_keys_are_retried_with_backoff(
+    s3_bucket, db_session_with_rollback, monkeypatch
+):
+    db = db_session_with_rollback
+    monkeypatch.setattr(settings, "S3_GC_RETRY_DELAY", 60)
+    enqueue_s3_deletions(db, ["barbers/ok.jpg", "barbers/locked.jpg"])
+    await db.commit()
+    now = datetime.utcnow()
+
+    with patch.object(
+        s3_gc_service,
+        "_delete_objects",
+        return_value={"barbers/locked.jpg": "AccessDenied: nope"},
+    ):
+        totals = await collect_s3_garbage(db, now=now)
+
+    assert totals == {"deleted": 1, "failed": 1, "skipped": 0}
+    [row] = await _queued(db)
+    assert row.key == "barbers/locked.jpg"
+    assert row.attempts == 1
+    assert row.last_error == "AccessDenied: nope"
+    assert row.next_attempt_at == now + timedelta(seconds=60)
+
+    # Not due yet, then retried with a doubled delay.
+    assert await collect_s3_garbage(db, now=now) == {
+        "deleted": 0,
+        "failed": 0,
+        "skipped": 0,
+    }
+    later = now + timedelta(seconds=61)
+    with patch.object(
+        s3_gc_service,
+        "_delete_objects",
+        side_effect=ClientError({"Error": {}}, "DeleteObjects"),
+    ):
+        totals = await collect_s3_garbage(db, now=later)
+
+    assert totals["failed"] == 1
+    await db.refresh(row)
+    assert row.attempts == 2
+    assert row.next_attempt_at == later + timedelta(seconds=120)
+
+
+@pytest.mark.asyncio
+async def test_keys_are_deleted_in_batches(
+    s3_bucket, db_session_with_rollback, monkeypatch
+):
+    db = db_session_with_rollback
+    monkeypatch.setattr(settings, "S3_GC_BATCH_SIZE", 2)
+    keys = [f"barbers/{i}.jpg" for i in range(5)]
+    for key in keys:
+        s3_bucket.put_object(Bucket="test-bucket", Key=key, Body=b"x")
+    enqueue_s3_deletions(db, keys)
+    await db.commit()
+
+    with patch.object(
+        s3_gc_service, "_delete_objects", wraps=s3_gc_service._delete_objects
+    ) as delete_objects:
+        totals = await collect_s3_garbage(db)
+
+    assert [len(call.args[0]) for call in delete_objects.call_args_list] == [2, 2, 1]
+    assert totals["deleted"] == 5
+    assert _keys(s3_bucket) == set()
@@ -1,45 +1,46 @@
-from unittest.mock import patch
+import io
+import os
 
 import pytest
-from botocore.exceptions import ClientError
 from fastapi import HTTPException
 
-from app.services.s3_service import delete_file_from_s3, upload_file_to_s3
+from app.services import s3_service
+from app.services.s3_service import spool_upload
 
+MiB = 1024 * 1024
 
-@pytest.mark.asyncio
-@patch("app.services.s3_service.s3_client.put_object")
-async def test_upload_file_success(mock_put_object):
-    mock_put_object.return_value = {}
 
-    url = await upload_file_to_s3(b"test bytes", "test.txt", "text/plain")
-    assert "barbers/" in url
-    assert url.endswith("test.txt")
+def test_spool_upload_copies_in_chunks(monkeypatch):
+    monkeypatch.setattr(s3_service, "SPOOL_CHUNK_SIZE", MiB)
+    payload = os.urandom(3 * MiB + 5)
+    body = io.BytesIO(payload)
+    reads = []
+    read = body.read
+    monkeypatch.setattr(body, "read", lambda size: reads.append(size) or read(size))
 
+    path = spool_upload(body, max_bytes=4 * MiB)
+    try:
+        with open(path, "rb") as f:
+            assert f.read() == payload
+    finally:
+        os.unlink(path)
+    assert max(reads) == MiB
 
-@pytest.mark.asyncio
-@patch("app.services.s3_service.s3_client.put_object")
-async def test_upload_file_failure(mock_put_object):
-    mock_put_object.side_effect = ClientError({"Error": {}}, "PutObject")
 
-    with pytest.raises(HTTPException) as exc_info:
-        await upload_file_to_s3(b"test bytes", "test.txt", "text/plain")
-    assert exc_info.value.status_code == 500
-
-
-@pytest.mark.asyncio
-@patch("app.services.s3_service.s3_client.delete_object")
-async def test_delete_file_success(mock_delete_object):
-    mock_delete_object.return_value = {}
+@pytest.mark.parametrize("size", [2 * MiB + 1, 12 * MiB])
+def test_spool_upload_over_limit_is_rejected_and_removed(tmp_path, monkeypatch, size):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
 
-    await delete_file_from_s3("some/key")
+    with pytest.raises(HTTPException) as exc_info:
+        spool_upload(io.BytesIO(os.urandom(size)), max_bytes=2 * MiB)
 
+    assert exc_info.value.status_code == 413
+    assert list(tmp_path.iterdir()) == []
 
-@pytest.mark.asyncio
-@patch("app.services.s3_service.s3_client.delete_object")
-async def test_delete_file_failure(mock_delete_object):
-    mock_delete_object.side_effect = ClientError({"Error": {}}, "DeleteObject")
 
-    with pytest.raises(HTTPException) as exc_info:
-        await delete_file_from_s3("some/key")
-    assert exc_info.value.status_code == 500
+def test_spool_upload_at_the_limit_is_accepted():
+    path = spool_upload(io.BytesIO(b"x" * 10), max_bytes=10)
+    try:
+        assert os.path.getsize(path) == 10
+    finally:
+        os.unlink(path)
@@ -0,0 +1,147 @@
+from datetime import date, time, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.models.barberschedule import BarberSchedule
+from app.models.schedule_template import ScheduleTemplate
+from app.services.schedule_template_service import (
+    build_template_slots,
+    expand_schedule_templates,
+)
+
+
+def make_template(**overrides) -> ScheduleTemplate:
+    values = {
+        "barber_id": 1,
+        "weekday": 0,
+        "start_time": time(10, 0),
+        "end_time": time(12, 0),
+        "slot_minutes": 45,
+        "valid_from": date(2025, 7, 1),
+        "valid_to": None,
+        "is_active": True,
+    }
+    values.update(overrides)
+    return ScheduleTemplate(**values)
+
+
+async def count_template_slots(db, template_id: int) -> int:
+    result = await db.execute(
+        select(func.count(BarberSchedule.id)).where(
+            BarberSchedule.template_id == template_id
+        )
+    )
+    return result.scalar_one()
+
+
+def test_build_template_slots_matches_weekday_and_slot_length():
+    template = make_template()
+
+    # 2025-07-02 is a Wednesday; the following Mondays are 07-07 and 07-14.
+    slots = build_template_slots(template, date(2025, 7, 2), date(2025, 7, 14))
+
+    assert [(s.date, s.start_time, s.end_time) for s in slots] == [
+        (date(2025, 7, 7), time(10, 0), time(10, 45)),
+        (date(2025, 7, 7), time(10, 45), time(11, 30)),
+        (date(2025, 7, 14), time(10, 0), time(10, 45)),
+        (date(2025, 7, 14), time(10, 45), time(11, 30)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_expand_schedule_templates_is_bounded_and_idempotent(
+    db_session_with_rollback, monkeypatch
+):
+    monkeypatch.setattr(settings, "SCHEDULE_TEMPLATE_HORIZON_DAYS", 14)
+    today = date.today() + timedelta(days=1)
+    template = make_template(weekday=today.weekday(), valid_from=today)
+    db_session_with_rollback.add(template)
+    await db_session_with_rollback.commit()
+
+    await expand_schedule_templates(db_session_with_rollback, today=today)
+    # Days today, +7 and +14 are inside the horizon, two slots each.
+    assert await count_template_slots(db_session_with_rollback, template.id) == 6
+    assert template.generated_until == today + timedelta(days=14)
+
+    await expand_schedule_templates(db_session_with_rollback, today=today)
+    assert await count_template_slots(db_session_with_rollback, template.id) == 6
+
+    await expand_schedule_templates(
+        db_session_with_rollback, today=today + timedelta(days=7)
+    )
+    assert await count_template_slots(db_session_with_rollback, template.id) == 8
+
+
+@pytest.mark.asyncio
+async def test_expand_schedule_templates_skips_overlapping_slots(
+    db_session_with_rollback, monkeypatch
+):
+    monkeypatch.setattr(settings, "SCHEDULE_TEMPLATE_HORIZON_DAYS", 6)
+    today = date.today() + timedelta(days=1)
+    db_session_with_rollback.add(
+        BarberSchedule(
+            barber_id=1, date=today, start_time=time(10, 30), end_time=time(11, 0)
+        )
+    )
+    template = make_template(weekday=today.weekday(), valid_from=today)
+    db_session_with_rollback.add(template)
+    await db_session_with_rollback.commit()
+
+    created = await expand_schedule_templates(db_session_with_rollback, today=today)
+
+    assert created == 0
+    assert await count_template_slots(db_session_with_rollback, template.id) == 0
+
+
+@pytest.mark.asyncio
+async def test_barber_can_create_and_delete_schedule_template(
+    barber_client, db_session_with_rollback
+):
+    start = date.today() + timedelta(days=1)
+    payload = {
+        "weekday": start.weekday(),
+        "start_time": "09:00",
+        "end_time": "10:00",
+        "slot_minutes": 30,
+        "valid_from": start.isoformat(),
+        "valid_to": (start + timedelta(days=7)).isoformat(),
+    }
+    res = await barber_client.post("/barber/schedule-templates/", json=payload)
+    assert res.status_code == 200, res.text
+    template_id = res.json()["id"]
+    assert await count_template_slots(db_session_with_rollback, template_id) == 4
+
+    res = await barber_client.get("/barber/schedule-templates/")
+    assert [t["id"] for t in res.json()] == [template_id]
+
+    res = await barber_client.delete(f"/barber/schedule-templates/{template_id}")
+    assert res.status_code == 200
+    assert await count_template_slots(db_session_with_rollback, template_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_create_schedule_template_rejects_inverted_times(barber_client):
+    payload = {
+        "weekday": 1,
+        "start_time": "12:00",
+        "end_time": "10:00",
+        "slot_minutes": 30,
+        "valid_from": date.today().isoformat(),
+    }
+    res = await barber_client.post("/barber/schedule-templates/", json=payload)
+    assert res.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_regular_user_cannot_create_schedule_template(authorized_client):
+    payload = {
+        "weekday": 1,
+        "start_time": "10:00",
+        "end_time": "12:00",
+        "slot_minutes": 30,
+        "valid_from": date.today().isoformat(),
+    }
+    res = await authorized_client.post("/barber/schedule-templates/", json=payload)
+    assert res.status_code == 403
@@ -232,3 +232,35 @@ async def test_user_cannot_access_schedule_endpoints(authorized_client):
         res_delete.json()["detail"]
         == "Access denied: only barbers can perform this action"
     )
+
+
+@pytest.mark.asyncio
+async def test_barber_can_bulk_create_schedules(barber_schedule_factory, barber_client):
+    existing = await barber_schedule_factory()
+    day = existing.date.isoformat()
+    payload = {
+        "slots": [
+            {"date": day, "start_time": "11:00", "end_time": "12:00"},
+            {"date": day, "start_time": "10:30", "end_time": "11:30"},
+            {"date": day, "start_time": "11:30", "end_time": "12:30"},
+            {"date": day, "start_time": "13:00", "end_time": "12:00"},
+        ]
+    }
+    res = await barber_client.post("/barber/schedules/bulk", json=payload)
+    assert res.status_code == 201, res.text
+
+    data = res.json()
+    assert data["created"] == 1
+    assert data["rejected"] == 3
+    results = data["results"]
+    assert results[0]["accepted"] is True
+    assert results[0]["schedule"]["start_time"] == "11:00"
+    assert "existing" in results[1]["reason"]
+    assert "this request" in results[2]["reason"]
+    assert "earlier" in results[3]["reason"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_schedules_rejects_empty_batch(barber_client):
+    res = await barber_client.post("/barber/schedules/bulk", json={"slots": []})
+    assert res.status_code == 422
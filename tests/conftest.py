@@ -1,5 +1,10 @@
+import os
+
+import boto3
+import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from moto import mock_aws
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.api.deps import get_session
@@ -11,6 +16,8 @@ from app.main import app
 from app.models.barber import Barber
 from app.models.role import Role
 from app.models.user import User
+from app.services import s3_service
+from app.utils import redis_client
 
 TEST_DATABASE_URL = settings.TEST_DATABASE_URL
 engine = create_async_engine(TEST_DATABASE_URL, echo=False)
@@ -95,6 +102,11 @@ async def fake_rate_limiter():
     yield
 
 
+@pytest.fixture(autouse=True)
+def disable_response_cache(monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", False)
+
+
 @pytest_asyncio.fixture(scope="function")
 async def client(db_session_with_rollback):
     app.dependency_overrides[get_session] = lambda: db_session_with_rollback
@@ -154,3 +166,122 @@ async def super_admin_client(db_session_with_rollback):
         db_session_with_rollback,
     ):
         yield ac
+
+
+@pytest.fixture
+def s3_bucket(monkeypatch):
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="test-bucket")
+        monkeypatch.setattr(s3_service, "s3_client", client)
+        monkeypatch.setattr(s3_service, "BUCKET", "test-bucket")
+        yield client
+
+
+class InMemoryRedis:
+    """The string commands the Redis caches use, kept in a dict (no expiry)."""
+
+    def __init__(self):
+        self.values = {}
+        self.published = []
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    async def set(self, key, value, ex=None, nx=False, get=False):
+        previous = self.values.get(key)
+        if nx and previous is not None:
+            return None
+        self.values[key] = str(value)
+        return previous if get else True
+
+    async def delete(self, *keys):
+        return sum(self.values.pop(key, None) is not None for key in keys)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 1
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class Pipeline:
+            """Commands are queued, except between ``watch`` and ``multi``;
+            ``execute`` applies all of them or, on an error, none."""
+
+            def __init__(self):
+                self.calls = []
+                self.watching = False
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def watch(self, *keys):
+                self.watching = True
+
+            def multi(self):
+                self.watching = False
+
+            def __getattr__(self, name):
+                if self.watching:
+                    return getattr(redis, name)
+                return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+            async def execute(self):
+                calls, self.calls = self.calls, []
+                snapshot = dict(redis.values)
+                try:
+                    return [
+                        await getattr(redis, name)(*args, **kwargs)
+                        for name, args, kwargs in calls
+                    ]
+                except Exception:
+                    redis.values = snapshot
+                    raise
+
+        return Pipeline()
+
+
+@pytest.fixture
+def memory_redis(monkeypatch):
+    redis = InMemoryRedis()
+    monkeypatch.setattr(redis_client, "redis_client", redis)
+    monkeypatch.setattr(settings, "CACHE_POLL_INTERVAL", 0.01)
+    return redis
+
+
+# The shared in-memory test database runs every session on one connection, so
+# races need their own database. Set TEST_POSTGRES_URL to run it against
+# Postgres as well.
+DATABASE_URLS = [
+    pytest.param("sqlite", id="sqlite"),
+    pytest.param(
+        os.getenv("TEST_POSTGRES_URL"),
+        id="postgres",
+        marks=pytest.mark.skipif(
+            not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set"
+        ),
+    ),
+]
+
+
+@pytest_asyncio.fixture(params=DATABASE_URLS)
+async def race_sessionmaker(request, tmp_path):
+    url = request.param
+    if url == "sqlite":
+        url = f"sqlite+aiosqlite:///{tmp_path / 'race.db'}"
+    engine = create_async_engine(url, pool_size=20, max_overflow=0)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
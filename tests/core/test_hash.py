@@ -1,4 +1,16 @@
-from app.core.hash import get_password_hash, verify_password
+import pytest
+from passlib.hash import bcrypt
+
+from app.core.config import settings
+from app.core.hash import (
+    PASSWORD_HASH_QUEUE_DEPTH,
+    PASSWORD_HASH_SECONDS,
+    get_password_hash,
+    get_password_hash_async,
+    password_needs_rehash,
+    verify_password,
+    verify_password_async,
+)
 
 
 def test_password_hash_and_verify_match():
@@ -11,3 +23,28 @@ def test_password_hash_and_verify_fail_on_wrong_password():
     plain = "secret123"
     hashed = get_password_hash(plain)
     assert verify_password("wrongpass", hashed) is False
+
+
+@pytest.mark.asyncio
+async def test_async_hash_and_verify_run_in_pool():
+    hashes = PASSWORD_HASH_SECONDS.labels("verify")
+    before = hashes._sum.get()
+
+    hashed = await get_password_hash_async("secret123")
+
+    assert await verify_password_async("secret123", hashed) is True
+    assert await verify_password_async("wrongpass", hashed) is False
+    assert hashes._sum.get() > before
+    assert PASSWORD_HASH_QUEUE_DEPTH._value.get() == 0
+
+
+def test_bcrypt_rounds_follow_settings():
+    hashed = get_password_hash("secret123")
+    assert hashed.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+
+
+def test_password_needs_rehash_when_cost_differs():
+    assert password_needs_rehash(get_password_hash("secret123")) is False
+    assert password_needs_rehash(bcrypt.using(rounds=4).hash("secret123")) is True
+    higher = bcrypt.using(rounds=settings.BCRYPT_ROUNDS + 1).hash("secret123")
+    assert password_needs_rehash(higher) is True
@@ -1,7 +1,19 @@
+from datetime import timedelta
+from time import time as _time
+
+import pytest
+from ecdsa import NIST256p, SigningKey
 from jose import jwt
 
+from app.core import security
 from app.core.config import settings
-from app.core.security import create_access_token, decode_access_token
+from app.core.security import (
+    JWT_CACHE_LOOKUPS,
+    clear_token_cache,
+    create_access_token,
+    decode_access_token,
+    load_keys,
+)
 
 
 def test_create_access_token_encodes_expected_payload():
@@ -28,3 +40,67 @@ def test_decode_access_token_returns_none_on_invalid_token():
     invalid_token = "this.is.not.valid"
     payload = decode_access_token(invalid_token)
     assert payload is None
+
+
+def test_decode_access_token_is_served_from_cache():
+    clear_token_cache()
+    token = create_access_token({"id": 7, "role": "user"})
+    hits = JWT_CACHE_LOOKUPS.labels("hit")
+    before = hits._value.get()
+
+    first = decode_access_token(token)
+    first["role"] = "admin"
+    second = decode_access_token(token)
+
+    assert second["role"] == "user"
+    assert hits._value.get() == before + 1
+
+
+def test_cached_token_is_reverified_after_expiry(monkeypatch):
+    clear_token_cache()
+    token = create_access_token({"id": 7, "role": "user"}, timedelta(seconds=30))
+    assert decode_access_token(token) is not None
+
+    misses = JWT_CACHE_LOOKUPS.labels("miss")
+    before = misses._value.get()
+    monkeypatch.setattr(security, "time", lambda: _time() + 60)
+
+    # The stale entry is dropped and the token goes through full verification.
+    assert security._get_cached(next(iter(security._token_cache))) is None
+    decode_access_token(token)
+    assert misses._value.get() == before + 1
+
+
+def test_token_cache_is_bounded(monkeypatch):
+    clear_token_cache()
+    monkeypatch.setattr(settings, "JWT_CACHE_SIZE", 2)
+    tokens = [create_access_token({"id": i, "role": "user"}) for i in range(3)]
+    for token in tokens:
+        decode_access_token(token)
+    assert len(security._token_cache) == 2
+
+
+def test_es256_keys_sign_and_verify(tmp_path, monkeypatch):
+    private_key = SigningKey.generate(curve=NIST256p)
+    key_file = tmp_path / "jwt.pem"
+    key_file.write_bytes(private_key.to_pem())
+    signing_key, verification_key = load_keys("ES256", "unused", str(key_file))
+
+    monkeypatch.setattr(settings, "ALGORITHM", "ES256")
+    monkeypatch.setattr(security, "_signing_key", signing_key)
+    monkeypatch.setattr(security, "_verification_key", verification_key)
+    clear_token_cache()
+
+    token = create_access_token({"id": 3, "role": "barber"})
+    assert jwt.get_unverified_header(token)["alg"] == "ES256"
+    assert decode_access_token(token)["id"] == 3
+    # An HS256 token signed with the old shared secret is no longer accepted.
+    clear_token_cache()
+    forged = jwt.encode({"id": 1, "role": "admin"}, "unused", algorithm="HS256")
+    assert decode_access_token(forged) is None
+    clear_token_cache()
+
+
+def test_asymmetric_algorithm_requires_private_key():
+    with pytest.raises(RuntimeError):
+        load_keys("ES256", "unused")
@@ -1,32 +1,250 @@
-from unittest.mock import MagicMock, patch
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from redis.exceptions import LockNotOwnedError
 
 from app.core.config import settings
-from app.utils.celery_tasks.sms import send_sms_task
+from app.utils.celery_tasks import sms
+from app.utils.celery_tasks.reminders import send_due_reminders_task
+from app.utils.celery_tasks.schedules import expand_schedule_templates_task
+from app.utils.celery_tasks.sms import (
+    SMS_OUTBOX_KEY,
+    SMS_PROCESSING_KEY,
+    dispatch_sms_task,
+    send_sms_task,
+)
+from app.utils.celery_tasks.storage import collect_s3_garbage_task
+from app.utils.sms_dispatch import (
+    FakeSmsProvider,
+    SmsDispatcher,
+    build_sms_provider,
+)
 
 
-@pytest.mark.asyncio
-@patch("app.utils.celery_tasks.sms.twilio_client.messages.create")
-def test_send_sms_task_success(mock_create):
-    mock_msg = MagicMock()
-    mock_msg.sid = "fake_sid_123"
-    mock_create.return_value = mock_msg
+@patch("app.utils.celery_tasks.sms.dispatch_sms_task")
+@patch("app.utils.celery_tasks.sms.outbox")
+def test_send_sms_task_queues_message(mock_outbox, mock_dispatch):
+    send_sms_task("1234567890", "Test message")
 
-    sid = send_sms_task("1234567890", "Test message")
+    key, payload = mock_outbox.rpush.call_args.args
+    assert key == SMS_OUTBOX_KEY
+    assert json.loads(payload) == {
+        "to": "1234567890",
+        "body": "Test message",
+        "sender": settings.TWILIO_PHONE_NUMBER,
+    }
+    mock_dispatch.delay.assert_called_once_with()
 
-    mock_create.assert_called_once_with(
-        body="Test message",
-        from_=settings.TWILIO_PHONE_NUMBER,
-        to="1234567890",
+
+class FakeOutbox:
+    """The list commands ``dispatch_sms_task`` uses, backed by plain lists."""
+
+    def __init__(self, **lists):
+        self.lists = {key: list(items) for key, items in lists.items()}
+        self.lock = MagicMock()
+        self.lock.return_value.acquire.return_value = True
+
+    def lmove(self, first_list, second_list, src="LEFT", dest="RIGHT"):
+        source = self.lists.get(first_list)
+        if not source:
+            return None
+        item = source.pop(0 if src == "LEFT" else -1)
+        target = self.lists.setdefault(second_list, [])
+        target.insert(0 if dest == "LEFT" else len(target), item)
+        return item
+
+    def delete(self, *keys):
+        for key in keys:
+            self.lists.pop(key, None)
+
+    def pipeline(self):
+        outbox = self
+        results = []
+
+        class Pipeline:
+            def lmove(self, *args):
+                results.append(outbox.lmove(*args))
+
+            def execute(self):
+                return results
+
+        return Pipeline()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def _sms_payloads(count):
+    return [
+        json.dumps({"to": f"+1555{i}", "body": "hi", "sender": "+1000"})
+        for i in range(count)
+    ]
+
+
+def test_dispatch_sms_task_drains_outbox_in_batches(monkeypatch):
+    provider = build_sms_provider("memory")
+    monkeypatch.setattr(sms.sms_dispatcher, "provider", provider)
+    monkeypatch.setattr(settings, "SMS_BATCH_SIZE", 2)
+    fake = FakeOutbox(**{SMS_OUTBOX_KEY: _sms_payloads(3)})
+    monkeypatch.setattr(sms, "outbox", fake)
+    batches = []
+    dispatch = sms.sms_dispatcher.dispatch
+    monkeypatch.setattr(
+        sms.sms_dispatcher,
+        "dispatch",
+        lambda messages, **kwargs: batches.append(len(messages))
+        or dispatch(messages, **kwargs),
+    )
+
+    totals = dispatch_sms_task()
+
+    assert totals["sent"] == 3
+    assert batches == [2, 1]
+    assert [m.to for m in provider.sent] == ["+15550", "+15551", "+15552"]
+    assert not fake.lists.get(SMS_OUTBOX_KEY)
+    assert not fake.lists.get(SMS_PROCESSING_KEY)
+    fake.lock.return_value.release.assert_called_once()
+
+
+def test_dispatch_sms_task_keeps_batch_when_dispatch_crashes(monkeypatch):
+    monkeypatch.setattr(settings, "SMS_BATCH_SIZE", 2)
+    payloads = _sms_payloads(3)
+    fake = FakeOutbox(**{SMS_OUTBOX_KEY: payloads})
+    monkeypatch.setattr(sms, "outbox", fake)
+    monkeypatch.setattr(
+        sms.sms_dispatcher, "dispatch", MagicMock(side_effect=SystemExit)
+    )
+
+    with pytest.raises(SystemExit):
+        dispatch_sms_task()
+
+    assert fake.lists[SMS_PROCESSING_KEY] == payloads[:2]
+    assert fake.lists[SMS_OUTBOX_KEY] == payloads[2:]
+
+
+def test_dispatch_sms_task_requeues_unfinished_batch_first(monkeypatch):
+    provider = build_sms_provider("memory")
+    monkeypatch.setattr(sms.sms_dispatcher, "provider", provider)
+    payloads = _sms_payloads(3)
+    fake = FakeOutbox(
+        **{SMS_PROCESSING_KEY: payloads[:2], SMS_OUTBOX_KEY: payloads[2:]}
     )
-    assert sid == "fake_sid_123"
+    monkeypatch.setattr(sms, "outbox", fake)
+
+    assert dispatch_sms_task()["sent"] == 3
+    assert [m.to for m in provider.sent] == ["+15550", "+15551", "+15552"]
+    assert not fake.lists.get(SMS_PROCESSING_KEY)
+
+
+def test_dispatch_sms_task_extends_lock_during_a_long_batch(monkeypatch):
+    clock = FakeClock()
+    provider = FakeSmsProvider(clock=clock)
+    dispatcher = SmsDispatcher(
+        provider, rate=1, burst=1, clock=clock, sleep=clock.sleep
+    )
+    monkeypatch.setattr(sms, "sms_dispatcher", dispatcher)
+    monkeypatch.setattr(sms, "time", SimpleNamespace(monotonic=clock))
+    monkeypatch.setattr(settings, "SMS_DISPATCH_LOCK_TTL", 3)
+    fake = FakeOutbox(**{SMS_OUTBOX_KEY: _sms_payloads(10)})
+    monkeypatch.setattr(sms, "outbox", fake)
+
+    assert dispatch_sms_task()["sent"] == 10
+
+    # Nine seconds of sending, extended every second of the 3 s TTL.
+    assert fake.lock.return_value.reacquire.call_count == 9
+
+
+def test_dispatch_sms_task_stops_when_lock_is_lost(monkeypatch):
+    monkeypatch.setattr(settings, "SMS_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "SMS_DISPATCH_LOCK_TTL", 0)
+    payloads = _sms_payloads(3)
+    fake = FakeOutbox(**{SMS_OUTBOX_KEY: payloads})
+    fake.lock.return_value.reacquire.side_effect = LockNotOwnedError("expired")
+    fake.lock.return_value.release.side_effect = LockNotOwnedError("expired")
+    monkeypatch.setattr(sms, "outbox", fake)
+    dispatch = MagicMock()
+    monkeypatch.setattr(sms.sms_dispatcher, "dispatch", dispatch)
+
+    assert dispatch_sms_task()["sent"] == 0
+
+    # The batch is left for the worker that holds the lock now.
+    assert fake.lists[SMS_PROCESSING_KEY] == payloads[:2]
+    assert fake.lists[SMS_OUTBOX_KEY] == payloads[2:]
+
+
+@patch("app.utils.celery_tasks.sms.outbox")
+def test_dispatch_sms_task_skips_when_another_worker_drains(mock_outbox):
+    mock_outbox.lock.return_value.acquire.return_value = False
+
+    assert dispatch_sms_task()["sent"] == 0
+    mock_outbox.pipeline.assert_not_called()
+    mock_outbox.lmove.assert_not_called()
+
+
+@patch("app.utils.celery_tasks.schedules.engine")
+@patch("app.utils.celery_tasks.schedules.async_session")
+@patch(
+    "app.utils.celery_tasks.schedules.expand_schedule_templates",
+    new_callable=AsyncMock,
+)
+def test_expand_schedule_templates_task(mock_expand, mock_session, mock_engine):
+    mock_expand.return_value = 7
+    mock_session.return_value.__aenter__ = AsyncMock(return_value="db")
+    mock_session.return_value.__aexit__ = AsyncMock(return_value=None)
+    mock_engine.dispose = AsyncMock()
+
+    assert expand_schedule_templates_task() == 7
+
+    mock_expand.assert_awaited_once_with("db")
+    mock_engine.dispose.assert_awaited_once()
+
+
+@patch("app.utils.celery_tasks.storage.engine")
+@patch("app.utils.celery_tasks.storage.async_session")
+@patch("app.utils.celery_tasks.storage.collect_s3_garbage", new_callable=AsyncMock)
+def test_collect_s3_garbage_task(mock_collect, mock_session, mock_engine):
+    mock_collect.return_value = {"deleted": 3, "failed": 0, "skipped": 1}
+    mock_session.return_value.__aenter__ = AsyncMock(return_value="db")
+    mock_session.return_value.__aexit__ = AsyncMock(return_value=None)
+    mock_engine.dispose = AsyncMock()
+
+    assert collect_s3_garbage_task() == {"deleted": 3, "failed": 0, "skipped": 1}
+
+    mock_collect.assert_awaited_once_with("db")
+    mock_engine.dispose.assert_awaited_once()
+
+
+@patch("app.utils.celery_tasks.reminders.engine")
+@patch("app.utils.celery_tasks.reminders.async_session")
+@patch("app.utils.celery_tasks.reminders.send_due_reminders", new_callable=AsyncMock)
+def test_send_due_reminders_task(mock_send, mock_session, mock_engine):
+    mock_send.return_value = {"sent": 4, "expired": 1}
+    mock_session.return_value.__aenter__ = AsyncMock(return_value="db")
+    mock_session.return_value.__aexit__ = AsyncMock(return_value=None)
+    mock_engine.dispose = AsyncMock()
+
+    assert send_due_reminders_task() == {"sent": 4, "expired": 1}
+
+    mock_send.assert_awaited_once_with("db")
+    mock_engine.dispose.assert_awaited_once()
 
 
-@pytest.mark.asyncio
-@patch("app.utils.celery_tasks.sms.twilio_client.messages.create")
-def test_send_sms_task_failure(mock_create):
-    mock_create.side_effect = Exception("Twilio error")
+@patch("app.utils.celery_tasks.sms.dispatch_sms_task")
+@patch("app.utils.celery_tasks.sms.outbox")
+def test_queue_sms_pushes_batch_in_one_call(mock_outbox, mock_dispatch):
+    sms.queue_sms([("+1", "a"), ("+2", "b")], sender="+1000")
 
-    with pytest.raises(Exception):
-        send_sms_task("1234567890", "Test message")
+    key, *payloads = mock_outbox.rpush.call_args.args
+    assert key == SMS_OUTBOX_KEY
+    assert [json.loads(p)["to"] for p in payloads] == ["+1", "+2"]
+    mock_dispatch.delay.assert_called_once_with()
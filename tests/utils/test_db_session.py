@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db.session import (
+    POOL_CHECKOUT_TIMEOUTS,
+    POOL_CHECKOUT_WAIT,
+    InstrumentedAsyncQueuePool,
+    engine_options,
+    warm_up_pool,
+)
+
+
+def sample(metric, suffix=""):
+    return next(
+        s.value
+        for m in metric.collect()
+        for s in m.samples
+        if s.name == m.name + suffix
+    )
+
+
+def test_engine_options_for_postgres(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 12)
+    monkeypatch.setattr(settings, "DB_STATEMENT_CACHE_SIZE", 0)
+
+    options = engine_options("postgresql+asyncpg://u:p@db:5432/app")
+
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert options["pool_size"] == 12
+    assert options["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert options["pool_recycle"] == settings.DB_POOL_RECYCLE
+    assert options["connect_args"]["statement_cache_size"] == 0
+
+
+def test_engine_options_for_in_memory_sqlite():
+    options = engine_options("sqlite+aiosqlite:///:memory:")
+
+    assert "pool_size" not in options
+    assert "connect_args" not in options
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_opens_connections(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}"
+    engine = create_async_engine(url, **{**engine_options(url), "pool_size": 3})
+    try:
+        assert await warm_up_pool(engine, 5) == 3
+        assert engine.pool.checkedin() == 3
+        assert engine.pool.checkedout() == 0
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_skips_static_pool():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    try:
+        assert await warm_up_pool(engine, 5) == 0
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_exhaustion_is_measured(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}"
+    options = {
+        **engine_options(url),
+        "pool_size": 1,
+        "max_overflow": 0,
+        "pool_timeout": 0.05,
+    }
+    engine = create_async_engine(url, **options)
+    timeouts = sample(POOL_CHECKOUT_TIMEOUTS, "_total")
+    waits = sample(POOL_CHECKOUT_WAIT, "_count")
+    try:
+        async with engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                async with engine.connect():
+                    pass
+    finally:
+        await engine.dispose()
+
+    assert sample(POOL_CHECKOUT_TIMEOUTS, "_total") == timeouts + 1
+    assert sample(POOL_CHECKOUT_WAIT, "_count") == waits + 2
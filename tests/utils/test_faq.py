@@ -0,0 +1,61 @@
+import pytest
+
+from app.utils.faq import match_faq, normalize_question, similarity, trigrams
+
+SHOP_INFO = {
+    "address": "12 Example St, Kyiv",
+    "working_hours": "10:00 - 20:00, every day",
+    "services": ["Fades", "Beard trims"],
+}
+
+
+def test_normalize_question():
+    assert normalize_question("Hi!  What are your HOURS?") == "what are your hours"
+    assert normalize_question("  ") == ""
+
+
+def test_similarity_of_near_identical_questions():
+    a = trigrams("what are your opening hours")
+    b = trigrams("what are your opening hour")
+    c = trigrams("do you do beard trims")
+
+    assert similarity(a, b) > 0.9
+    assert similarity(a, c) < 0.3
+    assert similarity(a, set()) == 0.0
+
+
+@pytest.mark.parametrize(
+    "question, answer",
+    [
+        ("When are you open?", "We're open 10:00 - 20:00, every day."),
+        ("What's your address?", "You can find us at 12 Example St, Kyiv."),
+        ("What services do you offer?", "We offer Fades, Beard trims."),
+        (
+            "Where are you and what time do you close?",
+            "We're open 10:00 - 20:00, every day. "
+            "You can find us at 12 Example St, Kyiv.",
+        ),
+    ],
+)
+def test_match_faq_answers_from_shop_info(question, answer):
+    assert match_faq(question, SHOP_INFO) == answer
+
+
+@pytest.mark.parametrize(
+    "question",
+    [
+        "How are you?",
+        # No prices in the shop info: the model has to handle it.
+        "How much is a fade?",
+        "Can I book an appointment when you open tomorrow?",
+        "",
+    ],
+)
+def test_match_faq_leaves_other_questions_to_the_model(question):
+    assert match_faq(question, SHOP_INFO) is None
+
+
+def test_match_faq_prices_when_listed():
+    info = {**SHOP_INFO, "prices": {"Fade": "$25", "Shave": "$15"}}
+
+    assert match_faq("How much?", info) == "Our prices: Fade – $25, Shave – $15."
@@ -0,0 +1,71 @@
+import io
+
+import pytest
+from PIL import Image
+
+from app.utils.images import build_avatar_variants
+
+
+def _jpeg_with_exif(width=800, height=600) -> bytes:
+    image = Image.new("RGB", (width, height), "red")
+    exif = Image.Exif()
+    exif[0x010F] = "CameraMaker"  # Make
+    exif[0x0112] = 6  # Orientation: rotate 90 CW
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def upload(tmp_path):
+    """Write ``data`` where the resize worker reads uploads from."""
+
+    def write(data: bytes) -> str:
+        path = tmp_path / "upload"
+        path.write_bytes(data)
+        return str(path)
+
+    return write
+
+
+def test_variants_are_square_and_cover_every_size_and_format(upload):
+    avatar_hash, variants = build_avatar_variants(upload(_jpeg_with_exif()), [64, 256])
+
+    assert len(avatar_hash) == 64
+    assert set(variants) == {(64, "webp"), (64, "jpeg"), (256, "webp"), (256, "jpeg")}
+    for (size, fmt), body in variants.items():
+        with Image.open(io.BytesIO(body)) as image:
+            assert image.size == (size, size)
+            assert image.format == fmt.upper()
+
+
+def test_variants_strip_metadata(upload):
+    _, variants = build_avatar_variants(upload(_jpeg_with_exif()), [64])
+
+    for body in variants.values():
+        with Image.open(io.BytesIO(body)) as image:
+            assert not image.getexif()
+            assert "icc_profile" not in image.info
+
+
+def test_same_image_gets_the_same_hash(upload):
+    path = upload(_jpeg_with_exif())
+    assert build_avatar_variants(path, [64])[0] == build_avatar_variants(path, [64])[0]
+
+
+def test_transparent_png_is_flattened_for_jpeg(upload):
+    buffer = io.BytesIO()
+    Image.new("RGBA", (100, 100), (0, 0, 0, 0)).save(buffer, "PNG")
+
+    _, variants = build_avatar_variants(upload(buffer.getvalue()), [64])
+
+    with Image.open(io.BytesIO(variants[(64, "jpeg")])) as image:
+        assert image.getpixel((32, 32)) == (255, 255, 255)
+    with Image.open(io.BytesIO(variants[(64, "webp")])) as image:
+        assert image.mode == "RGBA"
+
+
+@pytest.mark.parametrize("data", [b"", b"fake image data", b"\xff\xd8\xff" + b"0" * 64])
+def test_undecodable_upload_raises_value_error(upload, data):
+    with pytest.raises(ValueError):
+        build_avatar_variants(upload(data), [64])
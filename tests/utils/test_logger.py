@@ -1,68 +1,140 @@
-import asyncio
+import logging
 from logging import LogRecord
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from app.utils.logger import ElasticsearchHandler
+from app.utils.logger import (
+    LOG_RECORDS_DROPPED,
+    LOG_RECORDS_SHIPPED,
+    ElasticsearchHandler,
+)
 
 
-@pytest.mark.asyncio
-async def test_send_logs_to_elasticsearch():
-    mock_es_client = MagicMock()
-    mock_es_client.index = AsyncMock(return_value={"result": "created"})
-
-    handler = ElasticsearchHandler(mock_es_client, "test-index")
-
+def make_record(msg="Test log message", level=logging.INFO):
     record = LogRecord(
         name="test_logger",
-        level=20,  # INFO
+        level=level,
         pathname="test_file.py",
         lineno=42,
-        msg="Test log message",
+        msg=msg,
         args=(),
         exc_info=None,
     )
-
     record.funcName = "test_func"
+    return record
+
+
+def make_handler(**kwargs):
+    mock_es_client = MagicMock()
+    mock_es_client.bulk = AsyncMock(return_value={"errors": False})
+    mock_es_client.close = AsyncMock()
+    return ElasticsearchHandler(mock_es_client, "test-index", **kwargs)
+
 
-    await handler._send(record)
+def test_build_document():
+    handler = make_handler()
+
+    doc = handler._build_document(make_record())
 
-    mock_es_client.index.assert_awaited_once()
-    args, kwargs = mock_es_client.index.call_args
-    assert kwargs["index"] == "test-index"
-    doc = kwargs["document"]
     assert doc["level"] == "INFO"
     assert doc["message"] == "Test log message"
     assert doc["logger_name"] == "test_logger"
+    assert doc["lineno"] == 42
 
 
-def test_emit_creates_task(monkeypatch):
-    mock_es_client = MagicMock()
-    mock_es_client.index = AsyncMock()
+@pytest.mark.asyncio
+async def test_ship_sends_single_bulk_request():
+    handler = make_handler()
+    docs = [handler._build_document(make_record(f"msg {i}")) for i in range(3)]
 
-    handler = ElasticsearchHandler(mock_es_client, "test-index")
+    await handler._ship(docs)
 
-    record = MagicMock()
-    record.levelname = "INFO"
-    record.getMessage.return_value = "Test message"
-    record.name = "test_logger"
-    record.filename = "test_file.py"
-    record.funcName = "test_func"
-    record.lineno = 123
-    record.__dict__ = {}
+    handler.es_client.bulk.assert_awaited_once()
+    operations = handler.es_client.bulk.call_args.kwargs["operations"]
+    assert len(operations) == 6
+    assert operations[0] == {"index": {"_index": "test-index"}}
+    assert operations[1]["message"] == "msg 0"
+
+
+@pytest.mark.asyncio
+async def test_ship_counts_rejected_documents_as_dropped():
+    handler = make_handler()
+    handler.es_client.bulk.return_value = {
+        "errors": True,
+        "items": [
+            {"index": {"status": 201}},
+            {"index": {"status": 400, "error": {"type": "mapper_parsing_exception"}}},
+            {"index": {"status": 201}},
+        ],
+    }
+    docs = [handler._build_document(make_record(f"msg {i}")) for i in range(3)]
+    rejected = LOG_RECORDS_DROPPED.labels(reason="rejected")
+    before_rejected = rejected._value.get()
+    before_shipped = LOG_RECORDS_SHIPPED._value.get()
+
+    await handler._ship(docs)
+
+    assert rejected._value.get() == before_rejected + 1
+    assert LOG_RECORDS_SHIPPED._value.get() == before_shipped + 2
+
+
+def test_emit_only_enqueues(monkeypatch):
+    handler = make_handler()
+    monkeypatch.setattr(handler, "_ensure_shipper", MagicMock())
+
+    handler.emit(make_record())
+
+    assert handler._queue.qsize() == 1
+    handler.es_client.bulk.assert_not_called()
+
+
+def test_drop_policy_discards_when_full(monkeypatch):
+    handler = make_handler(queue_size=2, backpressure="drop")
+    monkeypatch.setattr(handler, "_ensure_shipper", MagicMock())
+    dropped = LOG_RECORDS_DROPPED.labels(reason="full")
+    before = dropped._value.get()
+
+    for i in range(5):
+        handler.emit(make_record(f"msg {i}"))
+
+    assert handler._queue.qsize() == 2
+    assert dropped._value.get() - before == 3
+
+
+def test_sample_policy_keeps_warnings(monkeypatch):
+    handler = make_handler(queue_size=4, backpressure="sample", sample_rate=0.0)
+    monkeypatch.setattr(handler, "_ensure_shipper", MagicMock())
+
+    for i in range(3):
+        handler.emit(make_record(f"info {i}"))
+    handler.emit(make_record("warning", level=logging.WARNING))
+
+    assert handler._queue.qsize() == 3
+
+
+def test_collect_batch_respects_batch_size(monkeypatch):
+    handler = make_handler(batch_size=2, flush_interval=0.01)
+    monkeypatch.setattr(handler, "_ensure_shipper", MagicMock())
+    for i in range(3):
+        handler.emit(make_record(f"msg {i}"))
+
+    assert len(handler._collect_batch()) == 2
+    assert len(handler._collect_batch()) == 1
 
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
 
-    called = {}
+def test_close_flushes_pending_records():
+    handler = make_handler(flush_interval=10)
 
-    def fake_create_task(coro):
-        called["called"] = True
-        return asyncio.ensure_future(coro)
+    for i in range(3):
+        handler.emit(make_record(f"msg {i}"))
+    handler.close()
 
-    monkeypatch.setattr(loop, "create_task", fake_create_task)
+    assert handler._queue.empty()
+    handler.es_client.bulk.assert_awaited()
+    handler.es_client.close.assert_awaited_once()
 
-    handler.emit(record)
 
-    assert called.get("called") is True
+def test_unknown_backpressure_policy():
+    with pytest.raises(ValueError):
+        make_handler(backpressure="explode")
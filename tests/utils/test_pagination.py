@@ -0,0 +1,46 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.models.appointment import Appointment
+from app.models.user import User
+from app.utils.pagination import Keyset
+
+appointment_keyset = Keyset(Appointment.appointment_time, Appointment.id)
+
+
+def test_keyset_cursor_round_trip():
+    item = SimpleNamespace(appointment_time=datetime(2025, 7, 10, 9, 30), id=42)
+
+    cursor = appointment_keyset.encode(item)
+
+    assert appointment_keyset.decode(cursor) == (datetime(2025, 7, 10, 9, 30), 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "WzFd", "WyJ4IiwgMV0="])
+def test_keyset_rejects_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as exc:
+        appointment_keyset.decode(cursor)
+    assert exc.value.status_code == 400
+
+
+def test_keyset_next_cursor_only_on_full_page():
+    keyset = Keyset(User.id)
+    items = [SimpleNamespace(id=1), SimpleNamespace(id=2)]
+
+    assert keyset.next_cursor(items, limit=3) is None
+    assert keyset.decode(keyset.next_cursor(items, limit=2)) == (2,)
+
+
+def test_keyset_paginate_uses_cursor_instead_of_offset():
+    keyset = Keyset(User.id, descending=True)
+    cursor = keyset.encode(SimpleNamespace(id=10))
+
+    sql = str(keyset.paginate(select(User), 5, cursor=cursor, skip=20))
+
+    assert "(users.id) < (" in sql
+    assert "ORDER BY users.id DESC" in sql
+    assert "OFFSET" not in sql
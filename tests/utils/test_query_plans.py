@@ -0,0 +1,358 @@
+import inspect
+import os
+import re
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models import (
+    Appointment,
+    AppointmentReminder,
+    Barber,
+    BarberRatingStats,
+    BarberSchedule,
+    Review,
+    S3Deletion,
+    ScheduleTemplate,
+    User,
+)
+from app.utils.selectors import (
+    barber,
+    reminder,
+    reviews,
+    s3_deletion,
+    schedule,
+    schedule_template,
+    user,
+)
+
+SELECTOR_MODULES = [
+    barber,
+    reminder,
+    reviews,
+    s3_deletion,
+    schedule,
+    schedule_template,
+    user,
+]
+
+BARBERS = 50
+USERS = 400
+SCHEDULES_PER_BARBER = 40
+REVIEWS = 2000
+TODAY = date.today()
+REVIEW_CURSOR = reviews.REVIEW_KEYSET.encode(
+    Review(
+        id=REVIEWS // 2, created_at=datetime.utcnow() - timedelta(hours=REVIEWS // 2)
+    )
+)
+
+# (selector, kwargs, tables it may scan in full). A table is listed only when
+# the selector returns every row of it by design.
+CASES = {
+    "get_barber_by_id": (barber.get_barber_by_id, {"barber_id": 7}, set()),
+    "get_barber_by_user_id": (
+        barber.get_barber_by_user_id,
+        {"user_id": 7},
+        set(),
+    ),
+    "get_barber_id_by_user_id": (
+        barber.get_barber_id_by_user_id,
+        {"user_id": 7},
+        set(),
+    ),
+    "get_all_barbers": (barber.get_all_barbers, {}, {"barbers"}),
+    "get_referenced_avatar_hashes": (
+        barber.get_referenced_avatar_hashes,
+        {"hashes": {f"{3:064x}", f"{99:064x}"}},
+        set(),
+    ),
+    "get_due_s3_deletions": (
+        s3_deletion.get_due_s3_deletions,
+        {"now": datetime.utcnow(), "max_attempts": 8, "limit": 1000},
+        set(),
+    ),
+    "get_due_reminders": (
+        reminder.get_due_reminders,
+        {"now": datetime.utcnow() + timedelta(hours=3), "limit": 500},
+        set(),
+    ),
+    # Planned with a cursor: SQLite reports the first page's LIMITed index
+    # walk as a SCAN, later pages are an index range search.
+    "get_all_reviews": (
+        reviews.get_all_reviews,
+        {"cursor": REVIEW_CURSOR},
+        set(),
+    ),
+    "get_all_reviews_unapproved": (
+        reviews.get_all_reviews,
+        {"only_unapproved": True, "cursor": REVIEW_CURSOR},
+        set(),
+    ),
+    "get_barber_rating_from_db": (
+        reviews.get_barber_rating_from_db,
+        {"barber_id": 7},
+        set(),
+    ),
+    "get_barber_ratings_from_db": (
+        reviews.get_barber_ratings_from_db,
+        {"barber_ids": [1, 2, 3]},
+        set(),
+    ),
+    "get_approved_rating_totals": (
+        reviews.get_approved_rating_totals,
+        {"barber_id": 7},
+        set(),
+    ),
+    "get_schedule_by_id": (
+        schedule.get_schedule_by_id,
+        {"schedule_id": 11, "barber_id": 1},
+        set(),
+    ),
+    "get_schedule_by_id_simple": (
+        schedule.get_schedule_by_id_simple,
+        {"schedule_id": 11},
+        set(),
+    ),
+    "get_barbers_with_schedules": (
+        schedule.get_barbers_with_schedules,
+        {},
+        {"barbers"},
+    ),
+    "select_all_schedules_flat": (
+        schedule.select_all_schedules_flat,
+        {"upcoming_only": False},
+        {"barber_schedules"},
+    ),
+    "select_all_schedules_flat_by_barber": (
+        schedule.select_all_schedules_flat,
+        {
+            "upcoming_only": True,
+            "barber_id": 7,
+            "start_date": TODAY,
+            "end_date": TODAY + timedelta(days=7),
+        },
+        set(),
+    ),
+    "get_schedule_intervals": (
+        schedule.get_schedule_intervals,
+        {
+            "barber_id": 7,
+            "start_date": TODAY,
+            "end_date": TODAY + timedelta(days=7),
+        },
+        set(),
+    ),
+    "get_templates_by_barber": (
+        schedule_template.get_templates_by_barber,
+        {"barber_id": 7},
+        set(),
+    ),
+    "get_template_by_id": (
+        schedule_template.get_template_by_id,
+        {"template_id": 3, "barber_id": 7},
+        set(),
+    ),
+    "get_templates_due": (
+        schedule_template.get_templates_due,
+        {"today": TODAY, "horizon_end": TODAY + timedelta(days=28)},
+        {"schedule_templates"},
+    ),
+    "get_user_by_username": (user.get_user_by_username, {"username": "u7"}, set()),
+    "get_user_by_phone": (user.get_user_by_phone, {"phone": "+10000000007"}, set()),
+    "get_user_by_id": (user.get_user_by_id, {"user_id": 7}, set()),
+    # Admin report over every user.
+    "get_password_hash_prefix_counts": (
+        user.get_password_hash_prefix_counts,
+        {},
+        {"users"},
+    ),
+}
+
+# Selectors that cannot be planned: they filter on columns Barber does not have.
+NOT_PLANNED = {"get_barber_by_username", "get_barber_by_phone"}
+
+DATABASE_URLS = [
+    pytest.param("sqlite", id="sqlite"),
+    pytest.param(
+        os.getenv("TEST_POSTGRES_URL"),
+        id="postgres",
+        marks=pytest.mark.skipif(
+            not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set"
+        ),
+    ),
+]
+
+
+def _seed_rows():
+    now = datetime.utcnow()
+    users = [
+        {
+            "id": i,
+            "username": f"u{i}",
+            "phone": f"+1{i:010d}",
+            "hashed_password": "x",
+            "role_id": 3,
+        }
+        for i in range(1, USERS + 1)
+    ]
+    barbers = [
+        {"id": i, "user_id": i, "full_name": f"Barber {i}", "avatar_hash": f"{i:064x}"}
+        for i in range(1, BARBERS + 1)
+    ]
+    schedules = [
+        {
+            "barber_id": b,
+            "date": TODAY + timedelta(days=d // 8 - 2),
+            "start_time": time(9 + d % 8),
+            "end_time": time(10 + d % 8),
+            "is_active": d % 3 != 0,
+        }
+        for b in range(1, BARBERS + 1)
+        for d in range(SCHEDULES_PER_BARBER)
+    ]
+    review_rows = [
+        {
+            "client_id": i % USERS + 1,
+            "barber_id": i % BARBERS + 1,
+            "rating": i % 5 + 1,
+            "is_approved": i % 4 != 0,
+            "created_at": now - timedelta(hours=i),
+        }
+        for i in range(REVIEWS)
+    ]
+    appointments = [
+        {
+            "client_id": i % USERS + 1,
+            "barber_id": i % BARBERS + 1,
+            "client_phone": "+10000000000",
+            "appointment_time": now + timedelta(hours=i),
+            "status": "scheduled",
+            "schedule_id": i + 1,
+        }
+        for i in range(REVIEWS // 2)
+    ]
+    stats = [
+        {"barber_id": b, "rating_sum": 40, "rating_count": 10}
+        for b in range(1, BARBERS + 1)
+    ]
+    templates = [
+        {
+            "barber_id": b,
+            "weekday": b % 7,
+            "start_time": time(9),
+            "end_time": time(17),
+            "slot_minutes": 60,
+            "valid_from": TODAY,
+            "is_active": True,
+        }
+        for b in range(1, BARBERS + 1)
+    ]
+    deletions = [
+        {
+            "key": f"barbers/{i}.jpg",
+            "created_at": now,
+            "attempts": i % 3,
+            "next_attempt_at": now + timedelta(minutes=i),
+        }
+        for i in range(REVIEWS)
+    ]
+    reminders = [
+        {"appointment_id": i + 1, "send_at": now + timedelta(hours=i - 2)}
+        for i in range(REVIEWS // 2)
+    ]
+    return [
+        (User, users),
+        (Barber, barbers),
+        (BarberSchedule, schedules),
+        (Review, review_rows),
+        (Appointment, appointments),
+        (BarberRatingStats, stats),
+        (ScheduleTemplate, templates),
+        (S3Deletion, deletions),
+        (AppointmentReminder, reminders),
+    ]
+
+
+@pytest_asyncio.fixture(params=DATABASE_URLS)
+async def seeded_engine(request, tmp_path):
+    url = request.param
+    if url == "sqlite":
+        url = f"sqlite+aiosqlite:///{tmp_path / 'plans.db'}"
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for model, rows in _seed_rows():
+            await conn.execute(insert(model), rows)
+        await conn.execute(text("ANALYZE"))
+
+    yield engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@contextmanager
+def capture_statements(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def full_scans(conn, statement: str, parameters) -> set[str]:
+    if conn.dialect.name == "sqlite":
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        )
+        details = [row[-1] for row in result.all()]
+        pattern = re.compile(r"^SCAN (\w+)")
+    else:
+        # With seq scans disabled the planner still picks one when no index
+        # can serve the query, which is exactly what this suite looks for.
+        await conn.exec_driver_sql("SET enable_seqscan = off")
+        result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        details = [row[0] for row in result.all()]
+        pattern = re.compile(r"Seq Scan on (\w+)")
+    return {m.group(1) for detail in details if (m := pattern.search(detail))}
+
+
+def test_every_selector_has_a_plan_case():
+    selectors = {
+        name
+        for module in SELECTOR_MODULES
+        for name, func in inspect.getmembers(module, inspect.iscoroutinefunction)
+        if func.__module__ == module.__name__
+    }
+    covered = {func.__name__ for func, _, _ in CASES.values()} | NOT_PLANNED
+    assert selectors - covered == set()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("case", CASES)
+async def test_selector_avoids_full_scans(case, seeded_engine):
+    selector, kwargs, allowed = CASES[case]
+    session_factory = async_sessionmaker(seeded_engine, class_=AsyncSession)
+
+    with capture_statements(seeded_engine) as statements:
+        async with session_factory() as db:
+            await selector(db, **kwargs)
+    assert statements
+
+    async with seeded_engine.connect() as conn:
+        for statement, parameters in statements:
+            scans = await full_scans(conn, statement, parameters)
+            assert scans <= allowed, f"{case}: full scan of {scans} in\n{statement}"
@@ -1,17 +1,21 @@
+import asyncio
 import json
+import time
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
 from app.utils.redis_client import (
+    BARBERSHOP_INFO_KEY,
+    SwrCache,
+    barbershop_info_cache,
     can_request_code,
     delete_barber_rating,
     delete_verification_code,
-    get_barber_rating,
+    fetch_barber_ratings,
     get_verification_code,
-    load_barbershop_info_from_redis,
-    save_barber_rating,
-    save_barbershop_info_to_redis,
+    load_barbershop_info,
+    publish_barbershop_info,
     save_verification_code,
 )
 
@@ -94,81 +98,180 @@ async def test_can_request_code_rate_limit_not_active(mock_redis_client):
 
 @pytest.mark.asyncio
 @patch("app.utils.redis_client.redis_client")
-async def test_save_barber_rating(mock_redis_client):
-    mock_redis_client.set = AsyncMock()
+async def test_delete_barber_rating(mock_redis_client):
+    mock_redis_client.delete = AsyncMock()
 
-    await save_barber_rating(42, 4.5, 10, expire_seconds=86400)
+    await delete_barber_rating(42)
 
-    mock_redis_client.set.assert_awaited_once_with(
-        "barber_rating:42", "4.5:10", ex=86400
-    )
+    mock_redis_client.delete.assert_awaited_once_with("barber_rating:42")
+
+
+def entry(value, age: float = 0.0, compute_time: float = 0.0) -> str:
+    return json.dumps({"v": value, "t": time.time() - age, "d": compute_time})
 
 
 @pytest.mark.asyncio
-@patch("app.utils.redis_client.redis_client")
-async def test_get_barber_rating_found(mock_redis_client):
-    mock_redis_client.get = AsyncMock(return_value="4.5:10")
-    mock_redis_client.expire = AsyncMock()
+async def test_cold_key_is_computed_once(memory_redis):
+    cache = SwrCache("test", soft_ttl=60, hard_ttl=120)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"n": 1}
 
-    rating = await get_barber_rating(42)
+    values = await asyncio.gather(*(cache.fetch("k", compute) for _ in range(50)))
 
-    assert rating == (4.5, 10)
-    mock_redis_client.get.assert_awaited_once_with("barber_rating:42")
-    mock_redis_client.expire.assert_awaited_once_with("barber_rating:42", 86400)
+    assert calls == 1
+    assert values == [{"n": 1}] * 50
+    assert "k:lock" not in memory_redis.values
 
 
 @pytest.mark.asyncio
-@patch("app.utils.redis_client.redis_client")
-async def test_get_barber_rating_not_found(mock_redis_client):
-    mock_redis_client.get = AsyncMock(return_value=None)
+async def test_fresh_entry_is_served_without_compute(memory_redis):
+    cache = SwrCache("test", soft_ttl=60, hard_ttl=120, beta=0)
+    memory_redis.values["k"] = entry("cached", age=30)
+    compute = AsyncMock()
 
-    rating = await get_barber_rating(42)
+    assert await cache.fetch("k", compute) == "cached"
+    compute.assert_not_awaited()
 
-    assert rating is None
-    mock_redis_client.get.assert_awaited_once_with("barber_rating:42")
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_another_caller_refreshes(memory_redis):
+    cache = SwrCache("test", soft_ttl=60, hard_ttl=120)
+    memory_redis.values["k"] = entry("old", age=90)
+    memory_redis.values["k:lock"] = "1"
+    compute = AsyncMock()
+
+    assert await cache.fetch("k", compute) == "old"
+    compute.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-@patch("app.utils.redis_client.redis_client")
-async def test_delete_barber_rating(mock_redis_client):
-    mock_redis_client.delete = AsyncMock()
+async def test_stale_entry_is_refreshed_by_lock_holder(memory_redis):
+    cache = SwrCache("test", soft_ttl=60, hard_ttl=120)
+    memory_redis.values["k"] = entry("old", age=90)
 
-    await delete_barber_rating(42)
+    assert await cache.fetch("k", AsyncMock(return_value="new")) == "new"
+    assert cache.decode(memory_redis.values["k"]).value == "new"
 
-    mock_redis_client.delete.assert_awaited_once_with("barber_rating:42")
+
+@pytest.mark.asyncio
+async def test_without_serve_stale_callers_wait_for_refresh(memory_redis):
+    cache = SwrCache("test", soft_ttl=60, hard_ttl=120, serve_stale=False)
+    memory_redis.values["k"] = entry("old", age=90)
+    memory_redis.values["k:lock"] = "1"
+
+    async def refresh_elsewhere():
+        await asyncio.sleep(0.03)
+        await cache.set("k", "new")
+
+    asyncio.create_task(refresh_elsewhere())
+    assert await cache.fetch("k", AsyncMock()) == "new"
 
 
 @pytest.mark.asyncio
-@patch("app.utils.redis_client.redis_client")
-async def test_load_barbershop_info_from_redis_found(mock_redis_client):
-    sample_data = {"name": "Barbershop"}
-    mock_redis_client.get = AsyncMock(return_value=json.dumps(sample_data))
+async def test_waiter_computes_when_lock_holder_never_finishes(memory_redis):
+    cache = SwrCache("test", soft_ttl=60, hard_ttl=120)
+    cache.lock_ttl = 0.05
+    memory_redis.values["k:lock"] = "1"
 
-    data = await load_barbershop_info_from_redis()
+    assert await cache.fetch("k", AsyncMock(return_value="mine")) == "mine"
 
-    assert data == sample_data
-    mock_redis_client.get.assert_awaited_once_with("barbershop_info")
+
+@pytest.mark.asyncio
+async def test_lock_taken_over_after_expiry_is_not_released(memory_redis):
+    cache = SwrCache("test", soft_ttl=60, hard_ttl=120)
+
+    async def slow_compute():
+        # Our lock expired mid-compute and another caller took it over.
+        memory_redis.values["k:lock"] = "other"
+        return "mine"
+
+    assert await cache.fetch("k", slow_compute) == "mine"
+    assert memory_redis.values["k:lock"] == "other"
+
+
+def test_xfetch_refreshes_slow_values_early():
+    cache = SwrCache("test", soft_ttl=60, hard_ttl=120, beta=1.0)
+    now = time.time()
+    # One second left; recomputing takes ten.
+    slow = cache.decode(entry("v", age=59, compute_time=10))
+
+    with patch("app.utils.redis_client.random.random", return_value=0.9):
+        assert cache.needs_refresh(slow, now)
+    with patch("app.utils.redis_client.random.random", return_value=0.0):
+        assert not cache.needs_refresh(slow, now)
+    cache.beta = 0
+    with patch("app.utils.redis_client.random.random", return_value=0.9):
+        assert not cache.needs_refresh(slow, now)
+
+
+def test_values_in_the_old_format_are_a_miss():
+    assert SwrCache.decode("4.5:10") is None
+    assert SwrCache.decode(None) is None
 
 
 @pytest.mark.asyncio
-@patch("app.utils.redis_client.redis_client")
-async def test_load_barbershop_info_from_redis_not_found(mock_redis_client):
-    mock_redis_client.get = AsyncMock(return_value=None)
+async def test_fetch_barber_ratings_computes_only_misses(memory_redis):
+    memory_redis.values["barber_rating:1"] = entry([4.5, 10])
+    compute = AsyncMock(return_value={2: (3.0, 1), 3: (0.0, 0)})
 
-    data = await load_barbershop_info_from_redis()
+    ratings = await fetch_barber_ratings([1, 2, 3], compute)
 
-    assert data is None
-    mock_redis_client.get.assert_awaited_once_with("barbershop_info")
+    assert ratings == {1: (4.5, 10), 2: (3.0, 1), 3: (0.0, 0)}
+    compute.assert_awaited_once_with([2, 3])
+    assert SwrCache.decode(memory_redis.values["barber_rating:2"]).value == [3.0, 1]
+    # A rating hit is a single MGET; the TTL is no longer refreshed.
+    assert await fetch_barber_ratings([1, 2, 3], compute) == ratings
+    compute.assert_awaited_once()
 
 
 @pytest.mark.asyncio
-@patch("app.utils.redis_client.redis_client")
-async def test_save_barbershop_info_to_redis(mock_redis_client):
-    mock_redis_client.set = AsyncMock()
+async def test_cached_barbershop_info_is_served_without_the_file(
+    memory_redis, tmp_path
+):
+    await barbershop_info_cache.set(BARBERSHOP_INFO_KEY, {"name": "Barbershop"})
 
-    data = {"name": "Barbershop"}
-    await save_barbershop_info_to_redis(data)
+    missing = str(tmp_path / "missing.yaml")
+    assert await load_barbershop_info(missing) == {"name": "Barbershop"}
 
-    mock_redis_client.set.assert_awaited_once_with(
-        "barbershop_info", json.dumps(data), ex=3600
+
+@pytest.mark.asyncio
+async def test_load_barbershop_info_reads_file_once(memory_redis, tmp_path):
+    path = tmp_path / "info.yaml"
+    path.write_text("address: 1 Main St\n")
+
+    loads = [load_barbershop_info(str(path)) for _ in range(20)]
+    assert await asyncio.gather(*loads) == [{"address": "1 Main St"}] * 20
+
+    path.unlink()
+    assert await load_barbershop_info(str(path)) == {"address": "1 Main St"}
+
+
+@pytest.mark.asyncio
+async def test_publish_barbershop_info(memory_redis, tmp_path):
+    assert await publish_barbershop_info({"address": "x"}, "abc") is True
+    assert await publish_barbershop_info({"address": "x"}, "abc") is False
+
+    missing = str(tmp_path / "missing.yaml")
+    assert await load_barbershop_info(missing) == {"address": "x"}
+    assert memory_redis.published == [("barbershop_info:updated", "abc")]
+
+
+@pytest.mark.asyncio
+async def test_failed_publish_can_be_retried(memory_redis, monkeypatch):
+    publish = memory_redis.publish
+    monkeypatch.setattr(
+        memory_redis, "publish", AsyncMock(side_effect=ConnectionError("lost"))
     )
+
+    with pytest.raises(ConnectionError):
+        await publish_barbershop_info({"address": "x"}, "abc")
+    assert "barbershop_info:version" not in memory_redis.values
+
+    monkeypatch.setattr(memory_redis, "publish", publish)
+    assert await publish_barbershop_info({"address": "x"}, "abc") is True
+    assert memory_redis.published == [("barbershop_info:updated", "abc")]
@@ -0,0 +1,122 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from pydantic import TypeAdapter
+from redis.exceptions import ConnectionError as RedisConnectionError
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.utils import response_cache
+from app.utils.response_cache import (
+    cached_json_response,
+    invalidate_response_cache,
+    make_etag,
+)
+
+adapter = TypeAdapter(list[int])
+
+
+def make_request(if_none_match: str | None = None) -> Request:
+    headers = []
+    if if_none_match:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+@pytest.fixture(autouse=True)
+def enable_response_cache(monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", True)
+    response_cache._local_cache.clear()
+
+
+@pytest.mark.asyncio
+@patch("app.utils.response_cache.redis_client")
+async def test_miss_builds_and_stores(mock_redis_client):
+    mock_redis_client.get = AsyncMock(side_effect=["3", None])
+    mock_redis_client.set = AsyncMock()
+    build = AsyncMock(return_value=[1, 2])
+
+    res = await cached_json_response(make_request(), "barbers", build, adapter)
+
+    assert res.status_code == 200
+    assert res.body == b"[1,2]"
+    assert res.headers["etag"] == make_etag(b"[1,2]")
+    mock_redis_client.set.assert_awaited_once_with(
+        "response_cache:3:barbers", "[1,2]", ex=settings.RESPONSE_CACHE_TTL
+    )
+
+
+@pytest.mark.asyncio
+@patch("app.utils.response_cache.redis_client")
+async def test_shared_hit_skips_build(mock_redis_client):
+    mock_redis_client.get = AsyncMock(side_effect=["3", "[1,2]"])
+    build = AsyncMock()
+
+    res = await cached_json_response(make_request(), "barbers", build, adapter)
+
+    assert res.body == b"[1,2]"
+    build.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("app.utils.response_cache.redis_client")
+async def test_local_hit_only_reads_version(mock_redis_client):
+    mock_redis_client.get = AsyncMock(side_effect=["3", None, "3"])
+    mock_redis_client.set = AsyncMock()
+    build = AsyncMock(return_value=[1])
+
+    await cached_json_response(make_request(), "barbers", build, adapter)
+    res = await cached_json_response(make_request(), "barbers", build, adapter)
+
+    assert res.body == b"[1]"
+    build.assert_awaited_once()
+    assert mock_redis_client.get.await_count == 3
+
+
+@pytest.mark.asyncio
+@patch("app.utils.response_cache.redis_client")
+async def test_matching_etag_returns_not_modified(mock_redis_client):
+    mock_redis_client.get = AsyncMock(side_effect=["3", "[1,2]"])
+    build = AsyncMock()
+    etag = make_etag(b"[1,2]")
+
+    res = await cached_json_response(make_request(etag), "barbers", build, adapter)
+
+    assert res.status_code == 304
+    assert res.body == b""
+    build.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("app.utils.response_cache.redis_client")
+async def test_redis_down_falls_back_to_build(mock_redis_client):
+    mock_redis_client.get = AsyncMock(side_effect=RedisConnectionError())
+    build = AsyncMock(return_value=[7])
+
+    res = await cached_json_response(make_request(), "barbers", build, adapter)
+
+    assert res.body == b"[7]"
+    build.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch("app.utils.response_cache.redis_client")
+async def test_invalidate_bumps_version_and_clears_local(mock_redis_client):
+    mock_redis_client.incr = AsyncMock()
+    response_cache._local_cache["response_cache:3:barbers"] = (0, b"[]")
+
+    await invalidate_response_cache()
+
+    mock_redis_client.incr.assert_awaited_once_with("response_cache:version")
+    assert not response_cache._local_cache
+
+
+@pytest.mark.asyncio
+@patch("app.utils.response_cache.redis_client")
+async def test_invalidate_skips_redis_when_disabled(mock_redis_client, monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", False)
+    mock_redis_client.incr = AsyncMock()
+
+    await invalidate_response_cache()
+
+    mock_redis_client.incr.assert_not_awaited()
@@ -4,8 +4,10 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.barber import Barber
+from app.models.barber_rating_stats import BarberRatingStats
 from app.models.barberschedule import BarberSchedule
 from app.models.user import User
+from app.utils.selectors.reviews import get_barber_ratings_from_db
 from app.utils.selectors.schedule import (
     get_barbers_with_schedules,
     select_all_schedules_flat,
@@ -146,3 +148,18 @@ async def test_select_all_schedules_flat_with_barber_id_and_date_filters(
     assert schedule1 in filtered_schedules
     assert schedule3 in filtered_schedules
     assert schedule2 not in filtered_schedules
+
+
+@pytest.mark.asyncio
+async def test_get_barber_ratings_from_db_reads_stored_totals(
+    db_session_with_rollback: AsyncSession,
+):
+    db_session_with_rollback.add(
+        BarberRatingStats(barber_id=1, rating_sum=9, rating_count=2)
+    )
+    await db_session_with_rollback.commit()
+
+    ratings = await get_barber_ratings_from_db(db_session_with_rollback, [1, 999])
+
+    assert ratings[1] == (4.5, 2)
+    assert ratings[999] == (0.0, 0)
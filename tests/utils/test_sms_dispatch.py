@@ -0,0 +1,161 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from twilio.base.exceptions import TwilioRestException
+
+from app.utils.sms_dispatch import (
+    FakeSmsProvider,
+    LogSmsProvider,
+    SmsDispatcher,
+    SmsMessage,
+    SmsProviderError,
+    TwilioSmsProvider,
+    build_sms_provider,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def _messages(count: int, sender: str = "+10000000001") -> list[SmsMessage]:
+    return [SmsMessage(f"+1555000{i:04d}", f"msg {i}", sender) for i in range(count)]
+
+
+def _dispatcher(provider, clock, rate=2, burst=2, **kwargs) -> SmsDispatcher:
+    return SmsDispatcher(
+        provider, rate=rate, burst=burst, clock=clock, sleep=clock.sleep, **kwargs
+    )
+
+
+def test_sender_is_paced_by_its_token_bucket():
+    clock = FakeClock()
+    # A bucket of rate 2 and burst 2 sends at most 3 in any one-second window.
+    provider = FakeSmsProvider(rate_limit=3, clock=clock)
+
+    counts = _dispatcher(provider, clock).dispatch(_messages(10))
+
+    assert counts == {"sent": 10, "failed": 0, "throttled": 8, "retried": 0}
+    assert provider.rejected == 0
+    # Two go out in the initial burst, the other eight at 2/s.
+    assert clock.now == pytest.approx(4.0)
+
+
+def test_throttled_sender_does_not_delay_other_senders():
+    clock = FakeClock()
+    sent_at = {}
+
+    class RecordingProvider(FakeSmsProvider):
+        def send(self, message):
+            sent_at.setdefault(message.sender, clock())
+            return super().send(message)
+
+    provider = RecordingProvider(clock=clock)
+    messages = _messages(6, sender="+1A") + _messages(1, sender="+1B")
+
+    _dispatcher(provider, clock, rate=1, burst=1).dispatch(messages)
+
+    assert sent_at["+1B"] == 0.0
+    assert len(provider.sent) == 7
+
+
+def test_provider_429_is_retried_with_backoff():
+    clock = FakeClock()
+    provider = FakeSmsProvider(rate_limit=1, clock=clock)
+
+    counts = _dispatcher(provider, clock, rate=10, burst=10, backoff_base=0.5).dispatch(
+        _messages(5)
+    )
+
+    assert counts["sent"] == 5
+    assert counts["failed"] == 0
+    assert counts["retried"] == provider.rejected > 0
+
+
+def test_heartbeat_runs_between_every_send_of_a_long_batch():
+    clock = FakeClock()
+    beats = []
+
+    _dispatcher(FakeSmsProvider(clock=clock), clock, rate=1, burst=1).dispatch(
+        _messages(100), heartbeat=lambda: beats.append(clock())
+    )
+
+    assert clock.now == pytest.approx(99.0)
+    assert max(b - a for a, b in zip(beats, beats[1:])) <= 1.0
+
+
+def test_client_errors_are_not_retried():
+    clock = FakeClock()
+    provider = MagicMock()
+    provider.send.side_effect = SmsProviderError(400, "Invalid 'To' number")
+
+    counts = _dispatcher(provider, clock).dispatch(_messages(1))
+
+    assert counts["failed"] == 1
+    assert provider.send.call_count == 1
+
+
+def test_retries_stop_after_max_retries():
+    clock = FakeClock()
+    provider = MagicMock()
+    provider.send.side_effect = SmsProviderError(503, "Service Unavailable")
+
+    counts = _dispatcher(provider, clock, max_retries=3).dispatch(_messages(1))
+
+    assert counts == {"sent": 0, "failed": 1, "throttled": 0, "retried": 3}
+    assert provider.send.call_count == 4
+
+
+@pytest.mark.parametrize("status, retryable", [(429, True), (503, True), (400, False)])
+def test_twilio_errors_keep_their_status(status, retryable):
+    client = MagicMock()
+    client.messages.create.side_effect = TwilioRestException(status, "uri", "error")
+
+    with pytest.raises(SmsProviderError) as exc_info:
+        TwilioSmsProvider(client).send(_messages(1)[0])
+
+    assert exc_info.value.status == status
+    assert exc_info.value.retryable is retryable
+
+
+@pytest.mark.parametrize(
+    "backend, provider_class",
+    [
+        ("twilio", TwilioSmsProvider),
+        ("log", LogSmsProvider),
+        ("memory", FakeSmsProvider),
+    ],
+)
+def test_build_sms_provider(backend, provider_class):
+    assert isinstance(build_sms_provider(backend), provider_class)
+
+
+def test_build_sms_provider_rejects_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown SMS backend 'carrier-pigeon'"):
+        build_sms_provider("carrier-pigeon")
+
+
+@patch("twilio.rest.Client")
+def test_twilio_client_is_built_on_first_send(mock_client):
+    provider = TwilioSmsProvider()
+    mock_client.assert_not_called()
+
+    provider.send(_messages(1)[0])
+    provider.send(_messages(1)[0])
+
+    mock_client.assert_called_once()
+    assert mock_client.return_value.messages.create.call_count == 2
+
+
+def test_log_provider_sends_nothing():
+    provider = LogSmsProvider()
+
+    assert provider.send(_messages(1)[0]) == "LOG00000001"
+    assert provider.send(_messages(1)[0]) == "LOG00000002"
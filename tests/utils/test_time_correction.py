@@ -3,7 +3,12 @@ from datetime import date, time
 import pytest
 
 from app.models.barberschedule import BarberSchedule
-from app.utils.time_correction import check_time_overlap
+from app.utils.time_correction import (
+    OVERLAPS_BATCH,
+    OVERLAPS_EXISTING,
+    check_time_overlap,
+    find_schedule_conflicts,
+)
 
 
 def test_trim_time():
@@ -56,3 +61,55 @@ async def test_check_time_overlap_with_overlap(db_session_with_rollback):
         end_time=time(11, 30),
     )
     assert result is True
+
+
+@pytest.mark.asyncio
+async def test_check_time_overlap_with_several_overlaps(db_session_with_rollback):
+    for start, end in [(time(9, 0), time(10, 0)), (time(10, 0), time(11, 0))]:
+        db_session_with_rollback.add(
+            BarberSchedule(
+                barber_id=1, date=date(2025, 7, 10), start_time=start, end_time=end
+            )
+        )
+    await db_session_with_rollback.commit()
+
+    result = await check_time_overlap(
+        db_session_with_rollback,
+        barber_id=1,
+        date_=date(2025, 7, 10),
+        start_time=time(9, 30),
+        end_time=time(10, 30),
+    )
+    assert result is True
+
+
+def test_find_schedule_conflicts_against_existing():
+    day = date(2025, 7, 10)
+    existing = [
+        (day, time(9, 0), time(13, 0)),
+        (day, time(14, 0), time(15, 0)),
+    ]
+    candidates = [
+        (day, time(12, 0), time(12, 30)),
+        (day, time(13, 0), time(14, 0)),
+        (day, time(14, 30), time(16, 0)),
+        (date(2025, 7, 11), time(9, 0), time(10, 0)),
+    ]
+
+    conflicts = find_schedule_conflicts(existing, candidates)
+
+    assert conflicts == {0: OVERLAPS_EXISTING, 2: OVERLAPS_EXISTING}
+
+
+def test_find_schedule_conflicts_within_batch():
+    day = date(2025, 7, 10)
+    candidates = [
+        (day, time(10, 30), time(11, 30)),
+        (day, time(10, 0), time(11, 0)),
+        (day, time(11, 0), time(12, 0)),
+        (day, time(11, 30), time(12, 30)),
+    ]
+
+    conflicts = find_schedule_conflicts([], candidates)
+
+    assert conflicts == {0: OVERLAPS_BATCH, 3: OVERLAPS_BATCH}